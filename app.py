@@ -12,7 +12,7 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 from html import escape
 import json
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_from_directory, session, make_response, Response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_from_directory, session, make_response, Response, stream_with_context
 from werkzeug.utils import secure_filename
 # We'll use urllib for URL parsing instead of werkzeug
 from urllib.parse import urlparse
@@ -20,14 +20,14 @@ from flask_login import LoginManager, login_user, logout_user, login_required, c
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, BooleanField, EmailField, SubmitField, TextAreaField
 from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError
-from owl_tester import OwlTester
-from owl_format_detector import auto_convert_ontology, OntologyFormatConverter
-from models import db, User, OntologyFile, OntologyAnalysis, FOLExpression, SandboxOntology, OntologyClass, OntologyProperty, OntologyIndividual
+from warmup import shared_tester
+from fol_batch import annotate_result, normalize_expression, result_row, validate_batch
+from fol_input import split_formulas
+from ingest import COMPRESSED_EXTENSIONS, ingest_upload, remove_snapshot
+from models import db, User, OntologyFile, OntologyAnalysis, AnalysisAxiom, FOLExpression, SandboxOntology, OntologyClass, OntologyProperty, OntologyIndividual
 # Import from improved OpenAI utils to avoid hanging issues
 from improved_openai_utils import suggest_ontology_classes, suggest_ontology_properties, suggest_bfo_category, generate_class_description  
 from openai_utils import generate_real_world_implications
-# Import the preprocess_expression function for handling comma-separated quantifiers
-from owl_preprocessor import preprocess_expression
 from bvss_model import extract_bvss_graph
 from bvss_validator import BVSSValidator
 
@@ -71,7 +71,9 @@ def load_user(user_id):
 
 # Configure file uploads
 app.config['UPLOADED_OWLS_DEST'] = os.path.join(app.root_path, 'uploads')
-app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024  # 64MB max upload size
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024  # 64MB max upload size (as sent, i.e. compressed)
+# Limit on the ontology itself once a .gz/.bz2/.xz/.zip upload is decompressed.
+app.config['MAX_ONTOLOGY_BYTES'] = int(os.environ.get('MAX_ONTOLOGY_BYTES', str(640 * 1024 * 1024)))
 app.config['ALLOWED_EXTENSIONS'] = {'owl', 'rdf', 'xml', 'ttl', 'n3', 'nt', 'ofn', 'own', 'owx'}
 
 # Create uploads directory if it doesn't exist
@@ -91,7 +93,16 @@ except Exception as _e:  # noqa: BLE001
 
 # Helper function to check if a file has an allowed extension
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    if '.' not in filename:
+        return False
+    stem, ext = filename.rsplit('.', 1)
+    ext = ext.lower()
+    if ext == 'zip':
+        return True  # the member is checked on ingestion
+    if ext in COMPRESSED_EXTENSIONS:
+        # onto.ttl.gz: check the inner extension; a bare onto.gz is sniffed
+        return '.' not in stem or stem.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    return ext in app.config['ALLOWED_EXTENSIONS']
 
 # Create database tables
 with app.app_context():
@@ -122,8 +133,8 @@ class RegistrationForm(FlaskForm):
         if user is not None:
             raise ValidationError('Please use a different email address.')
 
-# Initialize OwlTester
-owl_tester = OwlTester()
+# Initialize OwlTester (shared by every request; see warmup.py)
+owl_tester = shared_tester()
 app.logger.info("Initializing OwlTester...")
 
 # Home page
@@ -192,44 +203,19 @@ def test_expression():
             return jsonify({'error': 'No expression provided'}), 400
         
         raw_expression = expression
-        conversion_note = None
 
-        # First detect/convert Prover9 (LADR) or CLIF (Common Logic) syntax into
-        # the internal infix form NLTK's parser understands. No-op for the
-        # existing instance_of / traditional formats.
-        try:
-            from fol_input import prepare_expression
-            expression, detected_format, conversion_note = prepare_expression(expression)
-        except Exception as e:
-            app.logger.error(f"Error normalizing expression syntax: {str(e)}")
-            detected_format = None
-
-        # Then run the existing comma-quantifier preprocessing.
-        try:
-            expression, pp_format = preprocess_expression(expression)
-            detected_format = detected_format or pp_format
-        except Exception as e:
-            app.logger.error(f"Error preprocessing expression: {str(e)}")
-            detected_format = detected_format or None
+        # Detect/convert Prover9 (LADR) or CLIF (Common Logic) syntax into the
+        # internal infix form NLTK's parser understands, then run the
+        # comma-quantifier preprocessing. No-op for the existing formats.
+        expression, detected_format, conversion_note = normalize_expression(expression)
 
         # Store the expression in session
         session['last_expression'] = expression
         session['detected_format'] = detected_format
 
-        # Test the expression
+        # Test the expression, reporting the format the user wrote.
         result = owl_tester.test_expression(expression)
-
-        # Add the detected format to the result. When the input was Prover9 or
-        # CLIF, report that as the format the user wrote (test_expression only
-        # sees the converted internal form, so it would otherwise say
-        # "instance_of"). Otherwise fall back to whatever was detected.
-        if detected_format in ('clif', 'prover9'):
-            result['format_detected'] = detected_format
-        elif detected_format and 'format_detected' not in result:
-            result['format_detected'] = detected_format
-        if conversion_note:
-            result['conversion_note'] = conversion_note
-            result['original_expression'] = raw_expression
+        annotate_result(result, raw_expression, detected_format, conversion_note)
         
         # Log the expression and result for debugging
         app.logger.info(f"Tested expression: {expression}")
@@ -241,16 +227,7 @@ def test_expression():
         else:
             user_id = None
             
-        fol_expr = FOLExpression(
-            expression=expression,
-            is_valid=result.get('valid', False),
-            test_results=result.get('results'),
-            issues=result.get('issues'),
-            bfo_classes_used=result.get('bfo_classes_used'),
-            bfo_relations_used=result.get('bfo_relations_used'),
-            non_bfo_terms=result.get('non_bfo_terms'),
-            user_id=user_id
-        )
+        fol_expr = FOLExpression(**result_row(expression, result, user_id))
         
         db.session.add(fol_expr)
         db.session.commit()
@@ -262,6 +239,88 @@ def test_expression():
         app.logger.error(f"Error testing expression: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Formula-file extension -> fol_input.split_formulas syntax.
+FORMULA_FILE_SYNTAX = {'p9': 'prover9', 'in': 'prover9', 'clif': 'clif', 'cl': 'clif', 'txt': 'lines'}
+FOL_BATCH_MAX = int(os.environ.get('FOL_BATCH_MAX', '20000'))
+FOL_BATCH_FLUSH = int(os.environ.get('FOL_BATCH_FLUSH', '128'))
+
+@app.route('/api/test-expressions', methods=['POST'])
+def test_expressions():
+    """Batch form of /api/test-expression.
+
+    Accepts JSON {"expressions": [...]} or {"text": "...", "syntax": ...}, or a
+    multipart upload of a .p9 / .clif / .txt file under "file". The document is
+    split into single formulas (formulas(assumptions) lists, CLIF sentences, or
+    one per line), validated in parallel, and streamed back as NDJSON: one
+    {"index", "expression", "result"} line per formula as it completes, then a
+    {"done": true, ...} summary. FOLExpression rows are bulk-inserted every
+    FOL_BATCH_FLUSH results, and whatever is left when the stream ends or the
+    client disconnects is flushed then, so a dropped connection keeps the rows
+    already validated.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is not None and upload.filename:
+            ext = upload.filename.rsplit('.', 1)[-1].lower() if '.' in upload.filename else ''
+            if ext not in FORMULA_FILE_SYNTAX:
+                return jsonify({'error': 'Invalid file type. Allowed types: '
+                                         + ', '.join(sorted(FORMULA_FILE_SYNTAX))}), 400
+            text = upload.read().decode('utf-8', errors='replace')
+            formulas, syntax = split_formulas(text, request.form.get('syntax') or FORMULA_FILE_SYNTAX[ext])
+        else:
+            data = request.get_json(silent=True) or {}
+            if isinstance(data.get('expressions'), list):
+                formulas = [str(e) for e in data['expressions'] if str(e).strip()]
+                syntax = data.get('syntax')
+            elif isinstance(data.get('text'), str):
+                formulas, syntax = split_formulas(data['text'], data.get('syntax'))
+            else:
+                return jsonify({'error': 'Provide "expressions", "text" or a file'}), 400
+    except Exception as e:
+        app.logger.error(f"Error reading expression batch: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    if not formulas:
+        return jsonify({'error': 'No expressions found'}), 400
+    if len(formulas) > FOL_BATCH_MAX:
+        return jsonify({'error': f'Too many expressions ({len(formulas)}); '
+                                 f'the limit is {FOL_BATCH_MAX} per request'}), 413
+
+    user_id = current_user.id if current_user.is_authenticated else None
+
+    def generate():
+        rows, counts = [], {'total': 0, 'valid': 0, 'saved': 0}
+
+        def flush():
+            if not rows:
+                return
+            try:
+                db.session.bulk_insert_mappings(FOLExpression, rows)
+                db.session.commit()
+                counts['saved'] += len(rows)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Error saving FOL expression batch: {str(e)}")
+            rows.clear()
+
+        try:
+            for index, raw, expression, result in validate_batch(formulas, syntax=syntax):
+                rows.append(result_row(expression, result, user_id))
+                counts['total'] += 1
+                counts['valid'] += bool(result.get('valid'))
+                yield json.dumps({'index': index, 'expression': raw, 'result': result},
+                                 default=str) + '\n'
+                if len(rows) >= FOL_BATCH_FLUSH:
+                    flush()
+        finally:
+            # Also runs on GeneratorExit when the client goes away mid-stream.
+            flush()
+            app.logger.info(f"[STAGE] test_expressions: {counts['total']} of {len(formulas)} "
+                            f"formulas, {counts['valid']} valid, {counts['saved']} saved")
+        yield json.dumps({'done': True, **counts, 'syntax': syntax}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/test-bfo-display')
 def test_bfo_display():
     """Test page for displaying BFO classes and relations."""
@@ -291,6 +350,28 @@ def get_bfo_classes():
         app.logger.error(f"Error getting BFO classes: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/bfo-autocomplete')
+def bfo_autocomplete():
+    """Ranked BFO class and relation completions for a typed prefix.
+
+    Served from the tester's term index, for the expression editor and the
+    sandbox BFO-category picker. Query parameters: q, kind (class | relation),
+    limit (default 10, at most 50).
+    """
+    try:
+        query = request.args.get('q', '')
+        kind = request.args.get('kind') or None
+        if kind not in (None, 'class', 'relation'):
+            return jsonify({'error': 'kind must be "class" or "relation"'}), 400
+        limit = max(1, min(int(request.args.get('limit', 10)), 50))
+        matches = owl_tester.term_index.complete(query, limit=limit, kind=kind)
+        return jsonify({'query': query, 'suggestions': [m.as_dict() for m in matches]})
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        app.logger.error(f"Error completing BFO term: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/get-bfo-relations')
 def get_bfo_relations():
     """API endpoint to get all BFO relations."""
@@ -314,8 +395,7 @@ def validate_ontology_completeness(analysis_id):
         analysis = OntologyAnalysis.query.get_or_404(analysis_id)
         ontology_file = OntologyFile.query.get_or_404(analysis.ontology_file_id)
         
-        # Create an OwlTester instance
-        tester = OwlTester()
+        tester = owl_tester
         
         # Load the ontology file
         result = tester.load_ontology_from_file(ontology_file.file_path)
@@ -420,8 +500,7 @@ def check_enhanced_consistency(analysis_id):
         analysis = OntologyAnalysis.query.get_or_404(analysis_id)
         ontology_file = OntologyFile.query.get_or_404(analysis.ontology_file_id)
         
-        # Create an OwlTester instance
-        tester = OwlTester()
+        tester = owl_tester
         
         # Load the ontology file
         result = tester.load_ontology_from_file(ontology_file.file_path)
@@ -442,7 +521,7 @@ def check_enhanced_consistency(analysis_id):
         # Perform enhanced consistency checking
         # For now, we'll just return a simple result
         # In the future, this could integrate with multiple reasoners
-        is_consistent = True
+        is_consistent = analysis.is_consistent  # None when the reasoner could not decide
         issues = []
         
         if analysis.consistency_issues and len(analysis.consistency_issues) > 0:
@@ -485,83 +564,22 @@ def upload_owl():
             flash(f'Invalid file type. Allowed types: {", ".join(app.config["ALLOWED_EXTENSIONS"])}', 'error')
             return redirect(url_for('index'))
         
-        # Generate a secure filename
+        # Stream the upload to disk while hashing it (decompressing .gz/.bz2/
+        # .xz/.zip on the way), sniff its format, parse it once (converting to
+        # RDF/XML when needed) and snapshot the graph so the later routes load
+        # it without parsing again (ingest.py).
         original_filename = secure_filename(file.filename or "unknown")
-        if '.' in original_filename:
-            ext = original_filename.rsplit('.', 1)[1].lower()
-        else:
-            ext = 'owl'  # Default extension
-        filename = f"{uuid.uuid4().hex}.{ext}"
-        
-        # Save the file temporarily
-        temp_file_path = os.path.join(app.config['UPLOADED_OWLS_DEST'], f"temp_{filename}")
-        file.save(temp_file_path)
-        
-        # Auto-detect and convert file format if needed
-        final_file_path = None
         try:
-            logger.info(f"Attempting automatic format detection for: {temp_file_path}")
-            logger.info(f"Original file size: {os.path.getsize(temp_file_path)} bytes")
-            
-            # Check if file has content
-            with open(temp_file_path, 'rb') as f:
-                first_few_bytes = f.read(100)
-                logger.info(f"First 100 bytes: {first_few_bytes}")
-                if len(first_few_bytes) == 0:
-                    raise Exception("Uploaded file is empty")
-            
-            converted_path = auto_convert_ontology(temp_file_path, target_format='xml')
-            if converted_path != temp_file_path:
-                logger.info(f"File converted from original format to OWL/XML: {converted_path}")
-                logger.info(f"Converted file size: {os.path.getsize(converted_path)} bytes")
-                
-                # Move the converted file to the final location
-                final_file_path = os.path.join(app.config['UPLOADED_OWLS_DEST'], filename)
-                import shutil
-                shutil.move(converted_path, final_file_path)
-                
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.remove(temp_file_path)
-                    
-                logger.info(f"Converted file moved to: {final_file_path}")
-            else:
-                logger.info("No conversion needed - file is already in correct format")
-                # Move the original file to the final location
-                final_file_path = os.path.join(app.config['UPLOADED_OWLS_DEST'], filename)
-                import shutil
-                shutil.move(temp_file_path, final_file_path)
-                
+            ingested = ingest_upload(file.stream, app.config['UPLOADED_OWLS_DEST'],
+                                     uuid.uuid4().hex, original_filename,
+                                     max_bytes=app.config['MAX_ONTOLOGY_BYTES'])
         except Exception as e:
-            logger.error(f"Format conversion failed: {e}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
-            
-            # Clean up temporary file if it exists
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-            
-            # Re-raise the exception to prevent database record creation
+            logger.error(f"Ingestion failed: {e}")
             raise Exception(f"File processing failed: {e}")
-        
-        # Set the final file path
-        file_path = final_file_path
-        
-        # Verify file exists and is readable before creating database record
-        if not os.path.exists(file_path):
-            raise Exception(f"File was not saved properly: {file_path}")
-            
+        file_path = ingested.path
+        filename = os.path.basename(file_path)
         file_size = os.path.getsize(file_path)
         
-        # Test if the file can be read
-        try:
-            with open(file_path, 'rb') as test_file:
-                test_content = test_file.read(100)
-                if len(test_content) == 0:
-                    raise Exception("File is empty")
-        except Exception as e:
-            raise Exception(f"File is corrupted or unreadable: {e}")
-        
         # Create a record in the database
         file_record = OntologyFile(
             filename=filename,
@@ -800,8 +818,15 @@ def reanalyze_owl(filename):
     analyze_owl, which re-runs the full pipeline when none is found.
     """
     file_record = OntologyFile.query.filter_by(filename=filename).first_or_404()
+    old = OntologyAnalysis.query.with_entities(OntologyAnalysis.id, OntologyAnalysis.inference_export) \
+        .filter_by(ontology_file_id=file_record.id).all()
+    old_ids = [a.id for a in old]
+    if old_ids:
+        AnalysisAxiom.query.filter(AnalysisAxiom.analysis_id.in_(old_ids)) \
+            .delete(synchronize_session=False)
     OntologyAnalysis.query.filter_by(ontology_file_id=file_record.id).delete()
     db.session.commit()
+    _remove_inference_exports(a.inference_export for a in old)
     flash("Re-analyzing with the latest coherence and BFO conformance checks.", "info")
     return redirect(url_for('analyze_owl', filename=filename))
 
@@ -822,8 +847,15 @@ def analyze_owl(filename):
             flash("File not found. The file may have been corrupted during upload. Please try uploading again.", "error")
             return redirect(url_for('index'))
         
-        # Check if an analysis already exists for this file
-        analysis = OntologyAnalysis.query.filter_by(ontology_file_id=file_record.id).order_by(OntologyAnalysis.id.desc()).first()
+        # Check if an analysis already exists for this file. The page renders
+        # everything except the inferred axioms (paged via the axiom API) and
+        # the implications, so those payload groups stay deferred.
+        analysis = OntologyAnalysis.query.options(
+            db.undefer_group('axioms'),
+            db.undefer_group('entities'),
+            db.undefer_group('reasoning'),
+            db.undefer_group('fol'),
+        ).filter_by(ontology_file_id=file_record.id).order_by(OntologyAnalysis.id.desc()).first()
         
         if analysis:
             # Use the existing analysis
@@ -889,8 +921,7 @@ def api_analyze_owl(filename):
         file_record = OntologyFile.query.filter_by(filename=filename).first_or_404()
         logger.info(f"[STAGE] db_lookup: {_time.perf_counter()-t:.2f}s")
 
-        # Create an OwlTester instance
-        tester = OwlTester()
+        tester = owl_tester
 
         # Check if the file actually exists on disk
         if not os.path.exists(file_record.file_path):
@@ -906,19 +937,15 @@ def api_analyze_owl(filename):
         if os.path.exists(file_record.file_path):
             logger.info(f"File size: {os.path.getsize(file_record.file_path)} bytes")
 
-        t = _time.perf_counter()
-        load_result = tester.load_ontology_from_file(file_record.file_path)
-        logger.info(f"[STAGE] load_ontology_total: {_time.perf_counter()-t:.2f}s")
-
-        if not load_result.get('loaded', False) or not load_result.get('ontology'):
-            error_msg = load_result.get('error', 'Unknown error')
-            logger.error(f"Failed to load ontology: {error_msg}")
-            raise Exception(f"Failed to load ontology: {error_msg}")
+        # The owlready2 World is only needed if the in-process Pellet path is
+        # chosen, so hand the analyzer a deferred handle instead of loading now:
+        # ontologies routed to ROBOT (or not reasoned) skip that parse entirely.
+        lazy_onto = tester.lazy_ontology(file_record.file_path)
 
-        # Then analyze the loaded ontology — pass file_path so structural extraction
-        # uses RDFlib (owlready2 class enumeration hangs on some large ontologies).
+        # Analyze — pass file_path so structural extraction uses RDFlib
+        # (owlready2 class enumeration hangs on some large ontologies).
         t = _time.perf_counter()
-        analysis_result = tester.analyze_ontology(load_result.get('ontology'),
+        analysis_result = tester.analyze_ontology(lazy_onto,
                                                   file_path=file_record.file_path)
         logger.info(f"[STAGE] analyze_ontology_total: {_time.perf_counter()-t:.2f}s")
         
@@ -993,6 +1020,18 @@ def api_analyze_owl(filename):
             except Exception as e:
                 app.logger.warning(f"Could not build lint-derived derivation steps: {e}")
 
+        # The full inferred closure, with each inference's derivation, goes to
+        # the on-disk export (written once the row has an id) and to the
+        # AnalysisAxiom index. The row keeps only the export's summary and the
+        # steps that explain no single exported inference (inconsistency, lint),
+        # not a second capped copy.
+        all_inferred = analysis_result.get('inferred_axioms_all', inferred_axioms)
+        all_steps = derivation_steps
+        if all_inferred:
+            exported = {(ax.get('type'), ax.get('description')) for ax in all_inferred}
+            derivation_steps = [step for step in derivation_steps
+                                if (step.get('axiom_type'), step.get('description')) not in exported]
+
         # Create a new analysis record
         analysis = OntologyAnalysis(
             ontology_file_id=file_record.id,
@@ -1009,7 +1048,6 @@ def api_analyze_owl(filename):
             complexity=complexity,
             axioms=axioms,
             consistency_issues=consistency_issues,
-            inferred_axioms=inferred_axioms,
             class_list=class_list,
             object_property_list=object_property_list,
             data_property_list=data_property_list,
@@ -1087,6 +1125,28 @@ def api_analyze_owl(filename):
         # Save the analysis to the database
         t = _time.perf_counter()
         db.session.add(analysis)
+        db.session.flush()
+        # Write the full inferred closure to disk for download; the row keeps
+        # only its summary.
+        if all_inferred:
+            try:
+                from inference_export import write_inference_export
+                analysis.inference_export = write_inference_export(analysis.id, all_inferred)
+            except Exception as e:
+                app.logger.error(f"Error writing inference export: {str(e)}")
+        # Without an export, keep the inferences in the row and the index so
+        # they are still served.
+        if all_inferred and not analysis.inference_export:
+            analysis.inferred_axioms = inferred_axioms
+            analysis.derivation_steps = all_steps
+        # Index every axiom, the full inferred closure included, for the
+        # paginated axiom API. Best-effort: the export still has the closure.
+        try:
+            from axiom_index import index_analysis_axioms
+            n_rows = index_analysis_axioms(analysis, axioms, all_inferred)
+            logger.info(f"[STAGE] axiom_index: {_time.perf_counter()-t:.2f}s ({n_rows} rows)")
+        except Exception as e:
+            app.logger.error(f"Error indexing axioms: {str(e)}")
         db.session.commit()
         logger.info(f"[STAGE] db_commit: {_time.perf_counter()-t:.2f}s")
         logger.info(f"[STAGE] REQUEST TOTAL for {filename}: {_time.perf_counter()-t_request:.2f}s")
@@ -1237,6 +1297,65 @@ def fol_export(analysis_id):
     return resp
 
 
+@app.route('/api/analysis/<int:analysis_id>/axioms')
+def analysis_axioms(analysis_id):
+    """Page through an analysis's asserted and inferred axioms.
+
+    Query params: kind=asserted|inferred, type (e.g. SubClassOf), class (either
+    side of the axiom), origin (e.g. ROBOT/ELK), q (text prefix), page, per_page
+    (max 500).
+    """
+    from axiom_index import query_axioms
+    analysis = OntologyAnalysis.query.get_or_404(analysis_id)
+    kind = request.args.get('kind')
+    if kind and kind not in ('asserted', 'inferred'):
+        return jsonify({'error': "kind must be 'asserted' or 'inferred'"}), 400
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 50))
+    except ValueError:
+        return jsonify({'error': 'page and per_page must be integers'}), 400
+    result = query_axioms(
+        analysis,
+        kind=kind,
+        axiom_type=request.args.get('type') or None,
+        cls=request.args.get('class') or None,
+        origin=request.args.get('origin') or None,
+        prefix=request.args.get('q') or None,
+        page=page,
+        per_page=per_page,
+    )
+    result['success'] = True
+    return jsonify(result)
+
+
+@app.route('/api/analysis/<int:analysis_id>/inferred-export')
+def inferred_export(analysis_id):
+    """Download the analysis's full inferred closure (gzip-compressed NDJSON).
+
+    Streams the on-disk export written at analysis time and supports HTTP Range
+    requests. With summary=1, returns the stored summary as JSON instead.
+    """
+    from inference_export import send_inference_export
+    analysis = OntologyAnalysis.query.get_or_404(analysis_id)
+    summary = analysis.inference_export
+    if request.args.get('summary'):
+        return jsonify({'success': bool(summary), 'export': summary})
+    name = (analysis.ontology_name or f'analysis-{analysis.id}').replace(' ', '_')
+    resp = send_inference_export(summary, f'{name}-inferred.ndjson.gz') if summary else None
+    if resp is None:
+        return jsonify({'error': 'No inferred-axiom export available for this analysis'}), 404
+    return resp
+
+
+def _remove_inference_exports(summaries):
+    """Delete the export files of deleted analyses (after the DB commit)."""
+    from inference_export import remove_inference_export
+    for summary in summaries:
+        if summary:
+            remove_inference_export(summary)
+
+
 @app.route('/api/analysis/<analysis_id>/prover-check', methods=['POST'])
 def prover_check(analysis_id):
     """Run the Prover9/Mace4 cross-check and compare with the OWL reasoner.
@@ -1441,9 +1560,10 @@ def import_to_sandbox(file_id):
             # Update the existing ontology description to note the missing file
             ontology.description = f"Imported from file '{file.original_filename}'. Note: The original file could not be found, but class and property data was imported from database records."
             
-            # Use existing analyses if available
-            if file.analyses:
-                analysis = file.analyses[0]
+            # Use existing analyses if available (entity lists only)
+            analysis = OntologyAnalysis.query.options(db.undefer_group('entities')) \
+                .filter_by(ontology_file_id=file.id).order_by(OntologyAnalysis.id).first()
+            if analysis:
                 ontology.domain = analysis.ontology_name or "Imported Ontology"
                 
                 # If we have class and property lists, use them
@@ -1698,13 +1818,14 @@ def import_to_sandbox(file_id):
             return redirect(url_for('sandbox_edit', ontology_id=ontology.id))
         
         # We'll try to use Owlready2 to parse the ontology to get classes, properties, etc.
-        from owlready2 import get_ontology
+        from ingest import load_owlready
         import tempfile
         
-        # Check if there's already an analysis we can use
-        if file.analyses:
+        # Check if there's already an analysis we can use (entity lists only)
+        analysis = OntologyAnalysis.query.options(db.undefer_group('entities')) \
+            .filter_by(ontology_file_id=file.id).order_by(OntologyAnalysis.id).first()
+        if analysis:
             # Use the analysis data to create a sandbox ontology
-            analysis = file.analyses[0]  # Use the first analysis
             
             # Create a new SandboxOntology
             ontology = SandboxOntology()
@@ -1799,7 +1920,7 @@ def import_to_sandbox(file_id):
         
         # If no analysis, try to parse with Owlready2 directly
         try:
-            onto = get_ontology(file_path).load()
+            onto = load_owlready(file_path)
             
             # Create a new SandboxOntology
             ontology = SandboxOntology()
@@ -1898,13 +2019,17 @@ def delete_files():
     try:
         files = OntologyFile.query.filter(OntologyFile.id.in_(int_ids)).all()
         paths = [f.file_path for f in files]
+        exports = [a.inference_export for f in files for a in f.analyses]
         for f in files:
             db.session.delete(f)  # cascade removes analyses
         db.session.commit()
+        _remove_inference_exports(exports)
 
         # Remove physical files after the DB commit; ignore individual failures.
         for path in paths:
             try:
+                if path:
+                    remove_snapshot(path)
                 if path and os.path.exists(path):
                     os.remove(path)
             except Exception as e:
@@ -1930,13 +2055,16 @@ def delete_file(file_id):
         
         # Store information for flash message
         filename = file.original_filename
+        exports = [a.inference_export for a in file.analyses]
         
         # Delete the file from database (cascade will delete analyses)
         db.session.delete(file)
         db.session.commit()
+        _remove_inference_exports(exports)
         
         # Try to delete the physical file, but don't worry if it fails
         try:
+            remove_snapshot(file_path)
             if os.path.exists(file_path):
                 os.remove(file_path)
         except Exception as e:
@@ -1958,8 +2086,7 @@ def generate_diagram(filename):
         # Find the file in the database
         file_record = OntologyFile.query.filter_by(filename=filename).first_or_404()
         
-        # Create an OwlTester instance
-        tester = OwlTester()
+        tester = owl_tester
         
         # Load the ontology file
         result = tester.load_ontology_from_file(file_record.file_path)
@@ -2001,8 +2128,10 @@ def api_diagram_data(filename):
         # Find the file in the database
         file_record = OntologyFile.query.filter_by(filename=filename).first_or_404()
         
-        # Get the latest analysis for this file to use stored data if loading fails
-        analysis = OntologyAnalysis.query.filter_by(ontology_file_id=file_record.id).order_by(OntologyAnalysis.id.desc()).first_or_404()
+        # Get the latest analysis for this file to use stored data if loading
+        # fails. Only the entity lists are read up front.
+        analysis = OntologyAnalysis.query.options(db.undefer_group('entities')) \
+            .filter_by(ontology_file_id=file_record.id).order_by(OntologyAnalysis.id.desc()).first_or_404()
         
         # Extract class list and property list from analysis
         class_list = []
@@ -2041,8 +2170,7 @@ def api_diagram_data(filename):
         onto = None
         if not use_fallback:
             try:
-                # Create an OwlTester instance
-                tester = OwlTester()
+                tester = owl_tester
                 
                 # Load the ontology file with a timeout
                 result = tester.load_ontology_from_file(file_record.file_path)
@@ -2410,6 +2538,16 @@ def dashboard():
         # Get all FOL expressions for the current user, ordered by test date (newest first)
         expressions = FOLExpression.query.filter_by(user_id=current_user.id).order_by(FOLExpression.test_date.desc()).limit(20).all()
         
+        # Per-file analysis counts in one aggregate query (see view_history)
+        from sqlalchemy import func
+        analysis_counts = dict(
+            db.session.query(
+                OntologyAnalysis.ontology_file_id,
+                func.count(OntologyAnalysis.id),
+            ).join(OntologyFile).filter(OntologyFile.user_id == current_user.id)
+            .group_by(OntologyAnalysis.ontology_file_id).all()
+        )
+
         # Calculate statistics
         ontology_count = len(ontologies)
         analysis_count = OntologyAnalysis.query.join(OntologyFile).filter(OntologyFile.user_id == current_user.id).count()
@@ -2431,6 +2569,7 @@ def dashboard():
                               ontologies=ontologies,
                               expressions=expressions,
                               recent_analyses=recent_analyses,
+                              analysis_counts=analysis_counts,
                               stats=stats)
     except Exception as e:
         app.logger.error(f"Error accessing dashboard: {str(e)}")
@@ -0,0 +1,138 @@
+"""
+Normalized axiom index for analyses.
+
+OntologyAnalysis keeps the asserted axioms as a JSON blob and, for the inferred
+closure, only the summary of its on-disk export (inference_export). This module
+writes every axiom (the full reasoner closure included) into the AnalysisAxiom
+table with its type, subject, object and origin split out, and serves filtered,
+paginated slices of it so the analysis page can load them lazily.
+
+Public API:
+    axiom_rows(analysis_id, axioms, kind) -> list of AnalysisAxiom column dicts
+    index_analysis_axioms(analysis, asserted, inferred) -> rows written
+    query_axioms(analysis, **filters) -> {items, total, page, per_page, pages}
+"""
+
+import logging
+
+from models import db, AnalysisAxiom
+
+logger = logging.getLogger(__name__)
+
+# Separators used in the axiom descriptions built by owl_tester and
+# external_reasoner ("A ⊑ B", "A domain ⇒ B", ...). Longest first.
+_SEPARATORS = (' domain ⇒ ', ' range ⇒ ', ' ⊑ ', ' ≡ ', ' ⊥ ')
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+_BATCH = 5000
+
+
+def split_axiom(description):
+    """Return (subject, object) from an axiom description, or (None, None)."""
+    for sep in _SEPARATORS:
+        if sep in description:
+            subject, obj = description.split(sep, 1)
+            return subject.strip()[:255] or None, obj.strip()[:255] or None
+    return None, None
+
+
+def axiom_rows(analysis_id, axioms, kind):
+    """Flatten analyzer axiom dicts into AnalysisAxiom insert mappings."""
+    rows = []
+    for axiom in axioms or []:
+        description = axiom.get('description') or ''
+        if not description:
+            continue
+        subject, obj = split_axiom(description)
+        derivation = axiom.get('derivation') or {}
+        origin = derivation.get('origin') or ('asserted' if kind == 'asserted' else None)
+        rows.append({
+            'analysis_id': analysis_id,
+            'kind': kind,
+            'axiom_type': (axiom.get('type') or 'Unknown')[:50],
+            'subject': subject,
+            'object': obj,
+            'origin': origin[:50] if origin else None,
+            'description': description,
+        })
+    return rows
+
+
+def index_analysis_axioms(analysis, asserted, inferred):
+    """Replace the analysis's indexed axioms with asserted + inferred.
+
+    Bulk-inserted in batches; the caller commits. Returns the row count.
+    """
+    AnalysisAxiom.query.filter_by(analysis_id=analysis.id).delete()
+    rows = axiom_rows(analysis.id, asserted, 'asserted') + \
+        axiom_rows(analysis.id, inferred, 'inferred')
+    for start in range(0, len(rows), _BATCH):
+        db.session.bulk_insert_mappings(AnalysisAxiom, rows[start:start + _BATCH])
+    return len(rows)
+
+
+def _index_export(analysis):
+    """Index the inferences of the analysis's export file; returns rows written."""
+    from inference_export import iter_export
+
+    written = 0
+    batch = []
+    for line in iter_export(analysis.inference_export):
+        batch.append({'type': line.get('type'), 'description': line.get('description'),
+                      'derivation': {'origin': line.get('origin')}})
+        if len(batch) == _BATCH:
+            written += _insert(axiom_rows(analysis.id, batch, 'inferred'))
+            batch = []
+    return written + _insert(axiom_rows(analysis.id, batch, 'inferred'))
+
+
+def _insert(rows):
+    if rows:
+        db.session.bulk_insert_mappings(AnalysisAxiom, rows)
+    return len(rows)
+
+
+def query_axioms(analysis, kind=None, axiom_type=None, cls=None, origin=None,
+                 prefix=None, page=1, per_page=DEFAULT_PER_PAGE):
+    """One page of an analysis's indexed axioms, filtered.
+
+    cls matches either side of the axiom; prefix matches the start of the
+    subject or the description. Analyses stored before the table existed are
+    indexed from their JSON columns on first use, and inferences missing from
+    the table are indexed from the analysis's inference export.
+    """
+    if not db.session.query(AnalysisAxiom.id).filter_by(analysis_id=analysis.id).first():
+        if analysis.axioms or analysis.inferred_axioms:
+            index_analysis_axioms(analysis, analysis.axioms, analysis.inferred_axioms)
+            db.session.commit()
+    if analysis.inference_export and not db.session.query(AnalysisAxiom.id).filter_by(
+            analysis_id=analysis.id, kind='inferred').first():
+        if _index_export(analysis):
+            db.session.commit()
+
+    q = AnalysisAxiom.query.filter(AnalysisAxiom.analysis_id == analysis.id)
+    if kind:
+        q = q.filter(AnalysisAxiom.kind == kind)
+    if axiom_type:
+        q = q.filter(AnalysisAxiom.axiom_type == axiom_type)
+    if origin:
+        q = q.filter(AnalysisAxiom.origin == origin)
+    if cls:
+        q = q.filter(db.or_(AnalysisAxiom.subject == cls, AnalysisAxiom.object == cls))
+    if prefix:
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        q = q.filter(db.or_(AnalysisAxiom.subject.like(pattern, escape='\\'),
+                            AnalysisAxiom.description.like(pattern, escape='\\')))
+
+    page = max(1, int(page or 1))
+    per_page = min(MAX_PER_PAGE, max(1, int(per_page or DEFAULT_PER_PAGE)))
+    pagination = q.order_by(AnalysisAxiom.id).paginate(page=page, per_page=per_page,
+                                                       error_out=False)
+    return {
+        'items': [row.to_dict() for row in pagination.items],
+        'total': pagination.total,
+        'page': page,
+        'per_page': per_page,
+        'pages': pagination.pages,
+    }
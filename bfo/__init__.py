@@ -12,6 +12,12 @@ Public API:
     as_ui_dict(c)           -> {key: {id, label, uri, description}}
     relation_signatures()   -> {} (placeholder, see relations.py)
     BFO_VERSION             -> pinned release string
+    new_bfo_world()         -> (owlready2.World, bfo_ontology) cloned from the
+                               prebuilt quadstore (see quadstore.py)
+    EntryPointIndex(edges)  -> every class's BFO entry points in one pass
+                               (see entry_points.py)
+    TermIndex(entries)      -> ranked partial matches and autocomplete over
+                               BFO labels and IDs (see term_index.py)
 """
 
 from bfo.catalog import (
@@ -21,7 +27,10 @@ from bfo.catalog import (
     disjointness_closure,
     load_catalog,
 )
+from bfo.entry_points import EntryPointIndex
+from bfo.quadstore import new_bfo_world
 from bfo.relations import relation_signatures
+from bfo.term_index import TermIndex
 
 # Convenience alias matching the documented bundle surface.
 bfo_catalog = load_catalog
@@ -29,9 +38,12 @@ bfo_catalog = load_catalog
 __all__ = [
     "BFO_VERSION",
     "BfoCatalog",
+    "EntryPointIndex",
+    "TermIndex",
     "as_ui_dict",
     "bfo_catalog",
     "disjointness_closure",
     "load_catalog",
+    "new_bfo_world",
     "relation_signatures",
 ]
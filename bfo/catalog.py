@@ -8,7 +8,9 @@ tester UI and the conformance lint:
   - the asserted subclass graph among BFO classes (plus ancestor/descendant closures),
   - the full set of asserted owl:disjointWith / owl:AllDisjointClasses pairs, and
   - the disjointness closure: every pair that clashes because the two classes are
-    disjoint or sit under disjoint ancestors.
+    disjoint or sit under disjoint ancestors, held as a clash matrix (one int
+    bitset row per BFO class, indexed by small integer ids) so clash() is an
+    allocation-free bit test.
 
 The bundle under bfo/ is intentionally pure BFO so the sibling bfo-agent project can
 depend on the exact same view of BFO and the two tools never disagree.
@@ -68,7 +70,11 @@ class BfoCatalog:
         self._descendants = {}
         # asserted disjoint pairs as frozenset({iri_a, iri_b})
         self.disjoint_pairs = set()
-        # memoized disjointness closure
+        # clash matrix: iri -> id, id -> iri, and one bitset row per id
+        self.ids = {}
+        self.iris = []
+        self._clash_rows = []
+        # memoized disjointness closure as frozenset pairs (closure())
         self._closure = None
         # lookup helpers
         self.iri_by_local = {}
@@ -79,8 +85,13 @@ class BfoCatalog:
     # -- construction -----------------------------------------------------
 
     def _load(self, owl_path):
-        world = owlready2.World()
-        onto = world.get_ontology("file://" + owl_path).load()
+        try:
+            # Shares the prebuilt quadstore with the per-analysis worlds.
+            from bfo.quadstore import new_bfo_world
+            world, onto = new_bfo_world(owl_path)
+        except Exception:
+            world = owlready2.World()
+            onto = world.get_ontology("file://" + owl_path).load()
         self._world = world
         self._onto = onto
 
@@ -115,6 +126,7 @@ class BfoCatalog:
 
         self._build_closures(bfo_classes)
         self._load_disjoint_pairs(onto)
+        self._build_clash_matrix()
 
     @staticmethod
     def _is_bfo(iri):
@@ -156,6 +168,23 @@ class BfoCatalog:
                     if self._is_bfo(a) and self._is_bfo(b):
                         self.disjoint_pairs.add(frozenset((a, b)))
 
+    def _build_clash_matrix(self):
+        # Row i has bit j set when classes i and j clash: one descends from A and
+        # the other from B for some asserted disjoint pair (A, B).
+        self.iris = sorted(set(self._ancestors) | {i for p in self.disjoint_pairs for i in p})
+        self.ids = {iri: i for i, iri in enumerate(self.iris)}
+        self._clash_rows = [0] * len(self.iris)
+        for pair in self.disjoint_pairs:
+            a, b = tuple(pair)
+            mask_a = self.mask(self.descendants(a))
+            mask_b = self.mask(self.descendants(b))
+            for iri in self.descendants(a):
+                self._clash_rows[self.ids[iri]] |= mask_b
+            for iri in self.descendants(b):
+                self._clash_rows[self.ids[iri]] |= mask_a
+        for i in range(len(self._clash_rows)):
+            self._clash_rows[i] &= ~(1 << i)
+
     # -- public lookups ---------------------------------------------------
 
     def ancestors(self, iri):
@@ -173,14 +202,55 @@ class BfoCatalog:
 
     def clash(self, iri_a, iri_b):
         """True if the two BFO classes are disjoint or under disjoint ancestors."""
-        if iri_a == iri_b:
+        i = self.ids.get(iri_a)
+        j = self.ids.get(iri_b)
+        if i is None or j is None:
             return False
-        return frozenset((iri_a, iri_b)) in self.closure()
+        return bool(self._clash_rows[i] >> j & 1)
+
+    def mask(self, iris):
+        """The clash-matrix bitset of the known BFO classes among iris."""
+        mask = 0
+        for iri in iris:
+            i = self.ids.get(iri)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def clash_mask(self, iri):
+        """Bitset of every class that clashes with iri (0 if unknown)."""
+        i = self.ids.get(iri)
+        return 0 if i is None else self._clash_rows[i]
+
+    def clashing_pairs(self, iris):
+        """Every clashing pair among iris, as (a, b) in the input order.
+
+        One row AND per class instead of one lookup per pair: for the sorted
+        entry points of a class this yields exactly the pairs the nested
+        `for i < j: if clash(a, b)` loop would, in the same order.
+        """
+        order = [iri for iri in iris if iri in self.ids]
+        pairs = []
+        later = self.mask(order)
+        for a in order:
+            later &= ~(1 << self.ids[a])
+            hits = self._clash_rows[self.ids[a]] & later
+            if hits:
+                pairs.extend((a, b) for b in order if hits >> self.ids[b] & 1)
+        return pairs
 
     def closure(self):
-        """The memoized disjointness closure as a set of frozenset({iri, iri})."""
+        """The disjointness closure as a set of frozenset({iri, iri}).
+
+        Built on demand from the clash matrix for callers that want the pairs
+        themselves; clash() does not need it.
+        """
         if self._closure is None:
-            self._closure = disjointness_closure(self)
+            self._closure = {
+                frozenset((self.iris[i], self.iris[j]))
+                for i, row in enumerate(self._clash_rows)
+                for j in range(i + 1, row.bit_length()) if row >> j & 1
+            }
         return self._closure
 
     def ui_dict(self):
@@ -25,6 +25,7 @@ ternary (arity 3) predicates are the time-indexed continuant relations and
 instantiation `instance-of(x, type, t)`; binary (arity 2) predicates are the
 occurrent / temporal / dependence relations that carry their time intrinsically.
 """
+import hashlib
 
 
 # -- logical operators -------------------------------------------------------
@@ -169,3 +170,17 @@ def arity_mismatches(found):
         if expected is not None and expected != arity:
             out.append((name, arity, expected))
     return sorted(out)
+
+
+# -- mapping version ---------------------------------------------------------
+# Bump when to_prover9_symbol() or another rule not captured in the tables above
+# changes. The tables themselves are hashed into signature_digest(), so editing
+# them invalidates cached translations without a bump.
+SIGNATURE_VERSION = 1
+
+
+def signature_digest():
+    """A short digest of the whole mapping, for keying cached translations."""
+    payload = repr((SIGNATURE_VERSION, sorted(PREDICATES.items()),
+                    sorted(QUANTIFIERS.items()), sorted(CONNECTIVES.items()), EQUALITY))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
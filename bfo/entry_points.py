@@ -0,0 +1,132 @@
+"""
+BFO entry-point index: where each class of a user hierarchy enters BFO.
+
+A class's entry points are the BFO categories it reaches by walking asserted
+subclass edges upward, stopping at the first BFO node on each path (BFO's own
+hierarchy is the catalog's business). The lint, the gate's Stage A/B and the FOL
+export's arity classification all ask this for every class; answered with a
+fresh DFS per class, shared ancestors are re-walked once per descendant, which
+tends to O(classes x edges) on deep hierarchies.
+
+EntryPointIndex answers them all in one O(V + E) pass instead: Tarjan's
+algorithm condenses subclass cycles into strongly connected components and
+emits them successors first, so every component's entry set is the union of its
+members' direct BFO parents and its successors' (already final) sets. Sets are
+int bitsets over the BFO categories met, and decoded frozensets are interned,
+so classes with the same entry points share one object.
+
+Public API:
+    EntryPointIndex(edges, prefix=BFO_IRI_PREFIX)
+        .mask(iri)          -> int bitset of entry points
+        .entry_points(iri)  -> frozenset of BFO IRIs (interned)
+        .bit(bfo_iri)       -> the bit for one BFO category, or 0
+        .iris(mask)         -> frozenset of BFO IRIs for a bitset
+"""
+
+from bfo.catalog import BFO_IRI_PREFIX
+
+
+class EntryPointIndex:
+    """Entry points of every class in `edges` (child IRI -> iterable of parent
+    IRIs), computed once. Treat as immutable."""
+
+    def __init__(self, edges, prefix=BFO_IRI_PREFIX):
+        self._edges = edges
+        self._prefix = prefix
+        self._bits = {}        # BFO IRI -> bit
+        self._bfo = []         # bit position -> BFO IRI
+        self._masks = {}       # non-BFO IRI -> bitset
+        self._interned = {0: frozenset()}
+        self._build()
+
+    def _is_bfo(self, iri):
+        return iri.startswith(self._prefix)
+
+    def bit(self, bfo_iri):
+        return self._bits.get(bfo_iri, 0)
+
+    def _bit_for(self, bfo_iri):
+        b = self._bits.get(bfo_iri)
+        if b is None:
+            b = self._bits[bfo_iri] = 1 << len(self._bfo)
+            self._bfo.append(bfo_iri)
+        return b
+
+    def _build(self):
+        # Iterative Tarjan over the non-BFO nodes; BFO nodes are sinks that only
+        # contribute their bit. Components pop in reverse topological order.
+        edges, is_bfo = self._edges, self._is_bfo
+        index, low, on_stack = {}, {}, set()
+        stack, counter = [], 0
+        for root in edges:
+            if root in index or is_bfo(root):
+                continue
+            work = [(root, iter(edges.get(root, ())))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, parents = work[-1]
+                advanced = False
+                for parent in parents:
+                    if is_bfo(parent):
+                        continue
+                    if parent not in index:
+                        index[parent] = low[parent] = counter
+                        counter += 1
+                        stack.append(parent)
+                        on_stack.add(parent)
+                        work.append((parent, iter(edges.get(parent, ()))))
+                        advanced = True
+                        break
+                    if parent in on_stack:
+                        low[node] = min(low[node], index[parent])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    self._close(component)
+
+    def _close(self, component):
+        members = set(component)
+        mask = 0
+        for member in component:
+            for parent in self._edges.get(member, ()):
+                if self._is_bfo(parent):
+                    mask |= self._bit_for(parent)
+                elif parent not in members:
+                    mask |= self._masks[parent]
+        for member in component:
+            self._masks[member] = mask
+
+    def mask(self, iri):
+        """Entry points of iri as a bitset (0 for a class with none)."""
+        found = self._masks.get(iri)
+        if found is not None:
+            return found
+        # A BFO class (or an unknown one): union over its direct parents.
+        mask = 0
+        for parent in self._edges.get(iri, ()):
+            mask |= self._bit_for(parent) if self._is_bfo(parent) else self._masks.get(parent, 0)
+        return mask
+
+    def iris(self, mask):
+        found = self._interned.get(mask)
+        if found is None:
+            found = frozenset(self._bfo[i] for i in range(mask.bit_length()) if mask >> i & 1)
+            self._interned[mask] = found
+        return found
+
+    def entry_points(self, iri):
+        """Entry points of iri as an (interned) frozenset of BFO IRIs."""
+        return self.iris(self.mask(iri))
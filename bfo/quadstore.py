@@ -0,0 +1,113 @@
+"""
+Prebuilt, read-only owlready2 quadstore for BFO 2020.
+
+Every per-analysis owlready2.World needs BFO attached (for its disjointness and
+hierarchy), and the catalog needs one too. Parsing bfo-2020.owl into each fresh
+World repeats the same RDF/XML parse per request and keeps a private, parsed copy
+per world. Instead, BFO is parsed once into an owlready2 SQLite quadstore on disk,
+and each caller gets a World whose in-memory database is a page-level copy of that
+file (sqlite3's backup API). The copy is private, so analyses stay isolated: the
+user's ontology, reasoner inferences and any BFO edits never reach the shared file,
+which is only ever opened read-only after it is built.
+
+The file is keyed on the BFO OWL content hash and the owlready2 version, and is
+written atomically (build to a temp name, then os.replace), so concurrent gunicorn
+workers racing to build it are safe and a BFO or owlready2 bump rebuilds it.
+
+Public API:
+    quadstore_path(owl_path=None) -> path of the prebuilt SQLite file (built once)
+    new_bfo_world(owl_path=None)  -> (owlready2.World, bfo_ontology)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+import owlready2
+
+from bfo.catalog import DEFAULT_OWL_PATH
+
+logger = logging.getLogger(__name__)
+
+_LOCK = threading.Lock()
+# owl_path -> built quadstore path, so the hash is computed once per process.
+_BUILT = {}
+
+
+def cache_dir():
+    """Directory for the prebuilt quadstore (OWLTESTER_CACHE_DIR overrides)."""
+    path = os.environ.get("OWLTESTER_CACHE_DIR") or os.path.join(
+        tempfile.gettempdir(), "owltester-cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _owl_iri(owl_path):
+    return "file://" + os.path.abspath(owl_path)
+
+
+def _digest(owl_path):
+    h = hashlib.sha256()
+    with open(owl_path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    h.update(str(getattr(owlready2, "VERSION", "")).encode())
+    h.update(os.path.abspath(owl_path).encode())  # the file:// IRI is stored inside
+    return h.hexdigest()[:16]
+
+
+def _build(owl_path, target):
+    """Parse BFO into a fresh on-disk quadstore at target (atomically)."""
+    fd, tmp = tempfile.mkstemp(suffix=".sqlite3.tmp", dir=os.path.dirname(target))
+    os.close(fd)
+    os.unlink(tmp)  # owlready2 refuses to open an existing (empty) file as new
+    try:
+        world = owlready2.World(filename=tmp)
+        world.get_ontology(_owl_iri(owl_path)).load()
+        world.save()
+        world.close()
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def quadstore_path(owl_path=None):
+    """Return the prebuilt BFO quadstore for owl_path, building it if needed."""
+    owl_path = os.path.abspath(owl_path or os.environ.get("BFO_PATH") or DEFAULT_OWL_PATH)
+    with _LOCK:
+        cached = _BUILT.get(owl_path)
+        if cached and os.path.exists(cached):
+            return cached
+        target = os.path.join(cache_dir(), f"bfo-{_digest(owl_path)}.sqlite3")
+        if not os.path.exists(target):
+            _build(owl_path, target)
+            logger.info("Built BFO quadstore %s", target)
+        _BUILT[owl_path] = target
+        return target
+
+
+def new_bfo_world(owl_path=None):
+    """A new, private owlready2.World with BFO already loaded.
+
+    Returns (world, bfo_ontology). The world's quadstore is an in-memory copy of
+    the prebuilt file, so nothing written to it is shared with other worlds.
+    """
+    owl_path = os.path.abspath(owl_path or os.environ.get("BFO_PATH") or DEFAULT_OWL_PATH)
+    path = quadstore_path(owl_path)
+
+    src = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        mem = sqlite3.connect(":memory:", check_same_thread=False)
+        src.backup(mem)
+    finally:
+        src.close()
+
+    # Passing an existing file name tells owlready2 the schema is already there;
+    # all reads and writes go through `connection`, never to that file.
+    world = owlready2.World(filename=path, connection=mem)
+    bfo_onto = world.get_ontology(_owl_iri(owl_path)).load()
+    return world, bfo_onto
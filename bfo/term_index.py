@@ -0,0 +1,187 @@
+"""
+Term index over the BFO vocabulary: ranked partial matches and autocomplete.
+
+OwlTester.test_expression resolved every term that is not an exact BFO key by
+scanning all class and relation keys with substring tests in both directions,
+allocating a dict per hit and keeping whichever came first. TermIndex answers the
+same question from structures built once per vocabulary:
+
+  - a character trie over every searchable name (the snake_case key and the
+    normalized label) and local BFO ID. Walking it from each start position of a
+    term finds the names that occur inside the term; the node for a prefix lists
+    every name below it, which is autocomplete.
+  - an n-gram inverted index (1- to 3-grams) over the names, for the other
+    direction: the names a term occurs inside are the intersection of the
+    postings of the term's n-grams, verified with one substring test each.
+
+Local IDs (bfo_0000015) match exactly or by prefix only, so a fragment such as
+"0000" does not hit every class. Matches are scored 1.0 for an exact name and
+otherwise by how much of the longer string the shorter covers (discounted unless
+it is a prefix); ties keep vocabulary order, classes before relations.
+
+Public API:
+    normalize_term(text) -> the form names and queries are compared in
+    TermIndex(entries)   entries: iterable of (key, kind, info dict)
+    TermIndex.from_vocab(classes, relations)
+        .partial_matches(term, limit=None) -> [TermMatch], best first
+        .complete(prefix, limit=10, kind=None) -> [TermMatch], best first
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+_GRAM = 3
+_INFIX = 0.8  # score factor for a match that is not a prefix
+
+
+def normalize_term(text):
+    """Lower-case, with each run of spaces and hyphens as one underscore."""
+    return re.sub(r"[\s\-]+", "_", str(text).strip().lower())
+
+
+@dataclass(frozen=True)
+class TermMatch:
+    key: str            # the vocabulary key (bfo_classes / bfo_relations key)
+    kind: str           # 'class' | 'relation'
+    score: float
+    info: dict = field(compare=False, repr=False)
+
+    @property
+    def label(self):
+        return self.info.get("label", self.key) if isinstance(self.info, dict) else str(self.info)
+
+    def as_dict(self):
+        info = self.info if isinstance(self.info, dict) else {}
+        return {"key": self.key, "type": self.kind, "label": self.label,
+                "id": info.get("id", self.key), "uri": info.get("uri"),
+                "score": self.score}
+
+
+class _Node:
+    __slots__ = ("children", "ends", "below")
+
+    def __init__(self):
+        self.children = {}
+        self.ends = []    # names ending here
+        self.below = []   # names passing through or ending here
+
+
+def _score(shorter, longer):
+    if shorter == longer:
+        return 1.0
+    ratio = len(shorter) / len(longer)
+    return round(ratio if longer.startswith(shorter) else _INFIX * ratio, 4)
+
+
+class TermIndex:
+    """Ranked lookup over (key, kind, info) vocabulary entries. Treat as immutable."""
+
+    def __init__(self, entries):
+        self._entries = []          # position -> (key, kind, info)
+        self._names = []            # name id -> (name, entry position, searchable)
+        self._root = _Node()
+        self._grams = defaultdict(set)
+        for key, kind, info in entries:
+            pos = len(self._entries)
+            self._entries.append((key, kind, info))
+            label = info.get("label") if isinstance(info, dict) else None
+            uri = info.get("uri") if isinstance(info, dict) else None
+            names = {normalize_term(key)} | ({normalize_term(label)} if label else set())
+            for name in sorted(n for n in names if n):
+                self._add(name, pos, searchable=True)
+            if uri:
+                local = normalize_term(uri.rsplit("/", 1)[-1].rsplit("#", 1)[-1])
+                if local and local not in names:
+                    self._add(local, pos, searchable=False)
+
+    @classmethod
+    def from_vocab(cls, classes, relations):
+        """Index OwlTester-shaped {key: {id, label, uri, ...}} class and relation dicts."""
+        return cls([(k, "class", v) for k, v in classes.items()]
+                   + [(k, "relation", v) for k, v in relations.items()])
+
+    def _add(self, name, pos, searchable):
+        nid = len(self._names)
+        self._names.append((name, pos, searchable))
+        node = self._root
+        node.below.append(nid)
+        for ch in name:
+            node = node.children.setdefault(ch, _Node())
+            node.below.append(nid)
+        node.ends.append(nid)
+        if searchable:
+            for n in range(1, _GRAM + 1):
+                for i in range(len(name) - n + 1):
+                    self._grams[name[i:i + n]].add(nid)
+
+    def _node(self, prefix):
+        node = self._root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def _containing(self, term):
+        """Searchable name ids that contain term (n-gram postings, then verify)."""
+        n = min(_GRAM, len(term))
+        postings = sorted((self._grams.get(term[i:i + n], ()) for i in range(len(term) - n + 1)),
+                          key=len)
+        if not postings or not postings[0]:
+            return ()
+        found = set(postings[0]).intersection(*postings[1:])
+        return [nid for nid in found if term in self._names[nid][0]]
+
+    def _contained(self, term):
+        """Name ids that occur inside term (trie walks from each start position)."""
+        out = []
+        for i in range(len(term)):
+            node = self._root
+            for ch in term[i:]:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+                out.extend(nid for nid in node.ends
+                           if self._names[nid][2] or (i == 0 and len(term) == len(self._names[nid][0])))
+        return out
+
+    def _ranked(self, scored, limit, kind=None):
+        best = {}
+        for nid, score in scored:
+            pos = self._names[nid][1]
+            if score > best.get(pos, -1.0):
+                best[pos] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        out = []
+        for pos, score in ranked:
+            key, k, info = self._entries[pos]
+            if kind and k != kind:
+                continue
+            out.append(TermMatch(key, k, score, info))
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def partial_matches(self, term, limit=None):
+        """Entries whose name contains term or occurs inside it, best first."""
+        term = normalize_term(term)
+        if not term:
+            return []
+        scored = [(nid, _score(term, self._names[nid][0])) for nid in self._containing(term)]
+        scored += [(nid, _score(self._names[nid][0], term)) for nid in self._contained(term)]
+        return self._ranked(scored, limit)
+
+    def complete(self, prefix, limit=10, kind=None):
+        """Completions for a typed prefix: names starting with it first, then
+        names containing it. kind ('class' | 'relation') filters."""
+        prefix = normalize_term(prefix)
+        if not prefix:
+            return []
+        node = self._node(prefix)
+        below = node.below if node is not None else ()
+        scored = [(nid, _score(prefix, self._names[nid][0])) for nid in below]
+        seen = set(below)
+        scored += [(nid, _score(prefix, self._names[nid][0]))
+                   for nid in self._containing(prefix) if nid not in seen]
+        return self._ranked(scored, limit, kind)
@@ -16,6 +16,7 @@ import rdflib
 from rdflib.namespace import RDFS
 
 from bfo.catalog import BFO_IRI_PREFIX
+from bfo.entry_points import EntryPointIndex
 
 CONTINUANT_IRI = "http://purl.obolibrary.org/obo/BFO_0000002"
 OCCURRENT_IRI = "http://purl.obolibrary.org/obo/BFO_0000003"
@@ -84,25 +85,6 @@ def _build_subclass_edges(graph):
     return edges
 
 
-def _bfo_parents(cls_iri, edges):
-    """The set of BFO category IRIs the class reaches by walking subclass edges
-    upward. Stop expanding once a BFO node is reached: the disjointness closure
-    already accounts for BFO ancestors, so we only need the entry points."""
-    reached = set()
-    seen = set()
-    stack = list(edges.get(cls_iri, ()))
-    while stack:
-        node = stack.pop()
-        if node in seen:
-            continue
-        seen.add(node)
-        if _is_bfo(node):
-            reached.add(node)
-            continue  # do not climb into BFO's own hierarchy
-        stack.extend(edges.get(node, ()))
-    return reached
-
-
 def _message(cls_name, label_a, iri_a, label_b, iri_b, catalog):
     """Produce localized, actionable copy for a straddle. No em-dashes."""
     anc_a = catalog.ancestors(iri_a)
@@ -155,32 +137,31 @@ def bfo_lint(graph, catalog):
         return []
 
     edges = _build_subclass_edges(graph)
+    # Entry points into BFO for every class at once; the disjointness closure
+    # already accounts for BFO ancestors, so only the entry points matter.
+    index = EntryPointIndex(edges)
     findings = []
 
     for cls_iri in edges:
         if _is_bfo(cls_iri):
             continue  # only lint user classes, not BFO itself
-        parents = _bfo_parents(cls_iri, edges)
+        parents = index.entry_points(cls_iri)
         if len(parents) < 2:
             continue
-        parents = sorted(parents)
         cls_name = cls_iri.rsplit("#", 1)[-1].rsplit("/", 1)[-1]
-        for i in range(len(parents)):
-            for j in range(i + 1, len(parents)):
-                a, b = parents[i], parents[j]
-                if catalog.clash(a, b):
-                    label_a = catalog.label_for(a)
-                    label_b = catalog.label_for(b)
-                    findings.append(
-                        LintFinding(
-                            cls_name,
-                            label_a,
-                            label_b,
-                            _message(cls_name, label_a, a, label_b, b, catalog),
-                            cls_iri=cls_iri,
-                            category_a_iri=a,
-                            category_b_iri=b,
-                        )
-                    )
+        for a, b in catalog.clashing_pairs(sorted(parents)):
+            label_a = catalog.label_for(a)
+            label_b = catalog.label_for(b)
+            findings.append(
+                LintFinding(
+                    cls_name,
+                    label_a,
+                    label_b,
+                    _message(cls_name, label_a, a, label_b, b, catalog),
+                    cls_iri=cls_iri,
+                    category_a_iri=a,
+                    category_b_iri=b,
+                )
+            )
 
     return findings
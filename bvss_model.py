@@ -6,7 +6,7 @@ for visualization, with special focus on BFO (Basic Formal Ontology) alignment.
 """
 
 import logging
-from owlready2 import get_ontology
+from ingest import load_owlready
 from bfo_2020_definitions import BFO_2020_CLASSES, BFO_2020_RELATIONS
 
 logger = logging.getLogger(__name__)
@@ -31,7 +31,7 @@ class BVSSConverter:
             dict: Graph structure with nodes and edges for BVSS visualization
         """
         try:
-            onto = get_ontology(ontology_path).load()
+            onto = load_owlready(ontology_path)
             nodes = []
             edges = []
             
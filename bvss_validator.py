@@ -9,6 +9,7 @@ in ontologies and visualize them using the BVSS syntax.
 import json
 from typing import Dict, List, Any, Optional
 from owlready2 import *
+from ingest import load_owlready
 import logging
 
 logger = logging.getLogger(__name__)
@@ -63,7 +64,7 @@ class BVSSValidator:
         """
         try:
             # Load ontology
-            onto = get_ontology(f"file://{ontology_path}").load()
+            onto = load_owlready(ontology_path, iri=f"file://{ontology_path}")
             
             validation_result = {
                 "errors": [],
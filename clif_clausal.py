@@ -0,0 +1,223 @@
+"""
+Clausal form of the vendored BFO-2020 theory for Prover9 / Mace4.
+
+render_prover9_theory hands the background over as first-order formulas, so
+every check_class_unsat call made Prover9 and then Mace4 re-clausify the whole
+BFO-2020 theory (negation normal form, Skolemization, CNF) before the search for
+the one goal even began. The background never changes between calls, so this
+module does that work once, in Python, and renders the result as a
+clauses(assumptions) list the engines read as-is.
+
+Pipeline, per axiom from clif_theory.iter_axioms:
+  _nnf        -> negation normal form, `if`/`iff` expanded, variables renamed apart
+  _skolemize  -> existentials replaced by bfo_skN(...) terms over the enclosing
+                 universals
+  _cnf        -> clauses by distribution; tautologies and repeated literals dropped
+
+An axiom whose CNF would exceed _MAX_CLAUSES_PER_AXIOM clauses is kept as a
+formula instead (Prover9 then clausifies only that one, with its own
+definitional tricks), so the block stays equivalent to the formula rendering.
+
+Public API:
+    clausify_axioms(forms) -> (clauses, formulas)   rendered LADR text lines
+    render_prover9_clauses(path=None) -> str        the background block
+"""
+import itertools
+import logging
+
+from bfo import clif_signature as _sig
+
+logger = logging.getLogger(__name__)
+
+# Skolem function/constant prefix. Lower-case (a constant under
+# prolog_style_variables) and outside BFO's and fol_export's symbol spaces.
+_SKOLEM = "bfo_sk"
+_MAX_CLAUSES_PER_AXIOM = 64
+
+
+class _TooLarge(Exception):
+    """The CNF of one axiom outgrew _MAX_CLAUSES_PER_AXIOM."""
+
+
+class _Fresh:
+    """Counters for renamed-apart variables and Skolem symbols."""
+
+    def __init__(self):
+        self.vars = itertools.count(1)
+        self.skolems = itertools.count(1)
+
+
+def _term(node, env):
+    """A CLIF term as ('v', name) for a bound variable, else ('c', symbol)."""
+    if node in env:
+        return env[node]
+    return ("c", _sig.to_prover9_symbol(node))
+
+
+def _literal(node, env, positive):
+    from clif_theory import _head_symbol
+    if _head_symbol(node) == "=":
+        atom = ("=", (_term(node[1], env), _term(node[2], env)))
+    else:
+        atom = (_sig.to_prover9_symbol(node[0]),
+                tuple(_term(a, env) for a in node[1:]))
+    return ("lit", positive, atom)
+
+
+def _nnf(node, env, positive, fresh):
+    """Negation normal form of a validated CLIF sentence.
+
+    Returns nested ('and'|'or', [parts]), ('all'|'ex', [vars], body) and
+    ('lit', positive, atom) tuples. Quantified variables are renamed apart so
+    Skolemization can substitute by name.
+    """
+    from clif_theory import _head_symbol
+    h = _head_symbol(node)
+    if h in ("forall", "exists"):
+        inner = dict(env)
+        names = []
+        for v in node[1]:
+            name = f"V{next(fresh.vars)}"
+            inner[v] = ("v", name)
+            names.append(name)
+        body = node[2:]
+        parts = [_nnf(b, inner, positive, fresh) for b in body]
+        body = parts[0] if len(parts) == 1 else (("and" if positive else "or"), parts)
+        universal = (h == "forall") == positive
+        return ("all" if universal else "ex", names, body)
+    if h == "not":
+        return _nnf(node[1], env, not positive, fresh)
+    if h in ("and", "or"):
+        op = h if positive else ("or" if h == "and" else "and")
+        return (op, [_nnf(c, env, positive, fresh) for c in node[1:]])
+    if h == "if":
+        a, b = node[1], node[2]
+        if positive:
+            return ("or", [_nnf(a, env, False, fresh), _nnf(b, env, True, fresh)])
+        return ("and", [_nnf(a, env, True, fresh), _nnf(b, env, False, fresh)])
+    if h == "iff":
+        a, b = node[1], node[2]
+        if positive:
+            return ("and", [
+                ("or", [_nnf(a, env, False, fresh), _nnf(b, env, True, fresh)]),
+                ("or", [_nnf(a, env, True, fresh), _nnf(b, env, False, fresh)]),
+            ])
+        return ("or", [
+            ("and", [_nnf(a, env, True, fresh), _nnf(b, env, False, fresh)]),
+            ("and", [_nnf(a, env, False, fresh), _nnf(b, env, True, fresh)]),
+        ])
+    return _literal(node, env, positive)
+
+
+def _substitute(term, subst):
+    if term[0] == "v":
+        return subst.get(term[1], term)
+    if term[0] == "f":
+        return ("f", term[1], tuple(_substitute(a, subst) for a in term[2]))
+    return term
+
+
+def _skolemize(f, universals, subst, fresh):
+    """Drop quantifiers: existentials become Skolem terms over `universals`."""
+    kind = f[0]
+    if kind == "all":
+        return _skolemize(f[2], universals + [v for v in f[1]], subst, fresh)
+    if kind == "ex":
+        inner = dict(subst)
+        args = tuple(("v", u) for u in universals)
+        for v in f[1]:
+            name = f"{_SKOLEM}{next(fresh.skolems)}"
+            inner[v] = ("f", name, args) if args else ("c", name)
+        return _skolemize(f[2], universals, inner, fresh)
+    if kind in ("and", "or"):
+        return (kind, [_skolemize(p, universals, subst, fresh) for p in f[1]])
+    _, positive, (pred, args) = f
+    return ("lit", positive, (pred, tuple(_substitute(a, subst) for a in args)))
+
+
+def _cnf(f):
+    """Clauses (frozensets of (positive, atom) literals) of a quantifier-free NNF."""
+    kind = f[0]
+    if kind == "lit":
+        return [frozenset([(f[1], f[2])])]
+    if kind == "and":
+        return [c for p in f[1] for c in _cnf(p)]
+    out = [frozenset()]
+    for part in f[1]:
+        clauses = _cnf(part)
+        if len(out) * len(clauses) > _MAX_CLAUSES_PER_AXIOM:
+            raise _TooLarge()
+        out = [a | b for a in out for b in clauses]
+    return out
+
+
+def _render_term(term, names):
+    if term[0] == "v":
+        return names.setdefault(term[1], f"X{len(names) + 1}")
+    if term[0] == "c":
+        return term[1]
+    return f"{term[1]}(" + ",".join(_render_term(a, names) for a in term[2]) + ")"
+
+
+def _render_clause(clause, names):
+    lits = []
+    for positive, (pred, args) in sorted(clause, key=lambda lit: (not lit[0], repr(lit[1]))):
+        if pred == "=":
+            left, right = (_render_term(a, names) for a in args)
+            lits.append(f"{left} {'=' if positive else '!='} {right}")
+        elif args:
+            rendered = ",".join(_render_term(a, names) for a in args)
+            lits.append(f"{'' if positive else '-'}{pred}({rendered})")
+        else:
+            lits.append(f"{'' if positive else '-'}{pred}")
+    return " | ".join(lits) + "."
+
+
+def clausify_axioms(forms):
+    """Clausal form of the axioms in parsed CLIF.
+
+    Returns (clauses, formulas): LADR clause lines, and the formula lines of any
+    axiom kept unclausified because its CNF was too large. Raises
+    ClifTranslationError on anything outside plain first-order BFO, exactly as
+    render_prover9_theory does.
+    """
+    from clif_theory import _render_formula, iter_axioms
+    fresh = _Fresh()
+    clauses, formulas, seen = [], [], set()
+    for axiom in iter_axioms(forms):
+        rendered = _render_formula(axiom, frozenset())  # validates the axiom
+        try:
+            cnf = _cnf(_skolemize(_nnf(axiom, {}, True, fresh), [], {}, fresh))
+        except _TooLarge:
+            formulas.append(f"{rendered}.")
+            continue
+        for clause in cnf:
+            if any((not positive, atom) in clause for positive, atom in clause):
+                continue  # tautology
+            line = _render_clause(clause, {})
+            if line not in seen:
+                seen.add(line)
+                clauses.append(line)
+    return clauses, formulas
+
+
+def render_prover9_clauses(path=None):
+    """The BFO background as clauses(assumptions), plus any unclausified axioms.
+
+    Equivalent to clif_theory.render_prover9_theory(path) up to Skolemization and
+    usable in its place wherever the background is prepended. Not cached here:
+    call it through render_prover9_theory(path, clausal=True).
+    """
+    from clif_theory import _HEADER, load_axioms
+    clauses, formulas = clausify_axioms(load_axioms(path))
+    text = (_HEADER + "% Precompiled clausal form (clif_clausal.py); "
+            f"Skolem symbols are {_SKOLEM}N.\n"
+            "set(prolog_style_variables).\n\n"
+            "clauses(assumptions).\n"
+            + "".join(f"  {c}\n" for c in clauses) + "end_of_list.\n")
+    if formulas:
+        text += ("\nformulas(assumptions).\n"
+                 + "".join(f"  {f}\n" for f in formulas) + "end_of_list.\n")
+    logger.info("BFO background clausified: %d clauses, %d axioms kept as formulas",
+                len(clauses), len(formulas))
+    return text
@@ -20,7 +20,15 @@ This module reads CLIF the way the standard defines it:
 A CLString is a str subclass, so existing walkers that treat atoms as plain
 strings keep working; code that needs to tell comment/title prose apart from real
 names checks isinstance(tok, CLString) and skips it.
+
+The lexer is one compiled regular expression scanned with finditer, and parse()
+assembles forms with an explicit stack, so deeply nested input cannot hit the
+recursion limit. iter_forms() streams top-level forms from a file for uploads
+too large to tokenize in one go. scripts/bench_clif_lexer.py measures the
+lexer against the original character-at-a-time one.
 """
+import io
+import re
 
 
 class CLString(str):
@@ -36,6 +44,34 @@ class CLString(str):
 _WHITESPACE = " \t\r\n\f"
 _DELIMITERS = "()'\"" + _WHITESPACE
 
+# One alternative per token kind; whitespace is whatever no alternative matches,
+# so findall skips it. Bare names come first (they are most of the input). A
+# token starting with ;; is a comment; a lone ; starts a name, as in CL. Quoted
+# literals are unrolled ([^'\\]* (\\. [^'\\]*)*) and an unterminated one runs to
+# the end of the text.
+_TOKEN_RE = re.compile(r"""
+      [()]
+    | [^()'";\ \t\r\n\f][^()'"\ \t\r\n\f]*
+    | ;;[^\n]*
+    | ;[^()'"\ \t\r\n\f]*
+    | '[^'\\]*(?:\\.[^'\\]*)*(?:\\\Z|'|\Z)
+    | "[^"\\]*(?:\\.[^"\\]*)*(?:\\\Z|"|\Z)
+""", re.VERBOSE | re.DOTALL)
+_CLOSED_RE = {
+    "'": re.compile(r"'[^'\\]*(?:\\.[^'\\]*)*'", re.DOTALL),
+    '"': re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL),
+}
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def _literal(tok, closed):
+    """CLString for a quoted token; closed is False for an unterminated one."""
+    body = tok[1:-1] if closed else tok[1:]
+    if "\\" in body:
+        # Backslash escape (CL 24707): the next char is literal.
+        body = _ESCAPE_RE.sub(r"\1", body)
+    return CLString(body)
+
 
 def tokenize(text):
     """Return a flat list of CLIF tokens.
@@ -43,6 +79,25 @@ def tokenize(text):
     Tokens are the literal strings '(' and ')', CLString instances for quoted
     literals, and plain str for bare names. ;; line comments are dropped.
     """
+    found = _TOKEN_RE.findall(text)
+    tokens = []
+    append = tokens.append
+    last = len(found) - 1
+    for i, tok in enumerate(found):
+        c = tok[0]
+        if c == "'" or c == '"':
+            # Only the final token can be an unterminated literal.
+            append(_literal(tok, i < last or bool(_CLOSED_RE[c].fullmatch(tok))))
+        elif c == ";" and tok.startswith(";;"):
+            continue
+        else:
+            append(tok)
+    return tokens
+
+
+def _tokenize_charwise(text):
+    """The original one-character-at-a-time tokenizer, kept as the reference
+    the regex lexer is tested and benchmarked against."""
     tokens = []
     i, n = 0, len(text)
     while i < n:
@@ -64,7 +119,6 @@ def tokenize(text):
             buf = []
             while i < n:
                 if text[i] == "\\" and i + 1 < n:
-                    # Backslash escape (CL 24707): the next char is literal.
                     buf.append(text[i + 1])
                     i += 2
                     continue
@@ -75,7 +129,6 @@ def tokenize(text):
                 i += 1
             tokens.append(CLString("".join(buf)))
             continue
-        # Bare name: run up to the next delimiter.
         j = i
         while j < n and text[j] not in _DELIMITERS:
             j += 1
@@ -84,33 +137,71 @@ def tokenize(text):
     return tokens
 
 
+def _forms(tokens):
+    """Assemble top-level forms from a token iterable with an explicit stack,
+    so nesting depth is bounded by memory, not the recursion limit. A quoted
+    "(" is a CLString and never opens a list."""
+    stack = []
+    for tok in tokens:
+        if type(tok) is str and tok == "(":
+            stack.append([])
+        elif type(tok) is str and tok == ")":
+            if not stack:
+                raise ValueError("CLIF parse error: unexpected ')'")
+            done = stack.pop()
+            if stack:
+                stack[-1].append(done)
+            else:
+                yield done
+        elif stack:
+            stack[-1].append(tok)
+        else:
+            yield tok
+    if stack:
+        raise ValueError("CLIF parse error: unbalanced '('")
+
+
 def parse(text):
     """Parse CLIF text into a list of top-level s-expressions.
 
     Lists are Python lists; bare names are str; quoted literals are CLString.
     Unbalanced parentheses raise ValueError.
     """
-    toks = tokenize(text)
-    pos = 0
-    length = len(toks)
-
-    def read():
-        nonlocal pos
-        tok = toks[pos]
-        pos += 1
-        if tok == "(":
-            lst = []
-            while pos < length and toks[pos] != ")":
-                lst.append(read())
-            if pos >= length:
-                raise ValueError("CLIF parse error: unbalanced '('")
-            pos += 1  # consume ')'
-            return lst
-        if tok == ")":
-            raise ValueError("CLIF parse error: unexpected ')'")
-        return tok
-
-    forms = []
-    while pos < length:
-        forms.append(read())
-    return forms
+    return list(_forms(tokenize(text)))
+
+
+def _stream_tokens(fh, chunk_size):
+    buf = ""
+    while True:
+        chunk = fh.read(chunk_size)
+        buf += chunk
+        eof = not chunk
+        pos, end = 0, len(buf)
+        for m in _TOKEN_RE.finditer(buf):
+            # A token touching the end of the buffer may continue in the next
+            # chunk (a name, an open quote, a comment): hold it back until then.
+            if m.end() == end and not eof:
+                break
+            pos = m.end()
+            tok = m.group()
+            c = tok[0]
+            if c == "'" or c == '"':
+                yield _literal(tok, pos < end or bool(_CLOSED_RE[c].fullmatch(tok)))
+            elif not (c == ";" and tok.startswith(";;")):
+                yield tok
+        buf = buf[pos:]
+        if eof:
+            return
+
+
+def iter_forms(source, chunk_size=1 << 16):
+    """Yield top-level forms one at a time from CLIF text or a text file object.
+
+    Reads a file chunk_size characters at a time and yields each form as soon
+    as its closing parenthesis arrives, so a multi-megabyte theory is never
+    held as one token list. Same forms as parse(); unbalanced parentheses
+    raise ValueError when reached.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    return _forms(_stream_tokens(source, chunk_size))
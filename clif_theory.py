@@ -7,18 +7,26 @@ a single Prover9 (LADR) assumptions block so the prover cross-check can use the
 lightweight derived-disjointness export.
 
 Pipeline:
-  clif_lexer.parse      -> nested s-expressions (string-literal aware)
+  clif_lexer.iter_forms -> nested s-expressions (string-literal aware, streamed)
   iter_axioms           -> the real axiom forms, with cl: wrappers stripped
   collect_predicates    -> the predicate signature actually used (for the map test)
+  load_axioms           -> iter_axioms(load_clif(path)), via the on-disk artifact
   render_prover9_theory -> Prover9 text, via bfo.clif_signature
 
-The translated background is cached once per process (it is a fixed input).
+The translated background is cached once per process and bfo/VERSION (it is a
+fixed input), and on disk across processes: the parsed axioms and both renderings
+live in a JSON artifact keyed on the CLIF content and the signature map version.
+render_prover9_theory(clausal=True) serves the same theory precompiled to clauses
+(clif_clausal.py), so the engines skip clausification.
 """
+import hashlib
+import json
 import logging
 import os
+import tempfile
 
 from bfo import clif_signature as _sig
-from clif_lexer import CLString, parse
+from clif_lexer import CLString, iter_forms
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +44,7 @@ _PASSTHROUGH = {"cl:text", "cl-text", "cl:module", "cl-module",
 _DECLARATIONS = {"cl:outdiscourse", "cl-outdiscourse", "cl:imports", "cl-imports"}
 
 _DEFAULT_BFO_CLIF = os.path.join(os.path.dirname(__file__), "bfo", "bfo-2020.clif")
+_BFO_VERSION = os.path.join(os.path.dirname(__file__), "bfo", "VERSION")
 
 
 def _head_symbol(node):
@@ -119,7 +128,7 @@ def load_clif(path=None):
     """Parse a CLIF file (defaults to the vendored BFO-2020 theory)."""
     path = path or _DEFAULT_BFO_CLIF
     with open(path, "r", encoding="utf-8") as fh:
-        return parse(fh.read())
+        return list(iter_forms(fh))
 
 
 # -- CLIF -> Prover9 translation (Phase 3) -----------------------------------
@@ -232,8 +241,111 @@ _HEADER = (
 
 _THEORY_CACHE = {}
 
+# -- persistent translation artifact -----------------------------------------
+# Parsing and translating the CLIF theory costs a few hundred milliseconds per
+# process (and the clausal form more), repeated by every gunicorn master, CLI
+# run and test session. The results are stored on disk, next to the prebuilt
+# BFO quadstore, in one JSON artifact per input:
+#
+#   {"format": 1, "axioms": [...], "prover9": "...", "prover9_clausal": "..."}
+#
+# keyed on the CLIF file's content hash, the clif_signature mapping digest and
+# the translator sources, so editing any of them selects a fresh artifact. The
+# rendered fields are filled in as they are first needed. Writes are atomic
+# (temp file, then os.replace) and best-effort; an unreadable artifact is a miss.
+_ARTIFACT_FORMAT = 1
+_TRANSLATOR_SOURCES = ("clif_lexer.py", "clif_theory.py", "clif_clausal.py")
+_ARTIFACTS = {}  # artifact path -> decoded artifact dict
+
+
+def _artifact_path(path):
+    from bfo.quadstore import cache_dir
+    h = hashlib.sha256()
+    h.update(f"{_ARTIFACT_FORMAT}:{_sig.signature_digest()}\n".encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in (path,) + tuple(os.path.join(here, src) for src in _TRANSLATOR_SOURCES):
+        with open(name, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 16), b""):
+                h.update(chunk)
+    return os.path.join(cache_dir(), f"clif-{h.hexdigest()[:16]}.json")
+
+
+def _encode(node):
+    """Parsed CLIF as JSON: lists stay lists, a CLString becomes {"q": text}."""
+    if isinstance(node, list):
+        return [_encode(n) for n in node]
+    if isinstance(node, CLString):
+        return {"q": str(node)}
+    return node
+
+
+def _decode(node):
+    if isinstance(node, list):
+        return [_decode(n) for n in node]
+    if isinstance(node, dict):
+        return CLString(node["q"])
+    return node
+
+
+def _read_artifact(target):
+    try:
+        with open(target, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("format") != _ARTIFACT_FORMAT or not isinstance(data.get("axioms"), list):
+            return None
+        return data
+    except (OSError, ValueError, AttributeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"CLIF artifact {target} unreadable ({e}); rebuilding")
+        return None
 
-def render_prover9_theory(path=None):
+
+def _write_artifact(target, data):
+    try:
+        fd, tmp = tempfile.mkstemp(suffix=".json.tmp", dir=os.path.dirname(target))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+    except OSError as e:
+        logger.warning(f"CLIF artifact {target} not written ({e})")
+
+
+def _artifact(path):
+    """(target, artifact dict) for a CLIF file, parsing it on a cold cache."""
+    target = _artifact_path(path)
+    data = _ARTIFACTS.get(target)
+    if data is None:
+        data = _read_artifact(target)
+        if data is None:
+            axioms = list(iter_axioms(load_clif(path)))
+            data = {"format": _ARTIFACT_FORMAT, "axioms": _encode(axioms)}
+            _write_artifact(target, data)
+            logger.info(f"CLIF artifact built: {target} ({len(axioms)} axioms)")
+        _ARTIFACTS[target] = data
+    return target, data
+
+
+def load_axioms(path=None):
+    """The axiom forms of a CLIF file (iter_axioms over load_clif), served from
+    the on-disk artifact cache when it is current. Returns fresh lists."""
+    _, data = _artifact(path or _DEFAULT_BFO_CLIF)
+    return _decode(data["axioms"])
+
+
+def _version_stamp():
+    """bfo/VERSION's content, so a vendored BFO bump invalidates cached renderings."""
+    try:
+        with open(_BFO_VERSION, "r", encoding="utf-8") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def render_prover9_theory(path=None, clausal=False):
     """Translate a CLIF theory (default: vendored BFO-2020) into a Prover9 block.
 
     Returns a complete, runnable assumptions section:
@@ -246,17 +358,32 @@ def render_prover9_theory(path=None):
     Duplicate set() directives and multiple assumptions lists are harmless in
     Prover9/Mace4, so this block can also be prepended to the ontology export
     (Phase 5). The translation is cached per file path: the BFO background is a
-    fixed input rendered once per process. Raises ClifTranslationError if any form
-    falls outside plain first-order BFO.
+    fixed input rendered once per process and bfo/VERSION, and persisted across
+    processes in the on-disk artifact (see _artifact_path). Raises
+    ClifTranslationError if any form falls outside plain first-order BFO.
+
+    With clausal=True the same theory comes precompiled to a clauses(assumptions)
+    list (clif_clausal.render_prover9_clauses), which Prover9 and Mace4 read
+    without clausifying it again on every invocation.
     """
-    key = os.path.abspath(path or _DEFAULT_BFO_CLIF)
+    path = path or _DEFAULT_BFO_CLIF
+    key = (os.path.abspath(path), bool(clausal), _version_stamp())
     cached = _THEORY_CACHE.get(key)
     if cached is not None:
         return cached
 
-    forms = load_clif(path)
-    body = [f"  {_render_formula(a, frozenset())}." for a in iter_axioms(forms)]
-    text = (_HEADER + "set(prolog_style_variables).\n\n"
-            "formulas(assumptions).\n" + "\n".join(body) + "\nend_of_list.\n")
+    target, data = _artifact(path)
+    field = "prover9_clausal" if clausal else "prover9"
+    text = data.get(field)
+    if text is None:
+        if clausal:
+            from clif_clausal import render_prover9_clauses
+            text = render_prover9_clauses(path)
+        else:
+            body = [f"  {_render_formula(a, frozenset())}." for a in load_axioms(path)]
+            text = (_HEADER + "set(prolog_style_variables).\n\n"
+                    "formulas(assumptions).\n" + "\n".join(body) + "\nend_of_list.\n")
+        data[field] = text
+        _write_artifact(target, data)
     _THEORY_CACHE[key] = text
     return text
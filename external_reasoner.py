@@ -1,13 +1,16 @@
 """
 External-reasoner wrapper. Runs ROBOT (with ELK as the backend) in a subprocess
-to reason over an OWL file, then diffs the reasoned ontology against the input
-to extract newly entailed axioms. Used for ontologies too large for in-process
+to reason over an OWL file. ROBOT writes only the inferred axioms, in functional
+syntax, which are streamed back and filtered against the axioms already asserted
+in the input and in BFO. Used for ontologies too large for in-process
 owlready2/Pellet (which can hang on class enumeration).
 """
+import functools
 import logging
 import os
 import re
 import shutil
+import signal
 import subprocess
 import tempfile
 import time
@@ -15,6 +18,8 @@ import time
 import rdflib
 from rdflib.namespace import OWL, RDFS
 
+from ingest import load_graph
+
 logger = logging.getLogger(__name__)
 
 # ROBOT/ELK logs one line per unsatisfiable class when reasoning aborts, e.g.
@@ -57,8 +62,115 @@ def _local_name(uri):
     return s
 
 
+_OFN_PREFIX_RE = re.compile(r"^Prefix\(\s*([\w.-]*):=<([^>]*)>\s*\)")
+_OFN_AXIOM_RE = re.compile(r"^(SubClassOf|EquivalentClasses)\((.*)\)\s*$")
+_OFN_TOKEN_RE = re.compile(r"<[^>]*>|[^\s()]+")
+
+
+def iter_inferred_axioms(path):
+    """Stream named-class axioms out of an OWL functional-syntax file.
+
+    Reads line by line and yields ("SubClassOf", sub, sup) and
+    ("EquivalentClass", a, b) with full IRIs, expanding declared prefixes. An
+    n-ary EquivalentClasses yields one pair per operand after the first. Axioms
+    over anonymous class expressions or carrying annotations are skipped.
+    """
+    prefixes = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            m = _OFN_PREFIX_RE.match(line)
+            if m:
+                prefixes[m.group(1)] = m.group(2)
+                continue
+            m = _OFN_AXIOM_RE.match(line)
+            if not m or "(" in m.group(2):
+                continue
+            iris = []
+            for token in _OFN_TOKEN_RE.findall(m.group(2)):
+                if token.startswith("<"):
+                    iris.append(token[1:-1])
+                else:
+                    prefix, _, local = token.partition(":")
+                    if prefix not in prefixes:
+                        break
+                    iris.append(prefixes[prefix] + local)
+            else:
+                if len(iris) < 2:
+                    continue
+                if m.group(1) == "SubClassOf":
+                    yield "SubClassOf", iris[0], iris[1]
+                else:
+                    for other in iris[1:]:
+                        yield "EquivalentClass", iris[0], other
+
+
+def _asserted_class_axioms(source):
+    """Named SubClassOf / EquivalentClass axioms asserted in `source` (an
+    rdflib graph or a file path), as (kind, iri, iri) string triples with
+    equivalences in both directions."""
+    if isinstance(source, rdflib.Graph):
+        g = source
+    else:
+        g = load_graph(source)
+    for s, o in g.subject_objects(RDFS.subClassOf):
+        if isinstance(s, rdflib.URIRef) and isinstance(o, rdflib.URIRef):
+            yield "SubClassOf", str(s), str(o)
+    for s, o in g.subject_objects(OWL.equivalentClass):
+        if isinstance(s, rdflib.URIRef) and isinstance(o, rdflib.URIRef):
+            yield "EquivalentClass", str(s), str(o)
+            yield "EquivalentClass", str(o), str(s)
+
+
+@functools.lru_cache(maxsize=4)
+def _bfo_class_axioms(bfo_path, mtime):
+    return frozenset(_asserted_class_axioms(bfo_path))
+
+
+def bfo_class_axioms(bfo_path):
+    """BFO's asserted named-class axioms (see _asserted_class_axioms), parsed
+    once per process and file version. BFO is merged into every ROBOT run, so
+    these are filtered out of the reported inferences."""
+    return _bfo_class_axioms(bfo_path, os.path.getmtime(bfo_path))
+
+
+class ReasonerCancelled(Exception):
+    """Raised by run_cancellable when the caller's cancel event is set."""
+
+
+def run_cancellable(cmd, timeout_seconds, cancel=None, poll_seconds=0.2):
+    """subprocess.run(cmd, capture_output=True, text=True, timeout=...) that can
+    also be stopped from another thread by setting the `cancel` threading.Event.
+
+    The command runs in its own session, so on timeout or cancellation the whole
+    process group is killed, including any JVM it started. Raises
+    subprocess.TimeoutExpired or ReasonerCancelled respectively.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, start_new_session=True)
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            wait = min(poll_seconds, remaining) if cancel is not None else remaining
+            stdout, stderr = proc.communicate(timeout=max(wait, 0))
+            return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+        except subprocess.TimeoutExpired:
+            cancelled = cancel is not None and cancel.is_set()
+            if not cancelled and time.monotonic() < deadline:
+                continue
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                proc.kill()
+            proc.communicate()
+            if cancelled:
+                raise ReasonerCancelled()
+            raise subprocess.TimeoutExpired(cmd, timeout_seconds)
+
+
 def run_robot_reason(input_path, timeout_seconds=300, reasoner="ELK",
-                     normalized_graph=None, bfo_path=None):
+                     normalized_graph=None, bfo_path=None, cancel=None):
     """
     Run ROBOT to reason over `input_path` and return entailed axioms.
 
@@ -72,13 +184,16 @@ def run_robot_reason(input_path, timeout_seconds=300, reasoner="ELK",
         {
           'ran':              bool,        # the reasoner actually executed
           'consistent':       Optional[bool],
-          'inferred_axioms':  list[dict],  # new SubClassOf / EquivalentClass triples
+          'inferred_axioms':  list[dict],  # new SubClassOf / EquivalentClass axioms
           'derivation_steps': list[dict],
           'engine':           'robot+<reasoner>',
           'elapsed_seconds':  float,
           'error':            Optional[str],
         }
 
+    Setting the `cancel` threading.Event from another thread kills ROBOT and
+    returns with error "cancelled" (see reasoner_portfolio).
+
     Failure modes (ROBOT missing, timeout, non-zero exit) return ran=False with
     `error` populated — callers should treat that as "skipped" rather than
     crashing the request.
@@ -119,7 +234,9 @@ def run_robot_reason(input_path, timeout_seconds=300, reasoner="ELK",
                         f"{time.perf_counter()-t_norm:.2f}s -> {normalized_path}")
             robot_input_path = normalized_path
 
-        with tempfile.NamedTemporaryFile(suffix=".owl", delete=False) as tmp:
+        # Functional syntax, one axiom per line, so the result can be read
+        # line by line instead of being parsed into another graph.
+        with tempfile.NamedTemporaryFile(suffix=".ofn", delete=False) as tmp:
             out_path = tmp.name
 
         # Merge BFO in (when provided) so ELK sees BFO's disjointness and can
@@ -134,14 +251,11 @@ def run_robot_reason(input_path, timeout_seconds=300, reasoner="ELK",
             "--output", out_path,
             "--axiom-generators", "SubClass EquivalentClass",
             "--include-indirect", "false",
+            # Emit the inferred axioms alone, not the whole reasoned ontology.
+            "--create-new-ontology", "true",
         ]
         logger.info(f"[STAGE] robot: invoking {' '.join(cmd)}")
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
+        proc = run_cancellable(cmd, timeout_seconds, cancel=cancel)
         result["elapsed_seconds"] = time.perf_counter() - started
 
         if proc.returncode != 0:
@@ -172,67 +286,39 @@ def run_robot_reason(input_path, timeout_seconds=300, reasoner="ELK",
             )
             return result
 
-        # Successful reasoning. Diff the output against the actual ROBOT input
-        # (either original or normalized copy) to find new axioms.
-        if normalized_graph is not None:
-            original = normalized_graph
-        else:
-            original = rdflib.Graph()
-            original.parse(input_path)
-        reasoned = rdflib.Graph()
-        reasoned.parse(out_path)
-
-        new_triples = reasoned - original
-        # BFO was merged into the reasoner input, so subtract its asserted axioms
-        # to keep them out of the "newly inferred" set for the user's ontology.
-        if bfo_path and os.path.exists(bfo_path):
-            bfo_graph = rdflib.Graph()
-            try:
-                bfo_graph.parse(bfo_path)
-                new_triples = new_triples - bfo_graph
-            except Exception as e:
-                logger.warning(f"[STAGE] robot: could not subtract BFO baseline: {e}")
-        for s, _, o in new_triples.triples((None, RDFS.subClassOf, None)):
-            if not (isinstance(s, rdflib.URIRef) and isinstance(o, rdflib.URIRef)):
-                continue
-            sn, on = _local_name(s), _local_name(o)
-            if not sn or not on or sn in ("Thing", "Nothing"):
-                continue
-            step = {
-                "axiom_type": "SubClassOf",
-                "description": f"{sn} ⊑ {on}",
-                "reason": "Entailed by external reasoner",
-                "supporting_facts": [f"{reasoner} classification over class hierarchy"],
-                "confidence": "High",
-                "origin": f"ROBOT/{reasoner}",
-            }
-            result["derivation_steps"].append(step)
-            result["inferred_axioms"].append({
-                "type": "SubClassOf",
-                "description": f"{sn} ⊑ {on}",
-                "derivation": step,
-            })
-
-        for s, _, o in new_triples.triples((None, OWL.equivalentClass, None)):
-            if not (isinstance(s, rdflib.URIRef) and isinstance(o, rdflib.URIRef)):
+        # Successful reasoning. ROBOT wrote only the inferred axioms; drop the
+        # ones already asserted in its input or in BFO (merged into the input).
+        t_parse = time.perf_counter()
+        asserted = set(_asserted_class_axioms(
+            normalized_graph if normalized_graph is not None else input_path))
+        bfo_asserted = bfo_class_axioms(bfo_path) if bfo_path and os.path.exists(bfo_path) else frozenset()
+        for kind, s, o in iter_inferred_axioms(out_path):
+            if (kind, s, o) in asserted or (kind, s, o) in bfo_asserted:
                 continue
             sn, on = _local_name(s), _local_name(o)
             if not sn or not on:
                 continue
+            if kind == "SubClassOf":
+                if sn in ("Thing", "Nothing") or on == "Thing":
+                    continue
+                sep, facts = "⊑", f"{reasoner} classification over class hierarchy"
+            else:
+                sep, facts = "≡", f"{reasoner} classification"
             step = {
-                "axiom_type": "EquivalentClass",
-                "description": f"{sn} ≡ {on}",
+                "axiom_type": kind,
+                "description": f"{sn} {sep} {on}",
                 "reason": "Entailed by external reasoner",
-                "supporting_facts": [f"{reasoner} classification"],
+                "supporting_facts": [facts],
                 "confidence": "High",
                 "origin": f"ROBOT/{reasoner}",
             }
             result["derivation_steps"].append(step)
             result["inferred_axioms"].append({
-                "type": "EquivalentClass",
-                "description": f"{sn} ≡ {on}",
+                "type": kind,
+                "description": step["description"],
                 "derivation": step,
             })
+        logger.info(f"[STAGE] robot: read inferred axioms in {time.perf_counter()-t_parse:.2f}s")
 
         result["ran"] = True
         result["consistent"] = True
@@ -247,6 +333,11 @@ def run_robot_reason(input_path, timeout_seconds=300, reasoner="ELK",
         result["error"] = f"robot exceeded {timeout_seconds}s timeout"
         logger.warning(f"[STAGE] robot: TIMED OUT after {timeout_seconds}s")
         return result
+    except ReasonerCancelled:
+        result["elapsed_seconds"] = time.perf_counter() - started
+        result["error"] = "cancelled"
+        logger.info(f"[STAGE] robot: cancelled after {result['elapsed_seconds']:.2f}s")
+        return result
     except Exception as e:
         result["elapsed_seconds"] = time.perf_counter() - started
         result["error"] = f"{type(e).__name__}: {e}"
@@ -0,0 +1,152 @@
+"""
+Batch FOL expression validation.
+
+/api/test-expression validates one formula per request: one round trip, one DB
+insert and commit, one pass of prepare_expression -> preprocess_expression ->
+LogicParser each. Checking a whole axiom file that way means thousands of
+requests. This module validates many formulas in one call instead: the input is
+split with fol_input.split_formulas, the formulas are validated in chunks across
+a process pool (NLTK parsing is pure Python, so threads would serialize on the
+GIL), and results are yielded as each chunk completes so the endpoint can stream
+them. Rows for FOLExpression are built here and bulk-inserted by the caller as
+the results arrive.
+
+Small batches run inline: forking the pool costs more than it saves below
+_POOL_MIN formulas. FOL_BATCH_WORKERS sets the pool size (0 or 1 = inline).
+
+Public API:
+    normalize_expression(raw, syntax=None) -> (internal, detected_format, note)
+    validate_expression(raw, tester, syntax=None) -> (internal, result)
+    annotate_result(result, raw, detected_format, note) -> result
+    validate_batch(formulas, syntax=None, workers=None)
+        -> iterator of (index, raw, internal, result), in completion order
+    result_row(internal, result, user_id) -> FOLExpression column dict
+"""
+import concurrent.futures
+import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from fol_input import prepare_expression
+from owl_preprocessor import preprocess_expression
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 128
+_POOL_MIN = 256
+
+
+def normalize_expression(raw, syntax=None):
+    """Raw user input -> the internal infix form the tester parses.
+
+    Prover9 / CLIF conversion first (syntax skips detection), then the
+    comma-quantifier preprocessing. Either step failing leaves the expression
+    as it was, so the tester reports the parse error.
+    """
+    expression, detected_format, note = raw, None, None
+    try:
+        expression, detected_format, note = prepare_expression(raw, syntax)
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Error normalizing expression syntax: {str(e)}")
+    try:
+        expression, pp_format = preprocess_expression(expression)
+        detected_format = detected_format or pp_format
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"Error preprocessing expression: {str(e)}")
+    return expression, detected_format, note
+
+
+def annotate_result(result, raw, detected_format, note):
+    """Report the format the user wrote, and any conversion, on a test result.
+
+    test_expression only sees the converted internal form, so for Prover9 or
+    CLIF input it would otherwise say "instance_of".
+    """
+    if detected_format in ("clif", "prover9"):
+        result["format_detected"] = detected_format
+    elif detected_format and "format_detected" not in result:
+        result["format_detected"] = detected_format
+    if note:
+        result["conversion_note"] = note
+        result["original_expression"] = raw
+    return result
+
+
+def validate_expression(raw, tester, syntax=None):
+    """Normalize and test one formula. Returns (internal_expression, result)."""
+    expression, detected_format, note = normalize_expression(raw, syntax)
+    result = tester.test_expression(expression)
+    return expression, annotate_result(result, raw, detected_format, note)
+
+
+def result_row(expression, result, user_id):
+    """FOLExpression column values for one tested formula."""
+    return {
+        "expression": expression,
+        "is_valid": result.get("valid", False),
+        "test_results": result.get("results"),
+        "issues": result.get("issues"),
+        "bfo_classes_used": result.get("bfo_classes_used"),
+        "bfo_relations_used": result.get("bfo_relations_used"),
+        "non_bfo_terms": result.get("non_bfo_terms"),
+        "user_id": user_id,
+    }
+
+
+def _init_worker():
+    from warmup import shared_tester
+    shared_tester()  # inherited on fork when the parent was warmed up
+
+
+def _validate_chunk(start, formulas, syntax):
+    from warmup import shared_tester
+    tester = shared_tester()
+    out = []
+    for offset, raw in enumerate(formulas):
+        try:
+            expression, result = validate_expression(raw, tester, syntax)
+        except Exception as e:  # noqa: BLE001 - one bad formula must not sink the batch
+            expression, result = raw, {"expression": raw, "valid": False,
+                                       "parsed": False, "issues": [str(e)]}
+        out.append((start + offset, raw, expression, result))
+    return out
+
+
+def _workers():
+    try:
+        return int(os.environ.get("FOL_BATCH_WORKERS", ""))
+    except ValueError:
+        return min(4, os.cpu_count() or 1)
+
+
+def validate_batch(formulas, syntax=None, workers=None):
+    """Validate many formulas, yielding (index, raw, internal, result) as each
+    chunk finishes. Indexes refer to `formulas`; order is completion order.
+
+    syntax is the split syntax of the source document ('prover9' | 'clif'); any
+    other value leaves detection to each formula.
+    """
+    formulas = list(formulas)
+    hint = syntax if syntax in ("prover9", "clif") else None
+    chunks = [(i, formulas[i:i + _CHUNK]) for i in range(0, len(formulas), _CHUNK)]
+    workers = _workers() if workers is None else workers
+    if workers <= 1 or len(formulas) < _POOL_MIN:
+        for start, chunk in chunks:
+            yield from _validate_chunk(start, chunk, hint)
+        return
+
+    pending = dict(chunks)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)), initializer=_init_worker) as pool:
+            futures = {pool.submit(_validate_chunk, start, chunk, hint): start
+                       for start, chunk in chunks}
+            for future in concurrent.futures.as_completed(futures):
+                rows = future.result()
+                del pending[futures[future]]
+                yield from rows
+    except (OSError, BrokenProcessPool) as e:
+        logger.warning(f"FOL batch pool failed ({e}); validating "
+                       f"{sum(len(c) for c in pending.values())} formulas inline")
+        for start in sorted(pending):
+            yield from _validate_chunk(start, pending[start], hint)
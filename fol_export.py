@@ -31,6 +31,9 @@ import re
 import rdflib
 from rdflib.namespace import RDFS, OWL
 
+from bfo.entry_points import EntryPointIndex
+from ingest import load_graph
+
 logger = logging.getLogger(__name__)
 
 # BFO upper-category roots used to decide a class's temporal arity.
@@ -136,33 +139,17 @@ def _build_subclass_edges(graph):
     return edges
 
 
-def _bfo_parents(cls_iri, edges):
-    """BFO category IRIs reached by walking subclass edges up from cls_iri.
+def _classify(cls_iri, index, catalog):
+    """Return 'continuant' | 'occurrent' | 'unknown' for a class IRI.
 
-    Stops expanding once a BFO node is reached (the catalog supplies BFO's own
-    ancestry beyond that point).
+    index is a bfo.entry_points.EntryPointIndex over the ontology's subclass
+    edges: a user class takes its arity from the BFO categories it enters by.
     """
-    seen, stack, bfo = set(), [cls_iri], set()
-    while stack:
-        node = stack.pop()
-        if node in seen:
-            continue
-        seen.add(node)
-        for parent in edges.get(node, ()):
-            if parent.startswith(_BFO_PREFIX):
-                bfo.add(parent)
-            else:
-                stack.append(parent)
-    return bfo
-
-
-def _classify(cls_iri, edges, catalog):
-    """Return 'continuant' | 'occurrent' | 'unknown' for a class IRI."""
     if cls_iri.startswith(_BFO_PREFIX):
         anc = catalog.ancestors(cls_iri) if catalog else {cls_iri}
     else:
         anc = set()
-        for bfo_iri in _bfo_parents(cls_iri, edges):
+        for bfo_iri in index.entry_points(cls_iri):
             anc |= (catalog.ancestors(bfo_iri) if catalog else {bfo_iri})
     is_cont = _CONTINUANT in anc
     is_occ = _OCCURRENT in anc
@@ -192,13 +179,13 @@ def build_theory(file_path=None, graph=None, catalog=None, bfo_path=None):
     if graph is None:
         if not file_path:
             raise ValueError("build_theory needs file_path or graph")
-        graph = rdflib.Graph()
-        graph.parse(file_path)
+        graph = load_graph(file_path)
 
     theory = FolTheory()
     theory.bfo_path = bfo_path
     syms = _Symbols()
     edges = _build_subclass_edges(graph)
+    index = EntryPointIndex(edges, prefix=_BFO_PREFIX)
 
     def label_of(iri):
         if catalog and catalog.is_bfo_iri(iri):
@@ -212,7 +199,7 @@ def build_theory(file_path=None, graph=None, catalog=None, bfo_path=None):
         rec = {
             "sym": syms.get(iri, label),
             "label": label,
-            "kind": _classify(iri, edges, catalog),
+            "kind": _classify(iri, index, catalog),
         }
         theory.classes[iri] = rec
         return rec
@@ -273,11 +260,9 @@ def build_theory(file_path=None, graph=None, catalog=None, bfo_path=None):
         })
         for iri in referenced_bfo:
             register_class(iri)
-        for i in range(len(referenced_bfo)):
-            for j in range(i + 1, len(referenced_bfo)):
-                a, b = referenced_bfo[i], referenced_bfo[j]
-                if catalog.clash(a, b) and frozenset((a, b)) not in asserted:
-                    theory.disjoints.append((a, b, "bfo"))
+        for a, b in catalog.clashing_pairs(referenced_bfo):
+            if frozenset((a, b)) not in asserted:
+                theory.disjoints.append((a, b, "bfo"))
 
     # 5. Object properties (binary relations; signatures are out of scope here).
     for s, _, o in graph.triples((None, rdflib.RDF.type, OWL.ObjectProperty)):
@@ -15,6 +15,9 @@ and reports a note when it falls back.
 
 CLIF reading is delegated to clif_lexer (string-literal aware), so quoted prose in
 a pasted `cl:comment` never leaks into the converted formula.
+
+split_formulas breaks a whole .p9 / .clif / .txt document into the individual
+formulas the batch validator (fol_batch.py) checks one by one.
 """
 import re
 
@@ -157,9 +160,78 @@ def clif_to_internal(expr):
     return " & ".join(f"({r})" for r in rendered)
 
 
+# -- whole documents -> formulas ---------------------------------------------
+
+_P9_DIRECTIVE = re.compile(r"\b(?:set|clear|assign|op)\([^()]*\)\s*\.")
+_P9_LIST = re.compile(r"\b(?:formulas|clauses)\(\s*\w*\s*\)\s*\.|\bend_of_list\s*\.")
+
+
+def _split_prover9(text):
+    """Formulas of a Prover9 input: list wrappers and directives dropped, split
+    on the terminating '.' at parenthesis depth 0."""
+    s = re.sub(r"%[^\n]*", " ", text)
+    s = _P9_LIST.sub(" ", _P9_DIRECTIVE.sub(" ", s))
+    out, depth, start = [], 0, 0
+    for i, ch in enumerate(s):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "." and depth <= 0 and (i + 1 == len(s) or s[i + 1].isspace()):
+            formula = s[start:i].strip()
+            if formula:
+                out.append(formula + ".")
+            start, depth = i + 1, 0
+    tail = s[start:].strip()
+    if tail:
+        out.append(tail)
+    return out
+
+
+def _sexpr_text(node):
+    if isinstance(node, CLString):
+        return "'" + node.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    if isinstance(node, str):
+        return node
+    return "(" + " ".join(_sexpr_text(n) for n in node) + ")"
+
+
+def _split_clif(text):
+    """One CLIF sentence per axiom, cl:text / cl:module wrappers unwrapped."""
+    from clif_theory import iter_axioms
+    return [_sexpr_text(a) for a in iter_axioms(_clif_parse(text))]
+
+
+def _split_lines(text):
+    """One formula per non-blank line; '%' and '#' lines are comments."""
+    return [ln.strip() for ln in text.splitlines()
+            if ln.strip() and not ln.lstrip().startswith(("%", "#"))]
+
+
+_SPLITTERS = {"prover9": _split_prover9, "clif": _split_clif, "lines": _split_lines}
+
+
+def split_formulas(text, syntax=None):
+    """Split a document of many formulas into single formulas.
+
+    syntax is 'prover9' (formulas(...) lists, '.'-terminated), 'clif' (one
+    top-level sentence each) or 'lines' (one formula per line); None detects it
+    from the document. Returns (formulas, syntax) with syntax resolved.
+    """
+    if syntax not in _SPLITTERS:
+        s = text.lstrip()
+        if re.search(r"\bend_of_list\s*\.|\b(?:formulas|clauses)\s*\(", text):
+            syntax = "prover9"
+        elif s.startswith("(") and detect_syntax(s) == "clif":
+            syntax = "clif"
+        else:
+            syntax = "lines"
+    return _SPLITTERS[syntax](text), syntax
+
+
 # -- public entry point ------------------------------------------------------
 
-def prepare_expression(raw):
+def prepare_expression(raw, syntax=None):
     """Normalize raw user input to internal infix syntax for the tester.
 
     Returns (internal_expr, detected_format, note):
@@ -168,8 +240,11 @@ def prepare_expression(raw):
       - detected_format: 'clif' | 'prover9' | 'instance_of' | 'traditional' | None.
       - note: a short human-readable note when a conversion was performed or
         failed, else None.
+
+    syntax ('clif' | 'prover9') skips detection, for formulas already known to
+    come from a file in that syntax.
     """
-    syntax = detect_syntax(raw)
+    syntax = syntax or detect_syntax(raw)
     note = None
     internal = raw
     try:
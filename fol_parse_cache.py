@@ -0,0 +1,112 @@
+"""
+Bounded LRU cache of parsed FOL expressions for OwlTester.
+
+test_expression parsed each expression with NLTK's LogicParser, and
+detect_free_variables parsed it again, so every request paid for two parses, and
+extract_terms ran its three regex scans on top. Classroom deployments submit the
+same handful of expressions over and over. ParseCache parses an expression once
+and keeps the result with everything derived from it (extracted terms, free
+variables), keyed on the expression with whitespace collapsed. Parse failures
+are cached too: a wrong answer resubmitted by a whole class fails fast.
+
+The cache is shared by the process-wide OwlTester (warmup.shared_tester), so it
+is guarded by a lock. FOL_PARSE_CACHE_SIZE bounds it (default 4096 entries, 0
+disables caching); stats() reports hits, misses and evictions for tuning.
+
+Public API:
+    normalize_expression_key(text) -> the cache key
+    ParsedExpression                 one cached parse
+    ParseCache(parse, extract_terms, maxsize=None)
+        .get(text) -> ParsedExpression
+        .stats()   -> {hits, misses, evictions, size, maxsize}
+        .clear()
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+
+def normalize_expression_key(text):
+    """The expression with every whitespace run collapsed to one space.
+
+    LogicParser and the term patterns are whitespace-insensitive, so inputs that
+    differ only in spacing or line breaks share one entry.
+    """
+    return " ".join(str(text).split())
+
+
+@dataclass(frozen=True)
+class ParsedExpression:
+    key: str
+    expression: Any                       # the NLTK Expression, None on failure
+    error: Optional[BaseException]        # the parse exception, None on success
+    terms: Tuple[str, ...]
+    free_variables: Tuple[str, ...]
+
+    def raise_error(self):
+        """Re-raise the cached parse exception (with a fresh traceback)."""
+        if self.error is not None:
+            raise self.error.with_traceback(None)
+
+
+class ParseCache:
+    """LRU map from normalized expression to ParsedExpression."""
+
+    def __init__(self, parse, extract_terms, maxsize=None):
+        if maxsize is None:
+            maxsize = int(os.environ.get("FOL_PARSE_CACHE_SIZE", "4096"))
+        self._parse = parse
+        self._extract_terms = extract_terms
+        self.maxsize = max(0, maxsize)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def _build(self, key):
+        try:
+            expression, error = self._parse(key), None
+        except Exception as e:  # noqa: BLE001 - cached and re-raised by the caller
+            expression, error = None, e
+        free = ()
+        if expression is not None:
+            try:
+                free = tuple(sorted(str(v) for v in expression.free()))
+            except Exception:  # noqa: BLE001
+                free = ()
+        return ParsedExpression(key, expression, error,
+                                tuple(self._extract_terms(key)), free)
+
+    def get(self, text):
+        key = normalize_expression_key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        # Parse outside the lock: a concurrent miss on the same key costs one
+        # duplicate parse, never a wrong answer.
+        entry = self._build(key)
+        if self.maxsize:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self._entries),
+                    "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
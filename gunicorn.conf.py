@@ -9,3 +9,16 @@ preload_app = True
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
+
+
+def when_ready(server):
+    """Build the fixed inputs (BFO catalog, CLIF background, kernel, shared
+    OwlTester) in the master, so every forked worker, recycled ones included,
+    starts hot. See warmup.py; WARM_START=0 skips it."""
+    import gc
+
+    from warmup import warm_up
+    warm_up()
+    # Keep the warmed objects out of the collector so it does not touch (and
+    # un-share) their pages in the workers.
+    gc.freeze()
@@ -0,0 +1,172 @@
+"""
+On-disk export of an analysis's full inferred closure.
+
+The stored analysis keeps at most MAX_INFERRED_AXIOMS inferences in its JSON
+column, which drops most of ELK's output on large hierarchies. The complete set
+is written here instead, one gzip-compressed NDJSON file per analysis, and the
+OntologyAnalysis row keeps only the summary this module returns (file name,
+counts, size and digest), not the inferences or their derivation steps; the
+paginated axiom API serves the closure from the AnalysisAxiom index. The file
+is served by a streaming download that honours HTTP Range requests, so large
+closures can be fetched or resumed without passing through the page.
+
+Each line is one axiom, with the reasoner's explanation when it gave one:
+    {"type": "SubClassOf", "description": "A ⊑ B", "subject": "A",
+     "object": "B", "origin": "ROBOT/ELK",
+     "derivation": {"reason": ..., "supporting_facts": [...], "confidence": ...}}
+
+Public API:
+    export_dir() -> directory holding export files (INFERENCE_EXPORT_DIR)
+    write_inference_export(analysis_id, inferred_axioms) -> summary dict
+    export_path(summary) -> absolute path of an existing export, or None
+    iter_export(summary) -> iterator of axiom dicts (the file's lines)
+    send_inference_export(summary, download_name) -> Flask response (Range-aware)
+    remove_inference_export(summary)
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+
+from axiom_index import split_axiom
+
+logger = logging.getLogger(__name__)
+
+FORMAT = "ndjson+gzip"
+MEDIA_TYPE = "application/gzip"
+_CHUNK = 1 << 20
+_EXPLANATION = ("reason", "supporting_facts", "confidence")
+
+
+def export_dir():
+    """Directory for export files: INFERENCE_EXPORT_DIR, else exports/ next to
+    this module (alongside uploads/). Created on demand."""
+    path = os.environ.get("INFERENCE_EXPORT_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "exports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _filename(analysis_id):
+    return f"analysis-{int(analysis_id)}-inferred.ndjson.gz"
+
+
+def write_inference_export(analysis_id, inferred_axioms):
+    """Write every inferred axiom to the analysis's export file.
+
+    The file is written to a temporary name and renamed into place, so a
+    reader never sees a partial export. Returns the summary to store on the
+    analysis row.
+    """
+    started = time.perf_counter()
+    directory = export_dir()
+    name = _filename(analysis_id)
+    by_type = Counter()
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            # mtime=0 keeps the bytes (and so the digest) reproducible.
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                for ax in inferred_axioms:
+                    description = ax.get("description", "")
+                    subject, obj = split_axiom(description)
+                    axiom_type = ax.get("type", "")
+                    by_type[axiom_type] += 1
+                    derivation = ax.get("derivation") or {}
+                    record = {
+                        "type": axiom_type,
+                        "description": description,
+                        "subject": subject,
+                        "object": obj,
+                        "origin": derivation.get("origin"),
+                    }
+                    explanation = {k: derivation[k] for k in _EXPLANATION if derivation.get(k)}
+                    if explanation:
+                        record["derivation"] = explanation
+                    line = json.dumps(record, ensure_ascii=False)
+                    gz.write(line.encode("utf-8") + b"\n")
+        digest = hashlib.sha256()
+        with open(tmp_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(_CHUNK), b""):
+                digest.update(chunk)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    summary = {
+        "file": name,
+        "format": FORMAT,
+        "axioms": sum(by_type.values()),
+        "by_type": dict(by_type),
+        "bytes": os.path.getsize(os.path.join(directory, name)),
+        "sha256": digest.hexdigest(),
+        "created": datetime.datetime.utcnow().isoformat(),
+    }
+    logger.info(f"[STAGE] inference_export: {time.perf_counter()-started:.2f}s "
+                f"({summary['axioms']} axioms, {summary['bytes']} bytes)")
+    return summary
+
+
+def export_path(summary):
+    """Absolute path of the export a summary refers to, or None if the summary
+    is empty, names a file outside export_dir(), or the file is gone."""
+    name = (summary or {}).get("file")
+    if not name or os.path.basename(name) != name:
+        return None
+    path = os.path.join(export_dir(), name)
+    return path if os.path.isfile(path) else None
+
+
+def iter_export(summary):
+    """The axioms of an export, one dict per line, streamed from the gzip file.
+    Yields nothing when the file is missing."""
+    path = export_path(summary)
+    if path is None:
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def send_inference_export(summary, download_name):
+    """Stream an export file as an attachment.
+
+    Werkzeug's conditional responses handle Range (206 Partial Content),
+    If-Range and If-None-Match against the file's sha256 ETag. Returns None
+    if the file is missing.
+    """
+    from flask import send_file
+
+    path = export_path(summary)
+    if path is None:
+        return None
+    response = send_file(
+        path,
+        mimetype=MEDIA_TYPE,
+        as_attachment=True,
+        download_name=download_name,
+        conditional=True,
+        etag=summary.get("sha256") or True,
+    )
+    response.headers["X-Axiom-Count"] = str(summary.get("axioms", 0))
+    return response
+
+
+def remove_inference_export(summary):
+    """Delete an export file; missing files are ignored."""
+    path = export_path(summary)
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.warning(f"Could not delete inference export {path}: {e}")
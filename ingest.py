@@ -0,0 +1,473 @@
+"""
+Upload ingestion: stream to disk once, parse once, snapshot for every later route.
+
+upload_owl used to save the upload to a temp file, re-read its head twice to
+guess the format, let auto_convert_ontology parse and re-serialize it, and move
+it around; then analyze, diagram, BVSS, fix, prover-check and completeness each
+parsed the stored RDF/XML again. ingest_upload() instead:
+
+  1. streams the upload to disk in chunks, hashing it (sha256) and sniffing the
+     format from the first chunk as it goes;
+  2. parses it once with rdflib, in the sniffed format (Functional Syntax with
+     ofn_reader). Non-RDF/XML input is serialized to RDF/XML from that same
+     graph, so stored uploads stay RDF/XML as before. OWL/XML is stored as
+     uploaded (owlready2 reads it; rdflib cannot);
+  3. writes a binary snapshot of the graph next to the stored file
+     (<file>.snap): an interned term table plus a packed table of uint32 triple
+     ids, zlib-compressed. load_graph() rebuilds the graph from it without
+     tokenizing any RDF, and falls back to a normal parse when the snapshot is
+     missing or stale (its header records the source's size and mtime).
+
+Snapshots are only written by ingestion, never by load_graph, so reading a
+fixture or the vendored BFO file leaves no files behind. The owlready2 routes
+(Pellet, BVSS, sandbox import) load the same snapshot through load_owlready(),
+which hands it to owlready2 as N-Triples rendered straight from the term table.
+
+Compressed uploads (.gz, .bz2, .xz, or a .zip holding one ontology) are
+decompressed as they are streamed to disk, so neither the archive nor its
+contents are ever held in memory. The size limit applies to the decompressed
+bytes, and a decompression ratio above INGEST_MAX_RATIO (default 200:1, checked
+once 16 MiB have been inflated) aborts the upload as a likely decompression bomb.
+
+Public API:
+    sniff_format(head, filename=None) -> 'xml' | 'turtle' | 'n3' | 'nt' |
+                                         'json-ld' | 'owlxml' | 'ofn'
+    ingest_upload(stream, dest_dir, stem, filename=None, max_bytes=None) -> Ingested
+    open_upload(stream, filename=None) -> (binary reader, inner filename, compression)
+    load_graph(path, format=None) -> rdflib.Graph (snapshot when fresh)
+    write_snapshot(graph, source_path, sha256=None) -> snapshot path
+    write_ntriples(path, fh) -> triple count written from the snapshot, or None
+    load_owlready(path, world=None, iri=None) -> loaded owlready2 ontology
+    snapshot_path(path) / remove_snapshot(path)
+"""
+
+import array
+import bz2
+import gzip
+import hashlib
+import json
+import logging
+import lzma
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+import rdflib
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1 << 20
+_SNIFF_BYTES = 4096
+_MAGIC = b"OTSNAP1\n"
+_NT_BATCH = 50000
+# Formats parsed into a graph (ofn by ofn_reader); the rest are stored as uploaded.
+RDF_FORMATS = ("xml", "turtle", "n3", "nt", "json-ld", "ofn")
+_BY_EXTENSION = {"owl": "xml", "rdf": "xml", "xml": "xml", "ttl": "turtle",
+                 "n3": "n3", "nt": "nt", "jsonld": "json-ld", "json": "json-ld",
+                 "ofn": "ofn", "owx": "owlxml"}
+COMPRESSED_EXTENSIONS = ("gz", "bz2", "xz", "zip")
+_RATIO_FLOOR = 16 << 20  # inflated bytes before the ratio check applies
+
+
+class IngestError(ValueError):
+    """The upload is empty or cannot be stored."""
+
+
+@dataclass
+class Ingested:
+    path: str                   # the stored file (RDF/XML unless unparsed)
+    sha256: str                 # of the uploaded bytes
+    size: int                   # uploaded bytes
+    format: str                 # sniffed upload format
+    triples: Optional[int]      # None when the upload was not parsed
+    snapshot: Optional[str]     # snapshot path, None when none was written
+    seconds: float
+    compression: Optional[str] = None   # 'gz' | 'bz2' | 'xz' | 'zip' when compressed
+
+
+def sniff_format(head, filename=None):
+    """The serialization of an ontology from its first bytes (extension as tiebreak)."""
+    text = head.decode("utf-8", errors="ignore").lstrip("\ufeff").lstrip()
+    ext = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    body = re.sub(r"^(?:#[^\n]*\n\s*)+", "", text)  # leading comment lines
+    if text.startswith("<"):
+        if "<rdf:RDF" in text or re.search(r"<(?:\w+:)?RDF\b", text):
+            return "xml"
+        if re.search(r"<(?:\w+:)?Ontology\b[^>]*xmlns(?::\w+)?=\"http://www\.w3\.org/2002/07/owl#\"", text):
+            return "owlxml"
+        if text.startswith("<?xml") or "<owl:Ontology" in text:
+            return "owlxml" if ext == "owx" else "xml"
+        return "nt"  # <s> <p> <o> .
+    if body.startswith(("Prefix(", "Ontology(")):
+        return "ofn"
+    if body.startswith("{") or body.startswith("["):
+        return "json-ld"
+    if re.match(r"(?:@prefix|@base|PREFIX|BASE)\b", body, re.IGNORECASE):
+        return "n3" if ext == "n3" else "turtle"
+    if body.startswith("_:"):
+        return "nt"
+    return _BY_EXTENSION.get(ext, "turtle")
+
+
+# -- snapshot ----------------------------------------------------------------
+
+def snapshot_path(path):
+    return f"{path}.snap"
+
+
+def remove_snapshot(path):
+    try:
+        os.remove(snapshot_path(path))
+    except OSError:
+        pass
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def write_snapshot(graph, source_path, sha256=None):
+    """Write <source_path>.snap for graph, the parse of source_path. Atomic."""
+    ids, uris, bnodes, literals = {}, [], [], []
+    for term in graph.all_nodes() | set(graph.predicates()):
+        if term in ids:
+            continue
+        if isinstance(term, rdflib.Literal):
+            literals.append(term)
+        elif isinstance(term, rdflib.BNode):
+            bnodes.append(term)
+        else:
+            uris.append(term)
+    for i, term in enumerate(uris + bnodes + literals):
+        ids[term] = i
+    table = array.array("I")
+    for s, p, o in graph:
+        table.extend((ids[s], ids[p], ids[o]))
+    if sys.byteorder != "little":
+        table.byteswap()
+    terms = {
+        "u": [str(t) for t in uris],
+        "b": [str(t) for t in bnodes],
+        "l": [[str(t), str(t.datatype) if t.datatype else None, t.language]
+              for t in literals],
+    }
+    size, mtime_ns = _stat_key(source_path)
+    header = {"source_size": size, "source_mtime_ns": mtime_ns, "sha256": sha256,
+              "triples": len(graph), "terms": len(ids),
+              "namespaces": [[p, str(n)] for p, n in graph.namespaces()]}
+    target = snapshot_path(source_path)
+    fd, tmp = tempfile.mkstemp(suffix=".snap.tmp", dir=os.path.dirname(os.path.abspath(target)))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_MAGIC)
+            fh.write(json.dumps(header).encode("utf-8") + b"\n")
+            terms_blob = zlib.compress(json.dumps(terms).encode("utf-8"), 1)
+            fh.write(len(terms_blob).to_bytes(8, "little"))
+            fh.write(terms_blob)
+            fh.write(zlib.compress(table.tobytes(), 1))
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return target
+
+
+def _snapshot_tables(path):
+    """(header, terms, triple id table) of path's snapshot, or None when absent
+    or stale."""
+    target = snapshot_path(path)
+    try:
+        with open(target, "rb") as fh:
+            if fh.read(len(_MAGIC)) != _MAGIC:
+                return None
+            header = json.loads(fh.readline())
+            if (header["source_size"], header["source_mtime_ns"]) != _stat_key(path):
+                return None
+            terms_len = int.from_bytes(fh.read(8), "little")
+            terms = json.loads(zlib.decompress(fh.read(terms_len)))
+            table = array.array("I")
+            table.frombytes(zlib.decompress(fh.read()))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, zlib.error) as e:
+        logger.warning(f"Ignoring unreadable snapshot {target}: {e}")
+        return None
+    if sys.byteorder != "little":
+        table.byteswap()
+    return header, terms, table
+
+
+def _read_snapshot(path):
+    """The graph stored in path's snapshot, or None when absent or stale."""
+    tables = _snapshot_tables(path)
+    if tables is None:
+        return None
+    header, terms, table = tables
+    URIRef, BNode, Literal = rdflib.URIRef, rdflib.BNode, rdflib.Literal
+    nodes = [URIRef(u) for u in terms["u"]] + [BNode(b) for b in terms["b"]]
+    nodes += [Literal(lex, lang=lang, datatype=URIRef(dt) if dt else None)
+              for lex, dt, lang in terms["l"]]
+    graph = rdflib.Graph()
+    for prefix, ns in header.get("namespaces", ()):
+        graph.bind(prefix, ns, override=True, replace=True)
+    store = graph.store
+    it = iter(table)
+    for s, p, o in zip(it, it, it):
+        store.add((nodes[s], nodes[p], nodes[o]), graph)
+    return graph
+
+
+def _nt_string(lex):
+    return '"%s"' % lex.replace("\\", "\\\\").replace("\n", "\\n").replace(
+        '"', '\\"').replace("\r", "\\r")
+
+
+def write_ntriples(path, fh):
+    """Write path's snapshot to the binary file fh as N-Triples.
+
+    Each term is rendered once and the triples are joined from the id table,
+    so owlready2 can load a stored upload (load(fileobj=fh, format="ntriples"))
+    without its RDF/XML being parsed again. Returns the triple count, or None
+    (writing nothing) when there is no current snapshot.
+    """
+    t = time.perf_counter()
+    tables = _snapshot_tables(path)
+    if tables is None:
+        return None
+    _, terms, table = tables
+    nodes = [f"<{u}>" for u in terms["u"]] + [f"_:{b}" for b in terms["b"]]
+    for lex, dt, lang in terms["l"]:
+        if lang:
+            nodes.append(f"{_nt_string(lex)}@{lang}")
+        elif dt:
+            nodes.append(f"{_nt_string(lex)}^^<{dt}>")
+        else:
+            nodes.append(_nt_string(lex))
+    it = iter(table)
+    batch = []
+    for s, p, o in zip(it, it, it):
+        batch.append(f"{nodes[s]} {nodes[p]} {nodes[o]} .\n")
+        if len(batch) == _NT_BATCH:
+            fh.write("".join(batch).encode("utf-8"))
+            batch = []
+    fh.write("".join(batch).encode("utf-8"))
+    count = len(table) // 3
+    logger.info(f"[STAGE] write_ntriples (snapshot): {time.perf_counter()-t:.2f}s ({count} triples)")
+    return count
+
+
+def load_owlready(path, world=None, iri=None):
+    """Load a stored ontology into owlready2 (world, default_world if None).
+
+    Fed from the snapshot as N-Triples when it is current, so the upload is not
+    parsed a second time; otherwise owlready2 reads the file itself. iri is the
+    name passed to get_ontology (default: path).
+    """
+    import owlready2
+
+    onto = (world or owlready2.default_world).get_ontology(iri or path)
+    with tempfile.TemporaryFile() as fh:
+        if write_ntriples(path, fh) is not None:
+            fh.seek(0)
+            return onto.load(fileobj=fh, format="ntriples")
+    return onto.load()
+
+
+def _parse(path, format=None):
+    """Parse path into a new graph; 'ofn' (or a .ofn path) goes to ofn_reader."""
+    if format == "ofn" or (format is None and path.lower().endswith(".ofn")):
+        from ofn_reader import parse_file
+        return parse_file(path)
+    graph = rdflib.Graph()
+    graph.parse(path, format=format)
+    return graph
+
+
+def load_graph(path, format=None):
+    """rdflib graph of a stored ontology: from its snapshot when one is current,
+    else parsed (with format, or guessed from the extension)."""
+    t = time.perf_counter()
+    graph = _read_snapshot(path)
+    if graph is not None:
+        logger.info(f"[STAGE] load_graph (snapshot): {time.perf_counter()-t:.2f}s ({len(graph)} triples)")
+        return graph
+    graph = _parse(path, format)
+    logger.info(f"[STAGE] load_graph (parse): {time.perf_counter()-t:.2f}s ({len(graph)} triples)")
+    return graph
+
+
+# -- ingestion ---------------------------------------------------------------
+
+def _extension(filename):
+    return filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+
+
+class _Counting:
+    """Reader that counts the bytes read through it (compressed input)."""
+
+    def __init__(self, raw):
+        self.raw, self.count = raw, 0
+
+    def read(self, n=-1):
+        data = self.raw.read(n)
+        self.count += len(data)
+        return data
+
+
+class _Inflating:
+    """Decompressed reader that aborts on an implausible compression ratio."""
+
+    def __init__(self, reader, compressed_bytes, compression):
+        self.reader, self.compressed_bytes, self.compression = reader, compressed_bytes, compression
+        self.max_ratio = float(os.environ.get("INGEST_MAX_RATIO", "200"))
+        self.size = 0
+
+    def read(self, n=-1):
+        try:
+            data = self.reader.read(n)
+        except (OSError, EOFError, zlib.error, lzma.LZMAError, zipfile.BadZipFile) as e:
+            raise IngestError(f"Corrupt .{self.compression} upload: {e}") from e
+        self.size += len(data)
+        if self.size > _RATIO_FLOOR and self.size > self.max_ratio * max(1, self.compressed_bytes()):
+            raise IngestError(f".{self.compression} upload inflates more than "
+                              f"{self.max_ratio:g}:1; refusing it as a likely decompression bomb")
+        return data
+
+    def close(self):
+        self.reader.close()
+
+
+def _zip_member(archive):
+    """The one ontology file in a zip archive."""
+    members = [m for m in archive.infolist()
+               if not m.is_dir() and not m.filename.startswith("__MACOSX/")
+               and _extension(m.filename) in _BY_EXTENSION]
+    if len(members) != 1:
+        raise IngestError(f"A .zip upload must contain exactly one ontology file "
+                          f"({len(members)} found)")
+    return members[0]
+
+
+def open_upload(stream, filename=None):
+    """Wrap an upload stream for reading its ontology bytes.
+
+    Returns (reader, inner filename, compression): compressed uploads are
+    decompressed on the fly and named after their content (onto.ttl.gz ->
+    onto.ttl, a zip -> its member); anything else is returned unchanged with
+    compression None. .zip needs a seekable stream (werkzeug spools uploads).
+    """
+    compression = _extension(filename)
+    if compression not in COMPRESSED_EXTENSIONS:
+        return stream, filename, None
+    inner = filename[:-(len(compression) + 1)]
+    if compression == "zip":
+        try:
+            archive = zipfile.ZipFile(stream)
+            member = _zip_member(archive)
+            reader = archive.open(member)
+        except (zipfile.BadZipFile, OSError, EOFError) as e:
+            raise IngestError(f"Corrupt .zip upload: {e}") from e
+        return (_Inflating(reader, lambda: member.compress_size, compression),
+                os.path.basename(member.filename), compression)
+    counted = _Counting(stream)
+    opener = {"gz": gzip.GzipFile, "bz2": bz2.BZ2File, "xz": lzma.LZMAFile}[compression]
+    reader = opener(fileobj=counted) if compression == "gz" else opener(counted)
+    return _Inflating(reader, lambda: counted.count, compression), inner, compression
+
+
+def _stream_to(stream, fh, max_bytes=None):
+    """Copy stream into fh in chunks; returns (sha256 hex, size, first bytes)."""
+    digest, size, head = hashlib.sha256(), 0, b""
+    while True:
+        chunk = stream.read(_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise IngestError(f"upload exceeds the {max_bytes} byte limit")
+        if len(head) < _SNIFF_BYTES:
+            head += chunk[:_SNIFF_BYTES - len(head)]
+        digest.update(chunk)
+        fh.write(chunk)
+    return digest.hexdigest(), size, head
+
+
+def _parse_candidates(fmt, ext, head):
+    """Formats to try, in order: the sniffed one, then the extension's, then
+    RDF/XML for markup. Sniffing reads only the head, so a Turtle file opening
+    with a full IRI looks like N-Triples and must get a second chance. OWL/XML
+    gets none: rdflib would read it as (meaningless) RDF/XML."""
+    if fmt not in RDF_FORMATS:
+        return []
+    out = [fmt, _BY_EXTENSION.get(ext)]
+    if head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"<"):
+        out.append("xml")
+    return [f for i, f in enumerate(out) if f in RDF_FORMATS and f not in out[:i]]
+
+
+def ingest_upload(stream, dest_dir, stem, filename=None, max_bytes=None):
+    """Store an uploaded ontology in dest_dir as <stem>.<ext>, parsed once and
+    snapshotted.
+
+    stream is any binary file-like object (werkzeug's FileStorage.stream) and
+    filename the user's original name: its extension is kept, except that input
+    converted to RDF/XML is stored as .owl. Input that does not parse is stored
+    as uploaded, without a snapshot, so owlready2 still gets its turn at analysis
+    time. Compressed uploads are decompressed while streaming (open_upload);
+    max_bytes, sha256 and size then refer to the decompressed ontology. Raises
+    IngestError for an empty, oversized, corrupt or bomb-like upload.
+    """
+    t = time.perf_counter()
+    stream, filename, compression = open_upload(stream, filename)
+    ext = _extension(filename) or "owl"
+    fd, raw = tempfile.mkstemp(prefix="upload_", dir=dest_dir)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            sha256, size, head = _stream_to(stream, fh, max_bytes)
+        if size == 0:
+            raise IngestError("Uploaded file is empty")
+        fmt = sniff_format(head, filename)
+
+        graph = None
+        for candidate in _parse_candidates(fmt, ext, head):
+            try:
+                graph = _parse(raw, candidate)
+            except Exception as e:  # noqa: BLE001 - stored as-is; analysis reports it
+                logger.warning(f"ingest: {candidate} parse of {filename or raw} failed ({e})")
+                continue
+            fmt = candidate
+            break
+        else:
+            if fmt in RDF_FORMATS:
+                logger.warning(f"ingest: storing {filename or raw} unconverted")
+        if graph is not None and fmt != "xml":
+            dest_path = os.path.join(dest_dir, f"{stem}.owl")
+            graph.serialize(destination=dest_path, format="xml")
+            os.remove(raw)
+        else:
+            dest_path = os.path.join(dest_dir, f"{stem}.{ext}")
+            os.replace(raw, dest_path)
+
+        snap = None
+        if graph is not None:
+            try:
+                snap = write_snapshot(graph, dest_path, sha256)
+            except OSError as e:
+                logger.warning(f"ingest: snapshot for {dest_path} not written ({e})")
+    finally:
+        if compression:
+            stream.close()
+        if os.path.exists(raw):
+            os.remove(raw)
+    seconds = round(time.perf_counter() - t, 3)
+    logger.info(f"[STAGE] ingest: {size} bytes {fmt}{f' (from .{compression})' if compression else ''} "
+                f"sha256={sha256[:12]} {len(graph) if graph is not None else '-'} triples in {seconds}s")
+    return Ingested(dest_path, sha256, size, fmt,
+                    len(graph) if graph is not None else None, snap, seconds, compression)
@@ -0,0 +1,61 @@
+"""Add the inference-export column to ontology_analysis.
+
+Mirrors migrate_db_prover.py. Adds:
+  - inference_export (JSON): summary of, and file name for, the analysis's full
+    inferred closure, written to disk as gzip-compressed NDJSON
+
+Run inside the app container against PostgreSQL:
+    docker compose exec app python migrate_db_inference_export.py
+
+PostgreSQL supports ADD COLUMN IF NOT EXISTS. SQLite does not, so for the SQLite
+fallback we ignore "duplicate column" errors; fresh SQLite databases get the
+column from db.create_all() anyway.
+"""
+
+import os
+
+from sqlalchemy import create_engine, text
+
+PG_STATEMENTS = [
+    "ALTER TABLE ontology_analysis ADD COLUMN IF NOT EXISTS inference_export JSONB;",
+]
+
+SQLITE_STATEMENTS = [
+    "ALTER TABLE ontology_analysis ADD COLUMN inference_export JSON;",
+]
+
+
+def migrate_database():
+    """Run the migration. Returns True on success."""
+    print("Starting inference-export migration...")
+
+    database_url = os.environ.get('DATABASE_URL', 'sqlite:///owl_tester.db')
+    engine = create_engine(database_url)
+    is_sqlite = engine.dialect.name == 'sqlite'
+
+    try:
+        with engine.connect() as conn:
+            if is_sqlite:
+                for stmt in SQLITE_STATEMENTS:
+                    try:
+                        conn.execute(text(stmt))
+                    except Exception as e:
+                        if 'duplicate column' in str(e).lower():
+                            print(f"  skipping (already present): {stmt}")
+                        else:
+                            raise
+            else:
+                for stmt in PG_STATEMENTS:
+                    conn.execute(text(stmt))
+            conn.commit()
+
+        print("Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    migrate_database()
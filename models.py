@@ -54,7 +54,14 @@ class OntologyFile(db.Model):
 
 
 class OntologyAnalysis(db.Model):
-    """Model for storing ontology analysis results."""
+    """Model for storing ontology analysis results.
+
+    The JSON/text payload columns are deferred in named groups (axioms,
+    inferences, entities, reasoning, fol, implications), so a plain query loads
+    only the scalar columns. Routes that render a payload undefer its group,
+    e.g. query.options(db.undefer_group('entities')); touching any deferred
+    column otherwise loads its whole group on first access.
+    """
     
     id = db.Column(db.Integer, primary_key=True)
     ontology_file_id = db.Column(db.Integer, db.ForeignKey('ontology_file.id'), nullable=False)
@@ -78,40 +85,85 @@ class OntologyAnalysis(db.Model):
     complexity = db.Column(db.Integer, default=0)
     
     # Store detailed results as JSON
-    axioms = db.Column(db.JSON, nullable=True)
-    consistency_issues = db.Column(db.JSON, nullable=True)
-    inferred_axioms = db.Column(db.JSON, nullable=True)
-    fol_premises = db.Column(db.JSON, nullable=True)
-    real_world_implications = db.Column(db.JSON, nullable=True)
+    axioms = db.deferred(db.Column(db.JSON, nullable=True), group='axioms')
+    consistency_issues = db.deferred(db.Column(db.JSON, nullable=True), group='axioms')
+    inferred_axioms = db.deferred(db.Column(db.JSON, nullable=True), group='inferences')
+    fol_premises = db.deferred(db.Column(db.JSON, nullable=True), group='fol')
+    real_world_implications = db.deferred(db.Column(db.JSON, nullable=True), group='implications')
     implications_generated = db.Column(db.Boolean, default=False)
     implications_generation_date = db.Column(db.DateTime, nullable=True)
     
     # Entity lists for direct display
-    class_list = db.Column(db.JSON, nullable=True)
-    object_property_list = db.Column(db.JSON, nullable=True)
-    data_property_list = db.Column(db.JSON, nullable=True)
-    individual_list = db.Column(db.JSON, nullable=True)
+    class_list = db.deferred(db.Column(db.JSON, nullable=True), group='entities')
+    object_property_list = db.deferred(db.Column(db.JSON, nullable=True), group='entities')
+    data_property_list = db.deferred(db.Column(db.JSON, nullable=True), group='entities')
+    individual_list = db.deferred(db.Column(db.JSON, nullable=True), group='entities')
     
     # Transparency fields
-    reasoning_methodology = db.Column(db.JSON, nullable=True)
-    derivation_steps = db.Column(db.JSON, nullable=True)
+    reasoning_methodology = db.deferred(db.Column(db.JSON, nullable=True), group='reasoning')
+    derivation_steps = db.deferred(db.Column(db.JSON, nullable=True), group='axioms')
 
     # Coherence (distinct from consistency) and BFO conformance lint
-    unsatisfiable_classes = db.Column(db.JSON, nullable=True)
-    lint_findings = db.Column(db.JSON, nullable=True)
+    unsatisfiable_classes = db.deferred(db.Column(db.JSON, nullable=True), group='reasoning')
+    lint_findings = db.deferred(db.Column(db.JSON, nullable=True), group='reasoning')
     coherence_status = db.Column(db.String(20), nullable=True)
 
     # Provable FOL export (SPEC Task 5): the ontology's axioms rendered in
     # Prover9 (LADR) and CLIF syntax, plus the prover-vs-reasoner cross-check.
-    fol_prover9 = db.Column(db.Text, nullable=True)
-    fol_clif = db.Column(db.Text, nullable=True)
-    fol_export_stats = db.Column(db.JSON, nullable=True)
-    prover_cross_check = db.Column(db.JSON, nullable=True)
+    fol_prover9 = db.deferred(db.Column(db.Text, nullable=True), group='fol')
+    fol_clif = db.deferred(db.Column(db.Text, nullable=True), group='fol')
+    fol_export_stats = db.deferred(db.Column(db.JSON, nullable=True), group='fol')
+    prover_cross_check = db.deferred(db.Column(db.JSON, nullable=True), group='fol')
+
+    # Summary of, and file reference to, the full inferred closure written to
+    # disk by inference_export. When it is set, inferred_axioms above is left
+    # empty; the closure is served from AnalysisAxiom and this file.
+    inference_export = db.Column(db.JSON, nullable=True)
 
     def __repr__(self):
         return f"<OntologyAnalysis {self.id} for {self.ontology_file_id}>"
 
 
+class AnalysisAxiom(db.Model):
+    """One asserted or inferred axiom of an analysis, normalized for paging.
+
+    The JSON columns on OntologyAnalysis hold a capped copy for the legacy
+    template; this table holds every axiom (including the full reasoner
+    closure) so the analysis page can page and filter it server-side.
+    Created by db.create_all(); no column migration is needed.
+    """
+
+    __table_args__ = (
+        db.Index('ix_analysis_axiom_lookup', 'analysis_id', 'kind', 'axiom_type'),
+        db.Index('ix_analysis_axiom_subject', 'analysis_id', 'subject'),
+        db.Index('ix_analysis_axiom_object', 'analysis_id', 'object'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('ontology_analysis.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # 'asserted' or 'inferred'
+    axiom_type = db.Column(db.String(50), nullable=False)
+    subject = db.Column(db.String(255), nullable=True)
+    object = db.Column(db.String(255), nullable=True)
+    origin = db.Column(db.String(50), nullable=True, index=True)
+    description = db.Column(db.Text, nullable=False)
+
+    analysis = db.relationship('OntologyAnalysis', backref=db.backref('axiom_rows', lazy='dynamic', cascade="all, delete-orphan"))
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'type': self.axiom_type,
+            'subject': self.subject,
+            'object': self.object,
+            'origin': self.origin,
+            'description': self.description,
+        }
+
+    def __repr__(self):
+        return f"<AnalysisAxiom {self.id}: {self.description}>"
+
+
 class FOLExpression(db.Model):
     """Model for storing tested FOL expressions."""
     
@@ -0,0 +1,456 @@
+"""
+Streaming reader for OWL 2 Functional-Style Syntax (.ofn), emitting RDF triples.
+
+Functional Syntax is the default output of ROBOT and of several editors, but
+neither rdflib nor owlready2 reads it, so .ofn uploads used to be stored
+unparsed and only ROBOT (a JVM start per file) could make sense of them. This
+module reads them in pure Python and produces the RDF graph the W3C "OWL 2
+Mapping to RDF Graphs" prescribes, so an .ofn upload enters the same pipeline as
+RDF/XML or Turtle (ingest.py converts it to RDF/XML once and snapshots it).
+
+Reading is streamed like clif_lexer.iter_forms: one compiled regular expression
+tokenizes the file a chunk at a time, an explicit stack assembles each axiom,
+and an axiom's triples are emitted as soon as its closing parenthesis arrives,
+so the document is never held as a token list or a syntax tree. Prefix
+declarations apply from the point they are read; rdf, rdfs, xsd and owl are
+predeclared as the specification requires.
+
+Covered: every OWL 2 axiom and class / property / data-range expression,
+anonymous individuals, literals with language tags or datatypes, ontology IRI,
+version IRI, imports and ontology annotations, and axiom and nested annotations
+(reified with owl:Axiom / owl:Annotation). Relative IRIs are not resolved
+against a base. scripts/bench_ofn_reader.py times it against a ROBOT
+conversion.
+
+Public API:
+    OFNSyntaxError                   malformed input (a ValueError)
+    iter_triples(source, prefixes=None, chunk_size=65536) -> iterator of triples
+    parse(source, graph=None) -> rdflib.Graph   (source: OFN text or text file)
+    parse_file(path, graph=None) -> rdflib.Graph
+"""
+import io
+import re
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+
+class OFNSyntaxError(ValueError):
+    """The input is not well-formed OWL 2 Functional-Style Syntax."""
+
+
+# One alternative per token kind; whitespace and # comments are skipped by
+# matching them as their own (discarded) alternative. Strings are unrolled
+# ([^"\\]* (\\. [^"\\]*)*) and an unterminated one runs to the end of the text;
+# a lone ^ or @ also matches, so a token split by a chunk boundary is held back
+# rather than rejected, and the parser reports it if it is really incomplete.
+_TOKEN_RE = re.compile(r"""
+      \s+
+    | \#[^\n]*
+    | [()=]
+    | <[^>\s]*>?
+    | "[^"\\]*(?:\\.[^"\\]*)*(?:\\\Z|"|\Z)
+    | \^\^?
+    | @[A-Za-z0-9-]*
+    | [^\s()<>"=^@\#][^\s()<>"=^]*
+""", re.VERBOSE | re.DOTALL)
+_CLOSED_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_ESCAPE_RE = re.compile(r'\\(["\\])')
+
+_PREDECLARED = {
+    "rdf": str(RDF), "rdfs": str(RDFS), "xsd": str(XSD), "owl": str(OWL),
+}
+
+_CHARACTERISTICS = {
+    "FunctionalObjectProperty": OWL.FunctionalProperty,
+    "InverseFunctionalObjectProperty": OWL.InverseFunctionalProperty,
+    "ReflexiveObjectProperty": OWL.ReflexiveProperty,
+    "IrreflexiveObjectProperty": OWL.IrreflexiveProperty,
+    "SymmetricObjectProperty": OWL.SymmetricProperty,
+    "AsymmetricObjectProperty": OWL.AsymmetricProperty,
+    "TransitiveObjectProperty": OWL.TransitiveProperty,
+    "FunctionalDataProperty": OWL.FunctionalProperty,
+}
+_DECLARATIONS = {
+    "Class": OWL.Class, "Datatype": RDFS.Datatype,
+    "ObjectProperty": OWL.ObjectProperty, "DataProperty": OWL.DatatypeProperty,
+    "AnnotationProperty": OWL.AnnotationProperty, "NamedIndividual": OWL.NamedIndividual,
+}
+# functor -> (restriction predicate, qualified predicate, filler-type predicate)
+_CARDINALITIES = {
+    "ObjectMinCardinality": (OWL.minCardinality, OWL.minQualifiedCardinality, OWL.onClass),
+    "ObjectMaxCardinality": (OWL.maxCardinality, OWL.maxQualifiedCardinality, OWL.onClass),
+    "ObjectExactCardinality": (OWL.cardinality, OWL.qualifiedCardinality, OWL.onClass),
+    "DataMinCardinality": (OWL.minCardinality, OWL.minQualifiedCardinality, OWL.onDataRange),
+    "DataMaxCardinality": (OWL.maxCardinality, OWL.maxQualifiedCardinality, OWL.onDataRange),
+    "DataExactCardinality": (OWL.cardinality, OWL.qualifiedCardinality, OWL.onDataRange),
+}
+_SIMPLE = {  # two-argument axioms that are one triple
+    "SubObjectPropertyOf": RDFS.subPropertyOf, "SubDataPropertyOf": RDFS.subPropertyOf,
+    "SubAnnotationPropertyOf": RDFS.subPropertyOf,
+    "ObjectPropertyDomain": RDFS.domain, "DataPropertyDomain": RDFS.domain,
+    "AnnotationPropertyDomain": RDFS.domain,
+    "ObjectPropertyRange": RDFS.range, "DataPropertyRange": RDFS.range,
+    "AnnotationPropertyRange": RDFS.range,
+    "InverseObjectProperties": OWL.inverseOf, "DatatypeDefinition": OWL.equivalentClass,
+    "SubClassOf": RDFS.subClassOf,
+}
+# n-ary axioms: (pairwise predicate or None, predicate for two members or None,
+# all-members class for more than two)
+_NARY = {
+    "EquivalentClasses": (OWL.equivalentClass, None, None),
+    "EquivalentObjectProperties": (OWL.equivalentProperty, None, None),
+    "EquivalentDataProperties": (OWL.equivalentProperty, None, None),
+    "SameIndividual": (OWL.sameAs, None, None),
+    "DisjointClasses": (None, OWL.disjointWith, OWL.AllDisjointClasses),
+    "DisjointObjectProperties": (None, OWL.propertyDisjointWith, OWL.AllDisjointProperties),
+    "DisjointDataProperties": (None, OWL.propertyDisjointWith, OWL.AllDisjointProperties),
+    "DifferentIndividuals": (None, OWL.differentFrom, OWL.AllDifferent),
+}
+_VALUE_RESTRICTIONS = {
+    "ObjectSomeValuesFrom": OWL.someValuesFrom, "DataSomeValuesFrom": OWL.someValuesFrom,
+    "ObjectAllValuesFrom": OWL.allValuesFrom, "DataAllValuesFrom": OWL.allValuesFrom,
+    "ObjectHasValue": OWL.hasValue, "DataHasValue": OWL.hasValue, "ObjectHasSelf": OWL.hasSelf,
+}
+_TRUE = Literal("true", datatype=XSD.boolean)
+
+
+def _string(tok):
+    if not _CLOSED_RE.fullmatch(tok):
+        raise OFNSyntaxError(f"OFN parse error: unterminated string {tok[:40]!r}")
+    body = tok[1:-1]
+    return _ESCAPE_RE.sub(r"\1", body) if "\\" in body else body
+
+
+def _tokens(fh, chunk_size):
+    """Significant tokens of a text stream, whitespace and comments dropped."""
+    buf = ""
+    while True:
+        chunk = fh.read(chunk_size)
+        buf += chunk
+        eof = not chunk
+        pos, end = 0, len(buf)
+        for m in _TOKEN_RE.finditer(buf):
+            # A token touching the end of the buffer may continue in the next
+            # chunk: hold it back until then.
+            if m.end() == end and not eof:
+                break
+            if m.start() != pos:
+                raise OFNSyntaxError(f"OFN parse error: unexpected {buf[pos:pos + 20]!r}")
+            pos = m.end()
+            tok = m.group()
+            c = tok[0]
+            if not (c.isspace() or c == "#"):
+                yield tok
+        if pos < end and eof:
+            raise OFNSyntaxError(f"OFN parse error: unexpected {buf[pos:pos + 20]!r}")
+        buf = buf[pos:]
+        if eof:
+            return
+
+
+def _elements(tokens, prefixes):
+    """Assemble Ontology(...) members with an explicit stack.
+
+    Yields each member as soon as it is complete: the ontology and version IRIs
+    as URIRefs, everything else as a list [functor, arg, ...]. Arguments are
+    URIRef, BNode (anonymous individuals), Literal, str (cardinalities and the
+    functors of nested lists) or nested lists; a parenthesized group with no
+    functor (HasKey) has functor "".
+    """
+    root, stack = [], []
+    cur = root
+    bnodes = {}
+    datatype_next = False
+    for tok in tokens:
+        c = tok[0]
+        if c == "(":
+            functor = cur.pop() if cur and type(cur[-1]) is str and not cur[-1].isdigit() else ""
+            stack.append(cur)
+            cur = [functor]
+            continue
+        if c == ")":
+            if not stack:
+                raise OFNSyntaxError("OFN parse error: unexpected ')'")
+            done, cur = cur, stack.pop()
+            if not stack:  # a top-level Prefix(...) / Ontology(...) closed
+                if done[0] == "Prefix":
+                    if len(done) != 4 or done[2] != "=":
+                        raise OFNSyntaxError(f"OFN parse error: malformed Prefix{done[1:]}")
+                    prefixes[done[1][:-1]] = str(done[3])
+                elif done[0] != "Ontology":
+                    raise OFNSyntaxError(f"OFN parse error: unexpected {done[0]}(...) at top level")
+                root.clear()
+            elif len(stack) == 1 and stack[0] is root and cur[0] == "Ontology":
+                yield done
+            else:
+                cur.append(done)
+            continue
+        if c == "<":
+            if not tok.endswith(">"):
+                raise OFNSyntaxError(f"OFN parse error: unterminated IRI {tok[:40]!r}")
+            node = URIRef(tok[1:-1])
+        elif c == '"':
+            cur.append(Literal(_string(tok)))
+            continue
+        elif c == "@":
+            if len(tok) == 1 or not cur or not isinstance(cur[-1], Literal):
+                raise OFNSyntaxError(f"OFN parse error: language tag {tok} without a literal")
+            cur[-1] = Literal(str(cur[-1]), lang=tok[1:])
+            continue
+        elif c == "^":
+            if tok != "^^":
+                raise OFNSyntaxError("OFN parse error: stray '^'")
+            datatype_next = True
+            continue
+        elif c == "=":
+            cur.append(tok)
+            continue
+        elif cur and cur[0] == "Prefix" and len(cur) == 1:
+            cur.append(tok)  # the prefix name, e.g. "obo:" or ":"
+            continue
+        elif tok.startswith("_:"):
+            node = bnodes.get(tok)
+            if node is None:
+                node = bnodes[tok] = BNode()
+        elif ":" in tok:
+            prefix, _, local = tok.partition(":")
+            try:
+                node = URIRef(prefixes[prefix] + local)
+            except KeyError:
+                raise OFNSyntaxError(f"OFN parse error: undeclared prefix in {tok}") from None
+        else:
+            cur.append(tok)  # a functor (before "(") or a cardinality
+            continue
+        if datatype_next:
+            datatype_next = False
+            if not cur or not isinstance(cur[-1], Literal):
+                raise OFNSyntaxError("OFN parse error: '^^' without a literal")
+            cur[-1] = Literal(str(cur[-1]), datatype=node)
+            continue
+        if stack and stack[-1] is root and cur[0] == "Ontology":
+            yield node  # ontology IRI / version IRI
+        else:
+            cur.append(node)
+    if stack:
+        raise OFNSyntaxError("OFN parse error: unbalanced '('")
+
+
+class _Translator:
+    """OWL 2 structural elements -> RDF triples (the W3C mapping, Table 1-3)."""
+
+    def __init__(self, emit):
+        self.emit = emit
+
+    # -- helpers -------------------------------------------------------------
+
+    def seq(self, items):
+        head = RDF.nil
+        for item in reversed([self.node(i) for i in items]):
+            cell = BNode()
+            self.emit((cell, RDF.first, item))
+            self.emit((cell, RDF.rest, head))
+            head = cell
+        return head
+
+    def annotate(self, subject, annotations):
+        for ann in annotations:
+            inner, (prop, value) = self.split_annotations(ann[1:])
+            self.emit((subject, prop, value))
+            if inner:
+                self.reify((subject, prop, value), inner, OWL.Annotation)
+
+    def reify(self, triple, annotations, kind=OWL.Axiom):
+        x = BNode()
+        self.emit((x, RDF.type, kind))
+        self.emit((x, OWL.annotatedSource, triple[0]))
+        self.emit((x, OWL.annotatedProperty, triple[1]))
+        self.emit((x, OWL.annotatedTarget, triple[2]))
+        self.annotate(x, annotations)
+
+    @staticmethod
+    def split_annotations(args):
+        """(leading Annotation(...) args, the rest)."""
+        i = 0
+        while i < len(args) and isinstance(args[i], list) and args[i][0] == "Annotation":
+            i += 1
+        return args[:i], args[i:]
+
+    # -- expressions ---------------------------------------------------------
+
+    def node(self, expr):
+        """The RDF node of an entity, literal, or class / property / data-range
+        expression, emitting the triples that describe an anonymous one."""
+        if not isinstance(expr, list):
+            return expr
+        functor, args = expr[0], expr[1:]
+        x = BNode()
+        emit = self.emit
+        if functor == "ObjectInverseOf":
+            emit((x, OWL.inverseOf, self.node(args[0])))
+        elif functor in ("ObjectIntersectionOf", "ObjectUnionOf", "ObjectOneOf",
+                         "DataIntersectionOf", "DataUnionOf", "DataOneOf"):
+            data = functor.startswith("Data")
+            emit((x, RDF.type, RDFS.Datatype if data else OWL.Class))
+            pred = (OWL.intersectionOf if functor.endswith("IntersectionOf") else
+                    OWL.unionOf if functor.endswith("UnionOf") else OWL.oneOf)
+            emit((x, pred, self.seq(args)))
+        elif functor == "ObjectComplementOf":
+            emit((x, RDF.type, OWL.Class))
+            emit((x, OWL.complementOf, self.node(args[0])))
+        elif functor == "DataComplementOf":
+            emit((x, RDF.type, RDFS.Datatype))
+            emit((x, OWL.datatypeComplementOf, self.node(args[0])))
+        elif functor == "DatatypeRestriction":
+            emit((x, RDF.type, RDFS.Datatype))
+            emit((x, OWL.onDatatype, args[0]))
+            facets = []
+            for facet, value in zip(args[1::2], args[2::2]):
+                y = BNode()
+                emit((y, facet, value))
+                facets.append(y)
+            emit((x, OWL.withRestrictions, self.seq(facets)))
+        elif functor in _CARDINALITIES:
+            plain, qualified, on = _CARDINALITIES[functor]
+            emit((x, RDF.type, OWL.Restriction))
+            emit((x, OWL.onProperty, self.node(args[1])))
+            n = Literal(args[0], datatype=XSD.nonNegativeInteger)
+            if len(args) > 2:
+                emit((x, qualified, n))
+                emit((x, on, self.node(args[2])))
+            else:
+                emit((x, plain, n))
+        elif functor in _VALUE_RESTRICTIONS:
+            emit((x, RDF.type, OWL.Restriction))
+            props, filler = args[:-1], args[-1]
+            if functor == "ObjectHasSelf":
+                props, filler = args, _TRUE
+            if len(props) == 1:
+                emit((x, OWL.onProperty, self.node(props[0])))
+            else:
+                emit((x, OWL.onProperties, self.seq(props)))
+            emit((x, _VALUE_RESTRICTIONS[functor], self.node(filler)))
+        else:
+            raise OFNSyntaxError(f"OFN: unsupported expression {functor}(...)")
+        return x
+
+    # -- axioms --------------------------------------------------------------
+
+    def axiom(self, element):
+        functor = element[0]
+        annotations, args = self.split_annotations(element[1:])
+        emit = self.emit
+        main = []  # triples an annotated axiom reifies
+        if functor == "Declaration":
+            entity = args[0]
+            main.append((entity[1], RDF.type, _DECLARATIONS[entity[0]]))
+        elif functor in _SIMPLE:
+            pred = _SIMPLE[functor]
+            if isinstance(args[0], list) and args[0][0] == "ObjectPropertyChain":
+                main.append((self.node(args[1]), OWL.propertyChainAxiom, self.seq(args[0][1:])))
+            else:
+                main.append((self.node(args[0]), pred, self.node(args[1])))
+        elif functor in _CHARACTERISTICS:
+            main.append((self.node(args[0]), RDF.type, _CHARACTERISTICS[functor]))
+        elif functor in _NARY:
+            pairwise, two, members = _NARY[functor]
+            nodes = [self.node(a) for a in args]
+            if pairwise:
+                main.extend((a, pairwise, b) for a, b in zip(nodes, nodes[1:]))
+            elif len(nodes) == 2:
+                main.append((nodes[0], two, nodes[1]))
+            else:
+                x = BNode()
+                emit((x, RDF.type, members))
+                emit((x, OWL.members, self.seq(nodes)))
+                self.annotate(x, annotations)
+                return
+        elif functor == "DisjointUnion":
+            main.append((args[0], OWL.disjointUnionOf, self.seq(args[1:])))
+        elif functor == "HasKey":
+            keys = [p for group in args[1:] for p in group[1:]]
+            main.append((self.node(args[0]), OWL.hasKey, self.seq(keys)))
+        elif functor == "ClassAssertion":
+            main.append((args[1], RDF.type, self.node(args[0])))
+        elif functor in ("ObjectPropertyAssertion", "DataPropertyAssertion"):
+            prop, a, b = args
+            if isinstance(prop, list):  # ObjectInverseOf(P): b P a
+                prop, a, b = prop[1], b, a
+            main.append((a, prop, b))
+        elif functor in ("NegativeObjectPropertyAssertion", "NegativeDataPropertyAssertion"):
+            x = BNode()
+            emit((x, RDF.type, OWL.NegativePropertyAssertion))
+            emit((x, OWL.sourceIndividual, args[1]))
+            emit((x, OWL.assertionProperty, self.node(args[0])))
+            emit((x, OWL.targetIndividual if functor.startswith("NegativeObject")
+                  else OWL.targetValue, args[2]))
+            self.annotate(x, annotations)
+            return
+        elif functor == "AnnotationAssertion":
+            main.append((args[1], args[0], args[2]))
+        else:
+            raise OFNSyntaxError(f"OFN: unsupported axiom {functor}(...)")
+        for triple in main:
+            emit(triple)
+            if annotations:
+                self.reify(triple, annotations)
+
+
+def iter_triples(source, prefixes=None, chunk_size=1 << 16):
+    """Yield the RDF triples of an OFN document, axiom by axiom.
+
+    source is OFN text or a text file object, read chunk_size characters at a
+    time. prefixes, if given, is a dict that receives the document's prefix
+    declarations (with the predeclared ones) as they are read. Raises
+    OFNSyntaxError on malformed input, when reached.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    declared = {} if prefixes is None else prefixes
+    declared.update(_PREDECLARED)
+    out = []
+    translator = _Translator(out.append)
+    ontology = None
+    for element in _elements(_tokens(source, chunk_size), declared):
+        if not isinstance(element, list):  # ontology IRI, then version IRI
+            if ontology is None:
+                ontology = element
+                out.append((ontology, RDF.type, OWL.Ontology))
+            else:
+                out.append((ontology, OWL.versionIRI, element))
+        else:
+            if ontology is None:
+                ontology = BNode()
+                out.append((ontology, RDF.type, OWL.Ontology))
+            try:
+                if element[0] == "Import":
+                    out.append((ontology, OWL.imports, element[1]))
+                elif element[0] == "Annotation":
+                    translator.annotate(ontology, [element])
+                else:
+                    translator.axiom(element)
+            except (IndexError, KeyError, TypeError) as e:
+                raise OFNSyntaxError(f"OFN: malformed {element[0]}(...): {e}") from None
+        yield from out
+        out.clear()
+
+
+def parse(source, graph=None):
+    """Read OFN text or a text file object into graph (a new rdflib.Graph by
+    default), binding the document's prefixes."""
+    import rdflib
+    graph = rdflib.Graph() if graph is None else graph
+    prefixes = {}
+    add = graph.store.add
+    for triple in iter_triples(source, prefixes):
+        add(triple, graph)
+    for prefix, ns in prefixes.items():
+        if prefix not in _PREDECLARED:
+            graph.bind(prefix, ns, override=True, replace=True)
+    return graph
+
+
+def parse_file(path, graph=None):
+    """parse() the OFN file at path."""
+    with open(path, "r", encoding="utf-8-sig") as fh:
+        return parse(fh, graph)
@@ -15,6 +15,7 @@ import rdflib
 from rdflib.namespace import RDFS
 
 from bfo.catalog import BFO_IRI_PREFIX
+from ingest import load_graph
 
 
 def fix_straddle(src_path, class_iri, drop_category_iri):
@@ -35,8 +36,7 @@ def fix_straddle(src_path, class_iri, drop_category_iri):
     if not drop_category_iri or not drop_category_iri.startswith(BFO_IRI_PREFIX):
         raise ValueError("Refusing to drop a non-BFO superclass edge")
 
-    graph = rdflib.Graph()
-    graph.parse(src_path)
+    graph = load_graph(src_path)
 
     triple = (rdflib.URIRef(class_iri), RDFS.subClassOf, rdflib.URIRef(drop_category_iri))
     if triple not in graph:
@@ -89,8 +89,7 @@ def fix_all_straddles(src_path, findings, catalog):
     rule across all findings converges to keeping a single most-specific category
     even when a class straddles three or more disjoint categories.
     """
-    graph = rdflib.Graph()
-    graph.parse(src_path)
+    graph = load_graph(src_path)
 
     removed = 0
     for finding in (findings or []):
@@ -2,7 +2,8 @@
 Ontology Format Detection and Conversion Module
 
 This module automatically detects and converts between different ontology file formats
-including OWL XML, RDF/XML, Turtle, N-Triples, and other RDF serializations.
+including OWL XML, RDF/XML, Turtle, N-Triples, OWL Functional Syntax (read with
+ofn_reader), and other RDF serializations.
 """
 
 import rdflib
@@ -27,6 +28,7 @@ class OntologyFormatConverter:
         'json-ld': 'json-ld',  # JSON-LD (.jsonld)
         'trig': 'trig',        # TriG (.trig)
         'nquads': 'nquads',    # N-Quads (.nq)
+        'ofn': 'ofn',          # OWL Functional Syntax (.ofn), input only
     }
     
     def __init__(self):
@@ -78,6 +80,11 @@ class OntologyFormatConverter:
             if content.strip().startswith('<?xml') or '<rdf:RDF' in content or '<owl:Ontology' in content:
                 return 'xml'
             
+            # OWL Functional Syntax
+            body = '\n'.join(line for line in content.split('\n') if not line.lstrip().startswith('#')).lstrip()
+            if body.startswith('Prefix(') or body.startswith('Ontology('):
+                return 'ofn'
+            
             # Turtle format
             if (content.startswith('@prefix') or content.startswith('@base') or 
                 any(line.strip().startswith('@') for line in content.split('\n')[:10])):
@@ -108,7 +115,11 @@ class OntologyFormatConverter:
             g = rdflib.Graph()
             
             # Parse the input file
-            g.parse(input_path, format=input_format)
+            if input_format == 'ofn':
+                from ofn_reader import parse_file
+                parse_file(input_path, g)
+            else:
+                g.parse(input_path, format=input_format)
             
             # Create output file path
             input_name = Path(input_path).stem
@@ -0,0 +1,498 @@
+"""
+Syntactic locality-based module extraction (⊥, ⊤ and STAR) over an rdflib graph.
+
+Coherence and classification of the user's classes only depend on the axioms
+that can affect entailments over their signature. A syntactic locality module
+(Cuenca Grau, Horrocks, Kazakov and Sattler, "Modular Reuse of Ontologies")
+is such a subset: every axiom outside it is *local* for the module's signature,
+i.e. becomes a tautology once every entity outside that signature is replaced
+by ⊥ (⊥-locality: empty classes and properties) or ⊤ (⊤-locality: universal
+ones). STAR alternates ⊥- and ⊤-extraction to a fixed point, giving the smallest
+of the three. On ontologies that merge in large vocabularies they barely use,
+the module is a small fraction of the file, and the reasoner input shrinks with it.
+
+The locality test is syntactic and conservative: any construct it cannot show to
+be ⊥- or ⊤-equivalent counts as non-local, so an unknown construct only ever makes
+the module larger, never unsound.
+
+Module extraction runs on the user ontology alone. BFO is attached to the
+reasoner input in full afterwards, so the BFO terms the ontology mentions are
+seeded into the module signature (see reasoning_signature). BFO terms it never
+mentions cannot make any of its axioms non-local, so this is the module for
+Σ ∪ sig(BFO), and together with BFO it preserves every entailment of the full
+merge over Σ.
+
+Public API:
+    extract_module(g, signature, method='star') -> ModuleResult
+    reasoning_signature(g) -> set of URIRefs (the user's own terms, the terms
+                              their axioms use, and BFO terms)
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+import rdflib
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+logger = logging.getLogger(__name__)
+
+BFO_IRI_PREFIX = "http://purl.obolibrary.org/obo/BFO_"
+
+BOT = "bot"
+TOP = "top"
+
+_BUILTIN_PREFIXES = (str(RDF), str(RDFS), str(OWL), str(XSD))
+
+_DECLARATION_TYPES = {
+    OWL.Class, OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty,
+    OWL.NamedIndividual, OWL.Ontology, RDFS.Datatype, OWL.Restriction, RDFS.Class,
+    RDF.Property,
+}
+_ENTITY_TYPES = (OWL.Class, OWL.ObjectProperty, OWL.DatatypeProperty, OWL.NamedIndividual)
+
+# Property characteristics: (local in ⊥ mode when the property is outside Σ,
+# local in ⊤ mode when it is outside Σ).
+_CHARACTERISTICS = {
+    OWL.TransitiveProperty: (True, True),
+    OWL.SymmetricProperty: (True, True),
+    OWL.AsymmetricProperty: (True, False),
+    OWL.IrreflexiveProperty: (True, False),
+    OWL.ReflexiveProperty: (False, True),
+    OWL.FunctionalProperty: (True, False),
+    OWL.InverseFunctionalProperty: (True, False),
+}
+
+_CLASS_AXIOMS = {RDFS.subClassOf, OWL.equivalentClass, OWL.disjointWith, OWL.disjointUnionOf,
+                 OWL.hasKey}
+_PROPERTY_AXIOMS = {RDFS.subPropertyOf, OWL.equivalentProperty, OWL.inverseOf,
+                    OWL.propertyDisjointWith, OWL.propertyChainAxiom, RDFS.domain, RDFS.range}
+_INDIVIDUAL_AXIOMS = {OWL.sameAs, OWL.differentFrom}
+# The only OWL-namespace predicates that annotate rather than state an axiom.
+_OWL_ANNOTATIONS = {OWL.versionInfo, OWL.deprecated, OWL.priorVersion,
+                    OWL.backwardCompatibleWith, OWL.incompatibleWith}
+_CARD_MIN = (OWL.minCardinality, OWL.minQualifiedCardinality)
+_CARD_MAX = (OWL.maxCardinality, OWL.maxQualifiedCardinality)
+_CARD_EXACT = (OWL.cardinality, OWL.qualifiedCardinality)
+
+
+def _builtin(term):
+    return isinstance(term, URIRef) and str(term).startswith(_BUILTIN_PREFIXES)
+
+
+def _owl_vocabulary(term):
+    return isinstance(term, URIRef) and str(term).startswith(str(OWL))
+
+
+class _Axiom:
+    """One logical axiom: its kind, the triples it spans and its signature."""
+
+    __slots__ = ("kind", "head", "triples", "signature")
+
+    def __init__(self, kind, head, triples, signature):
+        self.kind = kind
+        self.head = head          # (s, p, o) of the root triple, or the root bnode
+        self.triples = triples
+        self.signature = signature
+
+
+class ModuleResult:
+    """The extracted module and how much it kept."""
+
+    def __init__(self, graph, signature, method, axioms_total, axioms_kept,
+                 triples_in, elapsed):
+        self.graph = graph
+        self.signature = signature
+        self.method = method
+        self.axioms_total = axioms_total
+        self.axioms_kept = axioms_kept
+        self.triples_in = triples_in
+        self.elapsed = elapsed
+
+    @property
+    def shrunk(self):
+        return len(self.graph) < self.triples_in
+
+    def to_dict(self):
+        return {
+            "method": self.method.upper(),
+            "signature_size": len(self.signature),
+            "axioms_total": self.axioms_total,
+            "axioms_in_module": self.axioms_kept,
+            "triples_in": self.triples_in,
+            "triples_out": len(self.graph),
+            "time_s": round(self.elapsed, 3),
+        }
+
+
+class _Index:
+    """Parse-once view of the graph: bnode descriptions and logical axioms."""
+
+    def __init__(self, g):
+        self.g = g
+        self.desc = defaultdict(lambda: defaultdict(list))  # bnode -> p -> [o]
+        referenced = set()
+        for s, p, o in g:
+            if isinstance(s, BNode):
+                self.desc[s][p].append(o)
+            if isinstance(o, BNode):
+                referenced.add(o)
+        self.referenced = referenced
+        self.axioms = []
+        self.annotations = []      # (subject, triples)
+        self.header = []
+        self._split()
+
+    # -- structure -------------------------------------------------------
+
+    def one(self, node, p):
+        values = self.desc[node].get(p) if isinstance(node, BNode) else None
+        return values[0] if values else None
+
+    def items(self, head):
+        out, seen = [], set()
+        while isinstance(head, BNode) and head not in seen:
+            seen.add(head)
+            first = self.one(head, RDF.first)
+            if first is not None:
+                out.append(first)
+            head = self.one(head, RDF.rest)
+        return out
+
+    def _closure(self, nodes):
+        """All triples hanging off the given bnodes (transitively)."""
+        triples, stack, seen = [], [n for n in nodes if isinstance(n, BNode)], set()
+        while stack:
+            b = stack.pop()
+            if b in seen:
+                continue
+            seen.add(b)
+            for p, objs in self.desc[b].items():
+                for o in objs:
+                    triples.append((b, p, o))
+                    if isinstance(o, BNode):
+                        stack.append(o)
+        return triples
+
+    def _split(self):
+        g = self.g
+        ontologies = set(g.subjects(RDF.type, OWL.Ontology))
+        annotation_props = set(g.subjects(RDF.type, OWL.AnnotationProperty))
+        data_props = set(g.subjects(RDF.type, OWL.DatatypeProperty))
+        object_props = set(g.subjects(RDF.type, OWL.ObjectProperty))
+
+        def add(kind, head, root_triples, extra_nodes):
+            triples = list(root_triples) + self._closure(extra_nodes)
+            signature = set()
+            for s, p, o in triples:
+                for term in (s, o):
+                    if isinstance(term, URIRef) and not _builtin(term):
+                        signature.add(term)
+                if kind == "property_assertion" and not _builtin(p):
+                    signature.add(p)
+            self.axioms.append(_Axiom(kind, head, triples, signature))
+
+        for s, p, o in g:
+            if isinstance(s, BNode):
+                continue
+            if s in ontologies:
+                self.header.append((s, p, o))
+                continue
+            if p == RDF.type:
+                if o in _DECLARATION_TYPES:
+                    continue
+                if o in _CHARACTERISTICS:
+                    add("characteristic", (s, p, o), [(s, p, o)], [])
+                else:
+                    add("class_assertion", (s, p, o), [(s, p, o)], [o])
+            elif p in _CLASS_AXIOMS or p in _PROPERTY_AXIOMS:
+                add(str(p), (s, p, o), [(s, p, o)], [o])
+            elif p in _INDIVIDUAL_AXIOMS:
+                add("individual", (s, p, o), [(s, p, o)], [])
+            elif p in annotation_props or p in _OWL_ANNOTATIONS:
+                self.annotations.append((s, [(s, p, o)]))
+            elif _owl_vocabulary(p):
+                # OWL syntax this index does not model (e.g. owl:unionOf on a
+                # named class): kept with everything it references.
+                add("other", (s, p, o), [(s, p, o)], [o])
+            elif _builtin(p) or (isinstance(o, Literal) and p not in data_props):
+                self.annotations.append((s, [(s, p, o)]))
+            elif p in object_props or p in data_props or not _builtin(p):
+                add("property_assertion", (s, p, o), [(s, p, o)], [o])
+
+        # Root bnodes: n-ary axioms and axiom annotations.
+        for b in list(self.desc):
+            if b in self.referenced:
+                continue
+            types = set(self.desc[b].get(RDF.type, ()))
+            triples = self._closure([b])
+            if OWL.Axiom in types or OWL.Annotation in types:
+                source = self.one(b, OWL.annotatedSource)
+                self.annotations.append((source, triples))
+            elif OWL.AllDisjointClasses in types:
+                add("all_disjoint_classes", b, [], [b])
+            else:
+                # AllDifferent, AllDisjointProperties, NegativePropertyAssertion
+                # or an unrecognised construct: always non-local (kept).
+                add("other", b, [], [b])
+
+
+class _Locality:
+    """⊥/⊤-locality of axioms for a signature."""
+
+    def __init__(self, index, signature, mode):
+        self.ix = index
+        self.sig = signature
+        self.mode = mode
+
+    def prop_out(self, p):
+        if isinstance(p, BNode):
+            inv = self.ix.one(p, OWL.inverseOf)
+            return inv is not None and self.prop_out(inv)
+        return isinstance(p, URIRef) and not _builtin(p) and p not in self.sig
+
+    def cls(self, c):
+        """BOT or TOP if c is equivalent to ⊥/⊤ under the substitution, else None."""
+        if c == OWL.Thing:
+            return TOP
+        if c == OWL.Nothing:
+            return BOT
+        if isinstance(c, URIRef):
+            if _builtin(c) or c in self.sig:
+                return None
+            return BOT if self.mode == BOT else TOP
+        if not isinstance(c, BNode):
+            return None
+        ix = self.ix
+        members = ix.one(c, OWL.intersectionOf)
+        if members is not None:
+            vals = [self.cls(m) for m in ix.items(members)]
+            if BOT in vals:
+                return BOT
+            return TOP if vals and all(v == TOP for v in vals) else None
+        members = ix.one(c, OWL.unionOf)
+        if members is not None:
+            vals = [self.cls(m) for m in ix.items(members)]
+            if TOP in vals:
+                return TOP
+            return BOT if all(v == BOT for v in vals) else None
+        inner = ix.one(c, OWL.complementOf)
+        if inner is not None:
+            return {BOT: TOP, TOP: BOT}.get(self.cls(inner))
+        members = ix.one(c, OWL.oneOf)
+        if members is not None:
+            return BOT if not ix.items(members) else None
+        prop = ix.one(c, OWL.onProperty)
+        if prop is None:
+            return None
+        return self._restriction(c, prop)
+
+    def _restriction(self, c, prop):
+        ix = self.ix
+        out = self.prop_out(prop)
+        bot_mode = self.mode == BOT
+
+        filler = ix.one(c, OWL.someValuesFrom)
+        if filler is not None:
+            f = self.cls(filler)
+            if f == BOT or (bot_mode and out):
+                return BOT
+            return TOP if (not bot_mode and out and f == TOP) else None
+        filler = ix.one(c, OWL.allValuesFrom)
+        if filler is not None:
+            f = self.cls(filler)
+            if f == TOP or (bot_mode and out):
+                return TOP
+            return BOT if (not bot_mode and out and f == BOT) else None
+        if ix.one(c, OWL.hasValue) is not None or ix.one(c, OWL.hasSelf) is not None:
+            if out:
+                return BOT if bot_mode else TOP
+            return None
+
+        qualifier = ix.one(c, OWL.onClass) or ix.one(c, OWL.onDataRange)
+        f = self.cls(qualifier) if qualifier is not None else TOP
+        empty = f == BOT or (bot_mode and out)
+        for preds, kind in ((_CARD_MIN, "min"), (_CARD_MAX, "max"), (_CARD_EXACT, "exact")):
+            for p in preds:
+                value = ix.one(c, p)
+                if value is None:
+                    continue
+                try:
+                    n = int(value)
+                except (TypeError, ValueError):
+                    return None
+                if kind == "min":
+                    if n == 0:
+                        return TOP
+                    if empty:
+                        return BOT
+                    return TOP if (not bot_mode and out and f == TOP and n == 1) else None
+                if kind == "max":
+                    return TOP if empty else None
+                if empty:
+                    return TOP if n == 0 else BOT
+                return None
+        return None
+
+    def local(self, ax):
+        s, p, o = ax.head if isinstance(ax.head, tuple) else (ax.head, None, None)
+        bot_mode = self.mode == BOT
+        kind = ax.kind
+        if kind == str(RDFS.subClassOf):
+            return self.cls(s) == BOT or self.cls(o) == TOP
+        if kind == str(OWL.equivalentClass):
+            a, b = self.cls(s), self.cls(o)
+            return a is not None and a == b
+        if kind == str(OWL.disjointWith):
+            return sum(self.cls(x) != BOT for x in (s, o)) <= 1
+        if kind == "all_disjoint_classes":
+            members = self.ix.items(self.ix.one(s, OWL.members))
+            return sum(self.cls(x) != BOT for x in members) <= 1
+        if kind == str(OWL.disjointUnionOf):
+            return all(self.cls(x) == BOT for x in [s] + self.ix.items(o))
+        if kind == str(OWL.hasKey):
+            # A key on an empty class, or over a property that is empty in
+            # ⊥ mode, identifies nothing.
+            if self.cls(s) == BOT:
+                return True
+            return bot_mode and any(self.prop_out(r) for r in self.ix.items(o))
+        if kind == str(RDFS.subPropertyOf):
+            return self.prop_out(s) if bot_mode else self.prop_out(o)
+        if kind in (str(OWL.equivalentProperty), str(OWL.inverseOf)):
+            return self.prop_out(s) and self.prop_out(o)
+        if kind == str(OWL.propertyDisjointWith):
+            return bot_mode and (self.prop_out(s) or self.prop_out(o))
+        if kind == str(OWL.propertyChainAxiom):
+            if bot_mode:
+                return any(self.prop_out(r) for r in self.ix.items(o))
+            return self.prop_out(s)
+        if kind in (str(RDFS.domain), str(RDFS.range)):
+            if self.cls(o) == TOP:
+                return True
+            return bot_mode and self.prop_out(s)
+        if kind == "characteristic":
+            bot_ok, top_ok = _CHARACTERISTICS[o]
+            return self.prop_out(s) and (bot_ok if bot_mode else top_ok)
+        if kind == "class_assertion":
+            return self.cls(o) == TOP
+        if kind == "property_assertion":
+            return not bot_mode and self.prop_out(p)
+        return False
+
+
+def _extract(index, candidates, seed, mode):
+    """One ⊥- or ⊤-module over the candidate axiom ids."""
+    sig = set(seed)
+    loc = _Locality(index, sig, mode)
+    by_entity = defaultdict(list)
+    for i in candidates:
+        for e in index.axioms[i].signature:
+            by_entity[e].append(i)
+    kept = set()
+    queue = list(candidates)
+    while queue:
+        i = queue.pop()
+        if i in kept:
+            continue
+        ax = index.axioms[i]
+        if loc.local(ax):
+            continue
+        kept.add(i)
+        for e in ax.signature - sig:
+            sig.add(e)
+            queue.extend(j for j in by_entity[e] if j not in kept)
+    return kept
+
+
+def extract_module(g, signature, method="star"):
+    """Extract the ⊥-, ⊤- or STAR-module of g for signature.
+
+    Returns a ModuleResult whose graph holds the ontology header, the module's
+    axioms, and the declarations and annotations of every entity in the
+    module's signature.
+    """
+    started = time.perf_counter()
+    index = _Index(g)
+    seed = {URIRef(str(e)) for e in signature}
+    ids = set(range(len(index.axioms)))
+
+    if method == "bot":
+        ids = _extract(index, ids, seed, BOT)
+    elif method == "top":
+        ids = _extract(index, ids, seed, TOP)
+    else:
+        while True:
+            before = len(ids)
+            ids = _extract(index, ids, seed, BOT)
+            ids = _extract(index, ids, seed, TOP)
+            if len(ids) == before:
+                break
+
+    module_sig = set(seed)
+    out = rdflib.Graph()
+    for prefix, ns in g.namespaces():
+        out.bind(prefix, ns, override=False)
+    for t in index.header:
+        out.add(t)
+    for i in ids:
+        ax = index.axioms[i]
+        module_sig |= ax.signature
+        for t in ax.triples:
+            out.add(t)
+    for entity in module_sig:
+        for t in _ENTITY_TYPES:
+            if (entity, RDF.type, t) in g:
+                out.add((entity, RDF.type, t))
+    for subject, triples in index.annotations:
+        if subject in module_sig:
+            for t in triples:
+                out.add(t)
+
+    result = ModuleResult(out, module_sig, method, len(index.axioms), len(ids),
+                          len(g), time.perf_counter() - started)
+    logger.info(f"[STAGE] module ({method}): {result.elapsed:.2f}s "
+                f"({result.axioms_kept}/{result.axioms_total} axioms, "
+                f"{len(g)} -> {len(out)} triples)")
+    return result
+
+
+def _home_prefixes(g):
+    """IRI prefixes of the ontology's own terms, derived from its ontology IRI
+    (covers both `<onto>#Term` and the OBO `<base>/FOO_0000001` styles)."""
+    prefixes = set()
+    for onto in g.subjects(RDF.type, OWL.Ontology):
+        if not isinstance(onto, URIRef):
+            continue
+        iri = str(onto).rstrip("#/")
+        stem = iri[:-4] if iri.endswith(".owl") else iri
+        prefixes.update({stem + "#", stem + "/", iri + "#", iri + "/"})
+        base, _, name = stem.rpartition("/")
+        if base and name:
+            prefixes.add(f"{base}/{name.upper()}_")
+    return tuple(prefixes)
+
+
+def reasoning_signature(g):
+    """The signature to extract a reasoning module for.
+
+    The ontology's own classes, properties and individuals (those under its
+    ontology IRI), or every declared non-BFO entity if none can be told apart;
+    every entity their axioms use, so classes taken from an imported vocabulary
+    stay in Σ with their own entailments; and every BFO term the graph
+    mentions, because BFO is attached in full.
+    """
+    declared = set()
+    for t in _ENTITY_TYPES:
+        declared.update(e for e in g.subjects(RDF.type, t) if isinstance(e, URIRef))
+    bfo = {e for e in declared if str(e).startswith(BFO_IRI_PREFIX)}
+    bfo.update(o for o in g.objects() if isinstance(o, URIRef)
+               and str(o).startswith(BFO_IRI_PREFIX))
+    own = declared - bfo
+    prefixes = _home_prefixes(g)
+    home = {e for e in own if str(e).startswith(prefixes)} if prefixes else set()
+    seed = set(home or own)
+    for ax in _Index(g).axioms:
+        if ax.signature & (home or own):
+            seed |= ax.signature
+    return seed | bfo
@@ -0,0 +1,259 @@
+"""
+OWL 2 profile detection (EL, QL, RL) over an rdflib graph, and reasoner routing.
+
+Which reasoner should run depends far more on which constructs an ontology uses
+than on how many classes it has: ELK classifies an OWL 2 EL ontology of any size
+completely and in polynomial time, the OWL 2 RL schema rules materialize an RL
+hierarchy without a tableau, and only ontologies outside every tractable profile
+actually need Pellet or HermiT. The checker is syntactic and conservative: a
+construct the profile might admit in some positions but that it cannot place is
+counted as a violation, so a profile is only reported when it surely applies.
+
+Class expressions are tracked by position, because QL and RL restrict constructs
+differently on the left (subclass) and right (superclass) of an axiom: an
+expression under rdfs:subClassOf's object is in superclass position, its subject in
+subclass position, an owl:equivalentClass side in both. Positions propagate into
+nested intersections, unions and restriction fillers, and flip under complementOf.
+
+Public API:
+    detect_profiles(g) -> {'profiles': [...], 'violations': {profile: [reason]}}
+    choose_reasoner(profiles, class_count, ...) -> RoutingDecision
+    bfo_profiles(bfo_path) -> tuple of the BFO file's profiles (cached)
+"""
+
+import functools
+
+from rdflib import BNode, Literal
+from rdflib.namespace import OWL, RDF, RDFS
+
+PROFILES = ("EL", "QL", "RL")
+
+SUB = "sub"
+SUPER = "super"
+
+_CARDINALITY = {
+    OWL.cardinality, OWL.minCardinality, OWL.maxCardinality,
+    OWL.qualifiedCardinality, OWL.minQualifiedCardinality, OWL.maxQualifiedCardinality,
+}
+_MAX_CARDINALITY = {OWL.maxCardinality, OWL.maxQualifiedCardinality}
+
+# Property characteristics each profile forbids outright.
+_FORBIDDEN_PROPERTY_TYPES = {
+    "EL": (OWL.FunctionalProperty, OWL.InverseFunctionalProperty, OWL.SymmetricProperty,
+           OWL.AsymmetricProperty, OWL.IrreflexiveProperty),
+    "QL": (OWL.TransitiveProperty, OWL.FunctionalProperty, OWL.InverseFunctionalProperty),
+    "RL": (OWL.ReflexiveProperty,),
+}
+
+# Predicates each profile forbids anywhere in the ontology.
+_FORBIDDEN_PREDICATES = {
+    "EL": (OWL.allValuesFrom, OWL.unionOf, OWL.complementOf, OWL.inverseOf,
+           OWL.disjointUnionOf, OWL.propertyDisjointWith) + tuple(_CARDINALITY),
+    "QL": (OWL.unionOf, OWL.allValuesFrom, OWL.oneOf, OWL.hasValue, OWL.hasSelf,
+           OWL.propertyChainAxiom, OWL.hasKey, OWL.sameAs, OWL.disjointUnionOf)
+          + tuple(_CARDINALITY),
+    "RL": (OWL.hasSelf, OWL.disjointUnionOf, OWL.cardinality, OWL.minCardinality,
+           OWL.qualifiedCardinality, OWL.minQualifiedCardinality),
+}
+
+
+def _local(term):
+    s = str(term)
+    return s.rsplit("#", 1)[-1].rsplit("/", 1)[-1] or s
+
+
+def _list_items(g, head):
+    items = []
+    seen = set()
+    while head is not None and head != RDF.nil and head not in seen:
+        seen.add(head)
+        first = g.value(head, RDF.first)
+        if first is not None:
+            items.append(first)
+        head = g.value(head, RDF.rest)
+    return items
+
+
+def expression_positions(g):
+    """Map every anonymous class expression to the set of positions ({SUB, SUPER})
+    it occurs in, following nesting from the axioms that use it."""
+    positions = {}
+    stack = []
+
+    def mark(node, pos):
+        if isinstance(node, BNode) and pos not in positions.setdefault(node, set()):
+            positions[node].add(pos)
+            stack.append((node, pos))
+
+    for s, o in g.subject_objects(RDFS.subClassOf):
+        mark(s, SUB)
+        mark(o, SUPER)
+    for s, o in g.subject_objects(OWL.equivalentClass):
+        for node in (s, o):
+            mark(node, SUB)
+            mark(node, SUPER)
+
+    while stack:
+        node, pos = stack.pop()
+        for p in (OWL.intersectionOf, OWL.unionOf):
+            for lst in g.objects(node, p):
+                for member in _list_items(g, lst):
+                    mark(member, pos)
+        for filler_p in (OWL.someValuesFrom, OWL.allValuesFrom, OWL.onClass):
+            for filler in g.objects(node, filler_p):
+                mark(filler, pos)
+        for inner in g.objects(node, OWL.complementOf):
+            mark(inner, SUPER if pos == SUB else SUB)
+    return positions
+
+
+def detect_profiles(g):
+    """Report which of OWL 2 EL, QL and RL the graph falls in.
+
+    Returns {'profiles': [names in PROFILES order], 'violations': {name: [reason,
+    ...]}} where each violation list holds up to five human-readable reasons.
+    """
+    violations = {name: [] for name in PROFILES}
+
+    def violate(name, reason):
+        if len(violations[name]) < 5 and reason not in violations[name]:
+            violations[name].append(reason)
+
+    for name, predicates in _FORBIDDEN_PREDICATES.items():
+        for p in predicates:
+            if next(iter(g.triples((None, p, None))), None) is not None:
+                violate(name, f"uses owl:{_local(p)}")
+    for name, types in _FORBIDDEN_PROPERTY_TYPES.items():
+        for t in types:
+            if next(iter(g.subjects(RDF.type, t)), None) is not None:
+                violate(name, f"declares an owl:{_local(t)}")
+
+    # EL allows a nominal only as a singleton {a}.
+    for lst in g.objects(None, OWL.oneOf):
+        if len(_list_items(g, lst)) > 1:
+            violate("EL", "uses owl:oneOf with more than one individual")
+            break
+
+    for node, where in expression_positions(g).items():
+        in_sub, in_super = SUB in where, SUPER in where
+        if in_super and g.value(node, OWL.someValuesFrom) is not None:
+            violate("RL", "owl:someValuesFrom in superclass position")
+        if in_sub:
+            filler = g.value(node, OWL.someValuesFrom)
+            if filler is not None and filler != OWL.Thing:
+                violate("QL", "qualified owl:someValuesFrom in subclass position")
+            if g.value(node, OWL.intersectionOf) is not None:
+                violate("QL", "owl:intersectionOf in subclass position")
+            if g.value(node, OWL.complementOf) is not None:
+                violate("QL", "owl:complementOf in subclass position")
+                violate("RL", "owl:complementOf in subclass position")
+            if g.value(node, OWL.allValuesFrom) is not None:
+                violate("RL", "owl:allValuesFrom in subclass position")
+        if in_super:
+            if g.value(node, OWL.unionOf) is not None:
+                violate("RL", "owl:unionOf in superclass position")
+            if g.value(node, OWL.oneOf) is not None:
+                violate("RL", "owl:oneOf in superclass position")
+        for p in _MAX_CARDINALITY:
+            value = g.value(node, p)
+            if value is None:
+                continue
+            if in_sub:
+                violate("RL", "owl:maxCardinality in subclass position")
+            if isinstance(value, Literal) and str(value) not in ("0", "1"):
+                violate("RL", "owl:maxCardinality greater than 1")
+
+    return {
+        "profiles": [name for name in PROFILES if not violations[name]],
+        "violations": {name: reasons for name, reasons in violations.items() if reasons},
+    }
+
+
+class RoutingDecision:
+    """Which reasoner to run and why.
+
+    route is 'pellet' (in-process), 'robot' (external, see reasoner), 'rl'
+    (OWL 2 RL schema rules in rl_reasoner) or 'skip'. complete says whether the
+    chosen engine is complete for the ontology's constructs; the RL rules never
+    are (no ABox rules, and BFO is merged in, which is outside every profile).
+    """
+
+    def __init__(self, route, reasoner=None, reason="", complete=True, cost=0):
+        self.route = route
+        self.reasoner = reasoner
+        self.reason = reason
+        self.complete = complete
+        self.cost = cost
+
+    def to_dict(self):
+        return {
+            "route": self.route,
+            "reasoner": self.reasoner,
+            "reason": self.reason,
+            "complete": self.complete,
+            "estimated_cost": self.cost,
+        }
+
+
+def choose_reasoner(profiles, class_count, max_classes=500, external="robot",
+                    robot_ok=True, dl_cost_factor=2, hermit_max_classes=None,
+                    merged_profiles=None):
+    """Pick a reasoner from the ontology's OWL 2 profiles and a size estimate.
+
+    The size estimate is the class count, weighted by dl_cost_factor when the
+    ontology is in no tractable profile (tableau cost grows much faster there).
+    merged_profiles are the profiles of anything merged into the external
+    reasoner's input (BFO; see bfo_profiles), None when nothing is.
+
+    - Within the in-process budget (cost <= max_classes): Pellet.
+    - EL beyond the budget: ROBOT+ELK, polynomial. Complete only when the
+      merged input is EL too.
+    - Full DL or RL beyond the budget: ROBOT+HermiT up to hermit_max_classes
+      (default 4 * max_classes). Past that, full DL goes to ROBOT+ELK, which is
+      incomplete there.
+    - RL without ROBOT, or past hermit_max_classes: the OWL 2 RL schema rules,
+      incomplete (they can refute consistency, not confirm it).
+    - QL-only beyond the budget: ROBOT+ELK, incomplete.
+    """
+    profiles = set(profiles)
+    tractable = bool(profiles)
+    cost = class_count if tractable else class_count * dl_cost_factor
+    use_robot = external == "robot" and robot_ok
+    if hermit_max_classes is None:
+        hermit_max_classes = 4 * max_classes
+
+    if cost <= max_classes:
+        return RoutingDecision("pellet", None,
+                               f"estimated cost {cost} within the in-process budget ({max_classes})",
+                               True, cost)
+    if "EL" in profiles and use_robot:
+        if merged_profiles is None or "EL" in merged_profiles:
+            return RoutingDecision("robot", "ELK", "OWL 2 EL: ELK is complete and polynomial",
+                                   True, cost)
+        return RoutingDecision("robot", "ELK",
+                               "OWL 2 EL: ELK is polynomial, but ignores the merged BFO "
+                               "axioms outside EL", False, cost)
+    if use_robot and (not tractable or "RL" in profiles) and class_count <= hermit_max_classes:
+        return RoutingDecision("robot", "HermiT",
+                               "complete hypertableau in a killable subprocess",
+                               True, cost)
+    if "RL" in profiles:
+        return RoutingDecision("rl", None,
+                               "OWL 2 RL: rule-based materialization (classification only; "
+                               "consistency is checked for ABox clashes, not proven)",
+                               False, cost)
+    if use_robot:
+        return RoutingDecision("robot", "ELK",
+                               "too large for a complete reasoner: ELK ignores non-EL axioms",
+                               False, cost)
+    return RoutingDecision("skip", None,
+                           f"estimated cost {cost} exceeds the in-process budget ({max_classes}) "
+                           f"and EXTERNAL_REASONER is \"{external}\"", False, cost)
+
+
+@functools.lru_cache(maxsize=4)
+def bfo_profiles(bfo_path):
+    """OWL 2 profiles of the BFO file merged into the external reasoner's input,
+    computed once per process per path."""
+    from rl_reasoner import load_bfo_graph
+    return tuple(detect_profiles(load_bfo_graph(bfo_path))["profiles"])
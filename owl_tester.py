@@ -33,6 +33,39 @@ except LookupError:
 
 # Built-in BFO-2020 definitions used as a fallback if the vendored OWL cannot load.
 from bfo_2020_definitions import BFO_2020_CLASSES, BFO_2020_RELATIONS
+from fol_parse_cache import ParseCache
+
+
+class LazyOntology:
+    """
+    A deferred owlready2 ontology: the file is loaded into a fresh World (with
+    BFO attached) only on the first call to load().
+
+    The rdflib analysis path needs owlready2 solely for in-process Pellet, so
+    ontologies routed to ROBOT, or not reasoned at all, never pay for a second
+    full parse and the memory of a populated World.
+    """
+
+    def __init__(self, tester, path):
+        self.tester = tester
+        self.path = path
+        self._result = None
+
+    @property
+    def loaded(self):
+        """True once load() has run (successfully or not)."""
+        return self._result is not None
+
+    def load(self, graph=None):
+        """Load (once) and return the load_ontology_from_file result dict.
+
+        `graph` is the rdflib graph the caller already parsed; it is reused by the
+        re-serialize fallback when owlready2 cannot read the file directly.
+        """
+        if self._result is None:
+            self._result = self.tester.load_ontology_from_file(self.path, graph=graph)
+        return self._result
+
 
 class OwlTester:
     """
@@ -46,6 +79,9 @@ class OwlTester:
         self.bfo_classes = {}
         self.bfo_relations = {}
         self.read_parser = LogicParser()
+        # Parsed expressions with their terms and free variables, LRU-bounded
+        # (FOL_PARSE_CACHE_SIZE); see fol_parse_cache.py.
+        self.parse_cache = ParseCache(self.read_parser.parse, self._scan_terms)
         self.fol_premises = []  # Initialize to empty list for auto-generated premises
         
         # Load BFO classes and relations
@@ -85,6 +121,13 @@ class OwlTester:
                 f"Loaded {len(self.bfo_classes)} BFO-2020 classes and "
                 f"{len(self.bfo_relations)} relations from built-in definitions"
             )
+        self.build_term_index()
+
+    def build_term_index(self):
+        """(Re)build the fuzzy term index over the current bfo_classes and
+        bfo_relations; call again after changing either vocabulary."""
+        from bfo.term_index import TermIndex
+        self.term_index = TermIndex.from_vocab(self.bfo_classes, self.bfo_relations)
     
     def test_expression(self, expr_string):
         """
@@ -109,12 +152,14 @@ class OwlTester:
                 results['issues'].append('Empty expression provided')
                 return results
             
-            # Try to parse the expression
-            expr = self.read_parser.parse(expr_string)
+            # Parse the expression (once per distinct expression: the parse,
+            # its terms and its free variables come from the LRU parse cache)
+            parsed = self.parse_cache.get(expr_string)
+            parsed.raise_error()
             results['parsed'] = True
             
             # Extract terms from the expression
-            terms = self.extract_terms(expr_string)
+            terms = list(parsed.terms)
             
             # Check if terms are recognized BFO classes or relations
             bfo_classes_used = []
@@ -123,8 +168,6 @@ class OwlTester:
             
             for term in terms:
                 term_lower = term.lower()
-                partial_matches = []
-                
                 # Check for exact match in BFO classes
                 if term_lower in self.bfo_classes:
                     # Store only the label to prevent [object Object] display
@@ -136,31 +179,14 @@ class OwlTester:
                     relation_obj = self.bfo_relations[term_lower]
                     bfo_relations_used.append(relation_obj['label'] if isinstance(relation_obj, dict) else str(relation_obj))
                 else:
-                    # Check for partial matches
-                    for bfo_class in self.bfo_classes:
-                        if term_lower in bfo_class or bfo_class in term_lower:
-                            partial_matches.append({
-                                'term': term,
-                                'match': self.bfo_classes[bfo_class]['label'],
-                                'type': 'class',
-                                'partial': True
-                            })
-                    
-                    for bfo_relation in self.bfo_relations:
-                        if term_lower in bfo_relation or bfo_relation in term_lower:
-                            partial_matches.append({
-                                'term': term,
-                                'match': self.bfo_relations[bfo_relation]['label'],
-                                'type': 'relation',
-                                'partial': True
-                            })
-                    
-                    if partial_matches:
+                    # Partial match through the precomputed term index: the
+                    # best-scoring BFO class or relation, without scanning keys.
+                    match = next(iter(self.term_index.partial_matches(term_lower, limit=1)), None)
+                    if match is not None:
                         # Partial match is informational, not a problem.
-                        match = partial_matches[0]
                         results.setdefault('notes', []).append(
-                            f"'{term}' was interpreted as BFO {match['type']} "
-                            f"'{match['match']}' (partial match)."
+                            f"'{term}' was interpreted as BFO {match.kind} "
+                            f"'{match.label}' (partial match)."
                         )
                     else:
                         # Using a term outside BFO is allowed: the expression can
@@ -180,7 +206,7 @@ class OwlTester:
 
             # Detect any free variables in the expression. Unbound variables mean
             # the formula is not closed, which is a genuine problem (an issue).
-            free_vars = self.detect_free_variables(expr_string)
+            free_vars = list(parsed.free_variables)
             if free_vars:
                 results['free_variables'] = free_vars
                 results['issues'].append(f"Found free variables not bound by quantifiers: {', '.join(free_vars)}")
@@ -295,21 +321,20 @@ class OwlTester:
         # multi-character lowercase identifiers like "force" as constants rather
         # than variables. The previous regex only recognized "forall"/"exists",
         # so converted input (which uses "all x.") had its bound variables, and
-        # even class-name constants, wrongly reported as free.
-        try:
-            expr = self.read_parser.parse(expr_string)
-        except Exception:
-            return []
-        try:
-            return sorted(str(v) for v in expr.free())
-        except Exception:
-            return []
+        # even class-name constants, wrongly reported as free. An expression that
+        # does not parse has none. Served from the parse cache.
+        return list(self.parse_cache.get(expr_string).free_variables)
         
     def extract_terms(self, expr_string):
         """
         Extract all terms from the expression string.
         Handles both traditional notation (Class(x)) and BFO-style (instance_of(x,Class,t)) formats.
+        Served from the parse cache; _scan_terms does the extraction.
         """
+        return list(self.parse_cache.get(expr_string).terms)
+
+    def _scan_terms(self, expr_string):
+        """Regex term extraction behind extract_terms (uncached)."""
         # Initialize variables to store extracted terms
         extracted_terms = []
         
@@ -380,25 +405,56 @@ class OwlTester:
         except Exception as e:
             logger.warning(f"Could not attach BFO import: {e}")
 
-    def load_ontology_from_file(self, ontology_path):
+    @staticmethod
+    def _new_world():
+        """A fresh, isolated owlready2 World, preloaded with BFO when possible.
+
+        The World is an in-memory copy of the prebuilt BFO quadstore
+        (bfo.quadstore), so _attach_bfo_import finds BFO already present instead
+        of parsing bfo-2020.owl again. Falls back to an empty World on any error.
+        """
+        try:
+            from bfo.quadstore import new_bfo_world
+            world, _ = new_bfo_world()
+            return world
+        except Exception as e:
+            logger.warning(f"BFO quadstore unavailable, using an empty world: {e}")
+            return owlready2.World()
+
+    def lazy_ontology(self, ontology_path):
+        """
+        Return a deferred owlready2 handle for an ontology file.
+
+        Nothing is parsed until the in-process reasoner actually needs the
+        owlready2 World (see LazyOntology). Pass the handle to analyze_ontology
+        in place of a loaded ontology.
+        """
+        return LazyOntology(self, ontology_path)
+
+    def load_ontology_from_file(self, ontology_path, graph=None):
         """
         Load an ontology from a file.
-        
+
         Args:
             ontology_path (str): Path to the ontology file
-            
+            graph: Optional rdflib.Graph already parsed from ontology_path. When
+                   owlready2 cannot read the file directly, the rdflib fallback
+                   re-serializes this graph instead of parsing the file again.
+
         Returns:
             dict: Information about the loaded ontology
         """
-        # First try direct loading with owlready2
+        # First try loading with owlready2 (from the upload's snapshot when
+        # one is current, so the stored RDF/XML is not parsed again)
         t_load = time.perf_counter()
         try:
             # Load into a dedicated world so each analysis is isolated. Without
             # this, owlready2's default world accumulates classes across uploads
             # and inconsistent_classes() would report stale unsatisfiable classes
-            # from prior requests.
-            world = owlready2.World()
-            onto = world.get_ontology(ontology_path).load()
+            # from prior requests. The world starts with BFO already loaded.
+            from ingest import load_owlready
+            world = self._new_world()
+            onto = load_owlready(ontology_path, world)
             logger.info(f"[STAGE] load_ontology (owlready2): {time.perf_counter()-t_load:.2f}s")
 
             # Attach BFO as an import so the reasoner sees BFO's disjointness and
@@ -422,10 +478,13 @@ class OwlTester:
                 import rdflib
                 import tempfile
                 
-                # Load with rdflib first
+                # Load with rdflib first, unless the caller already parsed it
                 t_rdf = time.perf_counter()
-                g = rdflib.Graph()
-                g.parse(ontology_path)
+                if graph is not None:
+                    g = graph
+                else:
+                    from ingest import load_graph
+                    g = load_graph(ontology_path)
                 logger.info(f"[STAGE] load_ontology (rdflib parse): {time.perf_counter()-t_rdf:.2f}s ({len(g)} triples)")
 
                 if len(g) > 0:
@@ -440,7 +499,7 @@ class OwlTester:
                     try:
                         # Try to load the re-serialized file with owlready2
                         t_reload = time.perf_counter()
-                        world = owlready2.World()
+                        world = self._new_world()
                         onto = world.get_ontology(temp_path).load()
                         logger.info(f"[STAGE] load_ontology (owlready2 reparse): {time.perf_counter()-t_reload:.2f}s")
 
@@ -489,6 +548,9 @@ class OwlTester:
         if file_path:
             return self._analyze_with_rdflib(onto, file_path)
 
+        if isinstance(onto, LazyOntology):
+            onto = onto.load().get('ontology')
+
         t_total = time.perf_counter()
         logger.info("[STAGE] analyze_ontology: entered (owlready2 path)")
         try:
@@ -835,9 +897,10 @@ class OwlTester:
         import rdflib
         from rdflib.namespace import RDF, RDFS, OWL
 
+        # The ingestion snapshot when the upload has one, else a full parse.
+        from ingest import load_graph
         t = time.perf_counter()
-        g = rdflib.Graph()
-        g.parse(file_path)
+        g = load_graph(file_path)
         logger.info(f"[STAGE] rdflib.parse: {time.perf_counter()-t:.2f}s ({len(g)} triples)")
 
         # Ontology IRI/name from owl:Ontology subject (if declared)
@@ -951,6 +1014,31 @@ class OwlTester:
             expressivity += "O"
         return expressivity
 
+    def _determine_profiles_rdflib(self, g):
+        """OWL 2 EL/QL/RL profile membership from an RDFlib graph, for routing
+        the reasoner (see owl_profiles). Degrades to "no profile" on error."""
+        try:
+            from owl_profiles import detect_profiles
+            return detect_profiles(g)
+        except Exception as e:
+            logger.warning(f"OWL 2 profile detection failed: {e}")
+            return {'profiles': [], 'violations': {}}
+
+    def _reasoning_module(self, g):
+        """STAR locality module of g for the ontology's own terms, the terms
+        their axioms use and the BFO terms it mentions (see owl_modules), or None when MODULE_EXTRACTION=none or
+        extraction fails. Reasoning over the module instead of the whole graph
+        gives the same classification and unsatisfiable classes for those terms."""
+        method = os.environ.get('MODULE_EXTRACTION', 'star').lower()
+        if method in ('none', 'off', '0', ''):
+            return None
+        try:
+            from owl_modules import extract_module, reasoning_signature
+            return extract_module(g, reasoning_signature(g), method=method)
+        except Exception as e:
+            logger.warning(f"[STAGE] module extraction failed, reasoning over the full graph: {e}")
+            return None
+
     def _try_reasoner_with_budget(self, onto, budget_seconds=60):
         """
         Run owlready2 / Pellet with a SIGALRM-based timeout.
@@ -981,15 +1069,16 @@ class OwlTester:
         old_handler = signal.signal(signal.SIGALRM, _handler)
         signal.alarm(int(budget_seconds))
 
-        # Capture pre-reasoning hierarchy so we can diff for inferences afterwards
-        pre = {}
+        # Capture the pre-reasoning hierarchy straight from the quadstore so we
+        # can diff for inferences afterwards without materializing classes.
         try:
-            for cls in onto.classes():
-                if hasattr(cls, 'name') and hasattr(cls, 'is_a'):
-                    pre[cls.name] = [p.name for p in cls.is_a if hasattr(p, 'name')]
+            pre = self._subclass_pairs(onto)
         except _ReasonerTimeout:
             signal.alarm(0); signal.signal(signal.SIGALRM, old_handler)
             return True, {'reasoner_skipped': 'class enumeration exceeded budget'}, [], [], 'enumeration_timeout', []
+        except Exception as e:
+            logger.warning(f"Could not snapshot asserted hierarchy: {e}")
+            pre = None
 
         t = time.perf_counter()
         try:
@@ -1033,18 +1122,24 @@ class OwlTester:
             logger.warning(f"[STAGE] reasoner: FAILED, not an inconsistency ({e})")
             return True, {'reasoner_skipped': f'reasoner error: {e}'}, [], [], 'reasoner_error', []
 
-        # Diff pre/post for new SubClassOf inferences
+        # Diff pre/post for new SubClassOf inferences. Pellet's results are
+        # written into the ontology's graph as rdfs:subClassOf rows, so this is
+        # a set difference of integer (child, parent) pairs.
         derivation_steps = []
         inferred_axioms = []
         try:
-            for cls in onto.classes():
-                if not (hasattr(cls, 'name') and hasattr(cls, 'is_a')):
-                    continue
-                post = [p.name for p in cls.is_a if hasattr(p, 'name')]
-                for new_parent in [p for p in post if p not in pre.get(cls.name, [])]:
+            if pre is not None:
+                world = getattr(onto, 'world', None) or owlready2.default_world
+                new_pairs = self._subclass_pairs(onto) - pre
+                names = {}
+                for storid in {x for pair in new_pairs for x in pair}:
+                    iri = world._unabbreviate(storid)
+                    names[storid] = iri.rsplit('#', 1)[-1].rsplit('/', 1)[-1]
+                for child, parent in sorted(new_pairs, key=lambda p: (names[p[0]], names[p[1]])):
+                    description = f"{names[child]} ⊑ {names[parent]}"
                     step = {
                         'axiom_type': 'SubClassOf',
-                        'description': f"{cls.name} ⊑ {new_parent}",
+                        'description': description,
                         'reason': 'Inferred by reasoner',
                         'supporting_facts': ['Tableau reasoning over class restrictions'],
                         'confidence': 'High',
@@ -1053,7 +1148,7 @@ class OwlTester:
                     derivation_steps.append(step)
                     inferred_axioms.append({
                         'type': 'SubClassOf',
-                        'description': f"{cls.name} ⊑ {new_parent}",
+                        'description': description,
                         'derivation': step,
                     })
         except Exception as e:
@@ -1066,6 +1161,35 @@ class OwlTester:
         return True, {'performance': {'reasoning_time_s': time.perf_counter() - t}}, \
             derivation_steps, inferred_axioms, None, unsatisfiable
 
+    @staticmethod
+    def _subclass_pairs(onto):
+        """Named (child, parent) rdfs:subClassOf storid pairs for the classes
+        declared in onto, read from the world's quadstore in one query."""
+        world = getattr(onto, 'world', None) or owlready2.default_world
+        c = onto.graph.c
+        rows = world.graph.execute(
+            "SELECT s, o FROM objs WHERE c=? AND p=? AND s>0 AND o>0 AND s IN "
+            "(SELECT s FROM objs WHERE c=? AND p=? AND o=?)",
+            (c, owlready2.rdfs_subclassof, c, owlready2.rdf_type, owlready2.owl_class))
+        return set(rows)
+
+    @staticmethod
+    def _materialize_ontology(onto, graph=None):
+        """Resolve a LazyOntology into an owlready2 ontology for the reasoner.
+
+        Returns (ontology, error). An already-loaded ontology passes through
+        unchanged; a lazy handle is loaded now, reusing `graph` for the rdflib
+        fallback. On load failure the ontology is None and error says why.
+        """
+        if not isinstance(onto, LazyOntology):
+            return onto, None
+        t = time.perf_counter()
+        result = onto.load(graph=graph)
+        logger.info(f"[STAGE] load_ontology (deferred): {time.perf_counter()-t:.2f}s")
+        if not result.get('loaded') or result.get('ontology') is None:
+            return None, result.get('error', 'Unknown error')
+        return result['ontology'], None
+
     @staticmethod
     def _collect_unsatisfiable(onto):
         """Map the reasoner's inconsistent (unsatisfiable) named classes to
@@ -1094,6 +1218,9 @@ class OwlTester:
         Fast structural analysis via RDFlib. Reasoning (owlready2/Pellet) is
         attempted with a strict time budget; if it exceeds the budget the
         analysis still returns with a clear note in `reasoning_methodology`.
+
+        `onto` may be a loaded owlready2 ontology or a LazyOntology; a lazy
+        handle is only loaded if the in-process Pellet path is chosen.
         """
         t_total = time.perf_counter()
         logger.info(f"[STAGE] analyze_ontology: entered (rdflib path) file={file_path}")
@@ -1114,13 +1241,23 @@ class OwlTester:
 
         t = time.perf_counter()
         expressivity = self._determine_expressivity_rdflib(rdf['graph'])
-        logger.info(f"[STAGE] expressivity: {time.perf_counter()-t:.2f}s ({expressivity})")
-
-        # Reasoning strategy:
-        # - Below MAX_CLASSES_FOR_REASONING classes: try in-process owlready2/Pellet
-        #   (rich derivation info, works well for small/medium ontologies)
-        # - Above that: invoke an external reasoner (ROBOT+ELK) which is robust
-        #   against the owlready2 class-enumeration hang.
+        profile_report = self._determine_profiles_rdflib(rdf['graph'])
+        profiles = profile_report['profiles']
+        logger.info(f"[STAGE] expressivity: {time.perf_counter()-t:.2f}s ({expressivity}, "
+                    f"OWL 2 profiles: {', '.join(profiles) or 'none'})")
+
+        # Reasoning strategy, by OWL 2 profile and a size estimate (see
+        # owl_profiles.choose_reasoner):
+        # - Within the in-process budget (MAX_CLASSES_FOR_REASONING, with full-DL
+        #   ontologies weighted by REASONER_DL_COST_FACTOR): owlready2/Pellet
+        #   (rich derivation info).
+        # - EL beyond the budget: external ROBOT+ELK, polynomial; complete only
+        #   if the merged BFO is EL as well (BFO 2020 is not).
+        # - Full DL or RL beyond the budget: ROBOT+HermiT, then ROBOT+ELK
+        #   (incomplete) once too large for HermiT.
+        # - RL without ROBOT, or too large for HermiT: the OWL 2 RL schema rules
+        #   (rl_reasoner), no JVM. They can refute consistency but not confirm
+        #   it, so a clean run reports consistency as unknown.
         # - If the external reasoner is disabled or unavailable, fall back to a
         #   clean "skipped" with a message.
         max_classes_for_reasoning = int(os.environ.get('MAX_CLASSES_FOR_REASONING', '500'))
@@ -1128,41 +1265,133 @@ class OwlTester:
         external_timeout = int(os.environ.get('EXTERNAL_REASONER_TIMEOUT', '300'))
         class_count = len(rdf['class_names'])
 
-        # Unsatisfiable classes are computed on both paths now: the in-process
-        # Pellet path via inconsistent_classes(), and the external ROBOT/ELK path
-        # by parsing the reasoner's unsatisfiable-class report (with BFO merged in).
-        unsatisfiable_classes = []
+        try:
+            from bfo.catalog import DEFAULT_OWL_PATH
+            bfo_path = os.environ.get('BFO_PATH') or DEFAULT_OWL_PATH
+        except Exception:
+            bfo_path = None
 
-        if class_count <= max_classes_for_reasoning:
+        from external_reasoner import robot_available
+        from owl_profiles import bfo_profiles, choose_reasoner
+        try:
+            merged_profiles = bfo_profiles(bfo_path) if bfo_path else None
+        except Exception as e:
+            logger.warning(f"BFO profile detection failed: {e}")
+            merged_profiles = ()
+        routing = choose_reasoner(
+            profiles, class_count,
+            max_classes=max_classes_for_reasoning,
+            external=external_reasoner,
+            robot_ok=external_reasoner == 'robot' and robot_available(),
+            dl_cost_factor=float(os.environ.get('REASONER_DL_COST_FACTOR', '2')),
+            merged_profiles=merged_profiles,
+        )
+        logger.info(f"[STAGE] reasoner routing: {routing.route}"
+                    f"{'+' + routing.reasoner if routing.reasoner else ''} ({routing.reason})")
+
+        # Unsatisfiable classes are computed on every path: the in-process
+        # Pellet path via inconsistent_classes(), the external ROBOT path by
+        # parsing the reasoner's unsatisfiable-class report (with BFO merged in),
+        # and the RL rules from asserted disjointness.
+        unsatisfiable_classes = []
+        consistency_issues = []
+        # The uncapped inference list, for the indexed axiom table (the JSON
+        # column keeps only the first MAX_INFERRED_AXIOMS).
+        inferred_axioms_all = None
+
+        # Reason over the locality module of the ontology's own signature: the
+        # axioms outside it cannot change any entailment over those terms.
+        module = self._reasoning_module(rdf['graph']) if routing.route != 'skip' else None
+        reasoner_graph = module.graph if module is not None and module.shrunk else rdf['graph']
+        module_path = None
+
+        # Portfolio mode (REASONER_PORTFOLIO=pellet,hermit,elk): on the complete
+        # reasoning routes, race several engines under one budget and keep the
+        # first definitive verdict (see reasoner_portfolio).
+        portfolio = [e.strip() for e in os.environ.get('REASONER_PORTFOLIO', '').lower().split(',')
+                     if e.strip()]
+        use_portfolio = bool(portfolio) and routing.route in ('pellet', 'robot')
+
+        if routing.route == 'pellet' and not use_portfolio:
             budget = int(os.environ.get('REASONER_BUDGET_SECONDS', '60'))
-            logger.info(f"[STAGE] reasoner: in-process Pellet with {budget}s budget...")
-            consistent, methodology_extras, derivation_steps, inferred_axioms, skipped_reason, \
-                unsatisfiable_classes = \
-                self._try_reasoner_with_budget(onto, budget_seconds=budget)
-        elif external_reasoner == 'robot':
-            logger.info(f"[STAGE] reasoner: external ROBOT (class_count={class_count} > "
-                        f"{max_classes_for_reasoning}), timeout={external_timeout}s")
-            from external_reasoner import run_robot_reason
+            if reasoner_graph is not rdf['graph'] and isinstance(onto, LazyOntology) and not onto.loaded:
+                import tempfile
+                fd, module_path = tempfile.mkstemp(suffix='.owl')
+                os.close(fd)
+                reasoner_graph.serialize(destination=module_path, format='xml')
+                onto = self.lazy_ontology(module_path)
+            else:
+                # An already-loaded World reasons over the full ontology.
+                reasoner_graph = rdf['graph']
             try:
-                from bfo.catalog import DEFAULT_OWL_PATH
-                bfo_path = os.environ.get('BFO_PATH') or DEFAULT_OWL_PATH
-            except Exception:
-                bfo_path = None
-            ext = run_robot_reason(
-                file_path,
-                timeout_seconds=external_timeout,
-                normalized_graph=rdf['graph'],
-                bfo_path=bfo_path,
-            )
+                onto, load_error = self._materialize_ontology(onto, reasoner_graph)
+            finally:
+                if module_path:
+                    os.unlink(module_path)
+            if onto is None:
+                logger.warning(f"[STAGE] reasoner: SKIPPED, owlready2 load failed ({load_error})")
+                consistent = True  # unknown — don't claim inconsistent
+                derivation_steps = []
+                inferred_axioms = []
+                methodology_extras = {'reasoner_skipped': f'owlready2 could not load the ontology: {load_error}'}
+                skipped_reason = 'ontology_load_failed'
+            else:
+                logger.info(f"[STAGE] reasoner: in-process Pellet with {budget}s budget...")
+                consistent, methodology_extras, derivation_steps, inferred_axioms, skipped_reason, \
+                    unsatisfiable_classes = \
+                    self._try_reasoner_with_budget(onto, budget_seconds=budget)
+        elif routing.route in ('robot', 'rl') or use_portfolio:
+            if use_portfolio:
+                import tempfile
+                budget = (int(os.environ.get('REASONER_BUDGET_SECONDS', '60'))
+                          if routing.route == 'pellet' else external_timeout)
+                logger.info(f"[STAGE] reasoner: portfolio {', '.join(portfolio)} "
+                            f"(class_count={class_count}), budget={budget}s")
+                from reasoner_portfolio import run_portfolio
+                fd, module_path = tempfile.mkstemp(suffix='.nt')
+                os.close(fd)
+                try:
+                    reasoner_graph.serialize(destination=module_path, format='nt', encoding='utf-8')
+                    ext = run_portfolio(module_path, portfolio, budget, graph=reasoner_graph,
+                                        bfo_path=bfo_path, profiles=profiles)
+                finally:
+                    os.unlink(module_path)
+            elif routing.route == 'robot':
+                logger.info(f"[STAGE] reasoner: external ROBOT+{routing.reasoner} "
+                            f"(class_count={class_count}), timeout={external_timeout}s")
+                from external_reasoner import run_robot_reason
+                ext = run_robot_reason(
+                    file_path,
+                    timeout_seconds=external_timeout,
+                    reasoner=routing.reasoner,
+                    normalized_graph=reasoner_graph,
+                    bfo_path=bfo_path,
+                )
+            else:
+                logger.info(f"[STAGE] reasoner: OWL 2 RL rules (class_count={class_count}), "
+                            f"timeout={external_timeout}s")
+                from rl_reasoner import load_bfo_graph, run_rl_materialize
+                ext = run_rl_materialize(
+                    reasoner_graph,
+                    bfo_graph=load_bfo_graph(bfo_path) if bfo_path else None,
+                    timeout_seconds=external_timeout,
+                )
             if ext['ran']:
-                consistent = bool(ext['consistent'])
+                # None: the engine could not decide (the RL rules without a
+                # clash, a non-definitive portfolio). Reported as unknown.
+                consistent = ext['consistent']
+                if use_portfolio and not ext.get('definitive'):
+                    # ELK outside EL found no clash, which proves nothing.
+                    consistent = None
                 unsatisfiable_classes = ext.get('unsatisfiable_classes', [])
+                consistency_issues = ext.get('consistency_issues', [])
                 # Cap inferences so the JSON column / response stays manageable.
                 # ELK can produce hundreds of thousands of entailed SubClassOf
                 # axioms on rich hierarchies — well beyond what the UI can
                 # render usefully.
                 cap = int(os.environ.get('MAX_INFERRED_AXIOMS', '5000'))
                 total = len(ext['inferred_axioms'])
+                inferred_axioms_all = ext['inferred_axioms']
                 if total > cap:
                     logger.info(f"[STAGE] reasoner: capping inferred axioms {total} -> {cap}")
                     inferred_axioms = ext['inferred_axioms'][:cap]
@@ -1188,6 +1417,13 @@ class OwlTester:
                     'reasoner_engine_attempted': ext['engine'],
                 }
                 skipped_reason = 'external_reasoner_failed'
+            if use_portfolio:
+                methodology_extras['reasoner_portfolio'] = {
+                    'engines': portfolio,
+                    'winner': ext.get('winner'),
+                    'definitive': ext.get('definitive', False),
+                    'attempts': ext.get('attempts', []),
+                }
         else:
             logger.info(f"[STAGE] reasoner: SKIPPED (class_count={class_count} > "
                         f"{max_classes_for_reasoning}, EXTERNAL_REASONER={external_reasoner})")
@@ -1204,8 +1440,17 @@ class OwlTester:
             }
             skipped_reason = 'too_many_classes'
 
+        reasoners_used = {
+            'pellet': ['Pellet'],
+            'robot': [f"ROBOT/{routing.reasoner}"],
+            'rl': ['OWL 2 RL rules'],
+        }.get(routing.route, [])
+        if use_portfolio:
+            from reasoner_portfolio import ENGINE_LABELS
+            winner = methodology_extras.get('reasoner_portfolio', {}).get('winner')
+            reasoners_used = [ENGINE_LABELS[winner]] if winner else []
         reasoning_methodology = {
-            'reasoners_used': ['Pellet'],
+            'reasoners_used': reasoners_used,
             'reasoning_tasks': ['consistency', 'classification', 'realization'],
             'timestamp': datetime.datetime.utcnow().isoformat(),
             'theoretical_guarantees': {
@@ -1226,6 +1471,11 @@ class OwlTester:
             ],
         }
         reasoning_methodology.update(methodology_extras)
+        reasoning_methodology['owl2_profiles'] = profile_report
+        reasoning_methodology['reasoner_routing'] = routing.to_dict()
+        if module is not None:
+            reasoning_methodology['module_extraction'] = dict(
+                module.to_dict(), applied=reasoner_graph is not rdf['graph'])
         if skipped_reason:
             reasoning_methodology['reasoning_status'] = 'skipped'
             reasoning_methodology['reasoning_skipped_reason'] = skipped_reason
@@ -1235,12 +1485,14 @@ class OwlTester:
         # Coherence is distinct from consistency: a consistent ontology can still
         # have unsatisfiable named classes. Status is only firm when the reasoner
         # actually ran; otherwise it is unknown and the lint is the safety net.
-        if not consistent:
+        if consistent is False:
             coherence_status = 'inconsistent'
         elif skipped_reason:
             coherence_status = 'unknown'
         elif unsatisfiable_classes:
             coherence_status = 'incoherent'
+        elif consistent is None:
+            coherence_status = 'unknown'
         else:
             coherence_status = 'coherent'
 
@@ -1267,12 +1519,14 @@ class OwlTester:
             'axiom_count': rdf['axiom_count'],
             'axioms': rdf['axioms'],
             'inferred_axioms': inferred_axioms,
+            'inferred_axioms_all': inferred_axioms_all if inferred_axioms_all is not None else inferred_axioms,
             'class_list': rdf['class_names'],
             'object_property_list': rdf['object_property_names'],
             'data_property_list': rdf['data_property_names'],
             'individual_list': rdf['individual_names'],
-            'consistency': 'Consistent' if consistent else 'Inconsistent',
+            'consistency': {True: 'Consistent', False: 'Inconsistent'}.get(consistent, 'Unknown'),
             'is_consistent': consistent,
+            'consistency_issues': consistency_issues,
             'expressivity': expressivity,
             'reasoning_methodology': reasoning_methodology,
             'derivation_steps': derivation_steps,
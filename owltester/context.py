@@ -32,8 +32,11 @@ class GateContext:
         # background: an artifact class grounds to BFO through the SOoL categories
         # the kernel defines, so we merge the kernel's subClassOf edges in here.
         self.edges = {}
+        self._entry_points = None  # built on first bfo_parents(), edges final by then
         self._add_edges(self.graph)
-        if kernel is not None and getattr(kernel, "path", None):
+        if kernel is not None and getattr(kernel, "graph", None) is not None:
+            self._add_edges(kernel.graph)
+        elif kernel is not None and getattr(kernel, "path", None):
             try:
                 kg = rdflib.Graph()
                 kg.parse(kernel.path, format="turtle")
@@ -53,18 +56,10 @@ class GateContext:
     def bfo_parents(self, cls_iri):
         """BFO anchor/category IRIs reachable upward from cls_iri (entry points
         into BFO; does not climb BFO's own hierarchy)."""
-        reached, seen = set(), set()
-        stack = list(self.edges.get(cls_iri, ()))
-        while stack:
-            node = stack.pop()
-            if node in seen:
-                continue
-            seen.add(node)
-            if self.is_bfo(node):
-                reached.add(node)
-                continue
-            stack.extend(self.edges.get(node, ()))
-        return reached
+        if self._entry_points is None:
+            from bfo.entry_points import EntryPointIndex
+            self._entry_points = EntryPointIndex(self.edges, prefix=BFO_PREFIX)
+        return self._entry_points.entry_points(cls_iri)
 
     def reaches(self, cls_iri, target_iri):
         """True if cls_iri reaches target_iri via subClassOf*. Uses the BFO
@@ -17,6 +17,7 @@ derived from the kernel graph rather than hard-coded vocabulary.
 """
 
 import os
+import threading
 from dataclasses import dataclass, field
 
 import rdflib
@@ -59,6 +60,8 @@ class Kernel:
     categories: list = field(default_factory=list)   # list[SoolCategory]
     contradiction_types: set = field(default_factory=set)  # IRIs, for D3
     version: str = "sool-kernel/unversioned"
+    # The parsed kernel graph, shared read-only by every check that merges it.
+    graph: object = field(default=None, repr=False, compare=False)
 
     def category_for_anchor(self, anchor_iri):
         return [c for c in self.categories if c.required_anchor == anchor_iri]
@@ -74,9 +77,31 @@ def default_kernel_path():
     return _DEFAULT_KERNEL
 
 
+_LOADED = {}
+_LOCK = threading.Lock()
+
+
 def load_kernel(path=None):
-    """Load a kernel from TTL. Falls back to the bundled sool-kernel.ttl."""
+    """Load a kernel from TTL. Falls back to the bundled sool-kernel.ttl.
+
+    Kernels are cached per file and modification time, so every check in a
+    process (and every worker forked from a warmed-up master) shares one parse.
+    """
     path = path or _DEFAULT_KERNEL
+    try:
+        key = (os.path.abspath(path), os.path.getmtime(path))
+    except OSError:
+        key = None
+    with _LOCK:
+        kernel = _LOADED.get(key) if key else None
+        if kernel is None:
+            kernel = _load_kernel(path)
+            if key:
+                _LOADED[key] = kernel
+        return kernel
+
+
+def _load_kernel(path):
     g = rdflib.Graph()
     g.parse(path, format="turtle")
 
@@ -121,4 +146,4 @@ def load_kernel(path=None):
         break
 
     return Kernel(path=path, size=size, categories=categories,
-                  contradiction_types=contradiction_types, version=version)
+                  contradiction_types=contradiction_types, version=version, graph=g)
@@ -65,11 +65,28 @@ def run(ctx):
         # Merge the kernel so SOoL categories are grounded to BFO during
         # reasoning; otherwise a class whose grounding lives only in the kernel
         # would look vacuous to C2.
-        if ctx.kernel and getattr(ctx.kernel, "path", None):
+        if ctx.kernel and getattr(ctx.kernel, "graph", None) is not None:
+            for triple in ctx.kernel.graph:
+                merged.add(triple)
+        elif ctx.kernel and getattr(ctx.kernel, "path", None):
             try:
                 merged.parse(ctx.kernel.path, format="turtle")
             except Exception:  # noqa: BLE001
                 pass
+        # Reason over the locality module for the artifact's classes and the
+        # BFO terms in play; BFO itself is attached whole below.
+        if os.environ.get("MODULE_EXTRACTION", "star").lower() not in ("none", "off", "0", ""):
+            try:
+                from owl_modules import BFO_IRI_PREFIX, extract_module
+                signature = {rdflib.URIRef(c) for c in ctx.classes}
+                signature |= {t for t in merged.all_nodes()
+                              if isinstance(t, rdflib.URIRef) and str(t).startswith(BFO_IRI_PREFIX)}
+                module = extract_module(merged, signature, method=os.environ.get(
+                    "MODULE_EXTRACTION", "star").lower())
+                r.notes["module_extraction"] = module.to_dict()
+                merged = module.graph
+            except Exception:  # noqa: BLE001 - reason over the full merge instead
+                pass
         if bfo_path:
             try:
                 merged.parse(bfo_path)
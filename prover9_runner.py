@@ -19,6 +19,21 @@ Method, per candidate class C:
   a contradiction through the disjointness axioms. A proof => C is unsatisfiable.
   No proof within the timeout (optionally confirmed by a Mace4 model) => treated
   as satisfiable.
+
+On the lightweight export (no BFO background) the theory is only subsumptions
+and disjointness, so a class can be empty only if its subsumption closure reaches
+both sides of a disjointness axiom. Classes whose closure does not are certified
+satisfiable statically (static_satisfiable) and never reach the prover.
+
+With the BFO background, classes are scheduled by iterative deepening
+(schedule_goals): every goal first gets a short resource limit, and only the
+'undetermined' ones are retried with geometrically growing limits until a shared
+wall-clock budget runs out, so easy classes do not wait behind hard ones.
+
+Before the per-class loop, Mace4 is asked for a single model in which every
+candidate is inhabited; such a model certifies the whole batch satisfiable at
+once. Without one, the batch is bisected a few levels deep, and only classes
+still uncertified go to the per-class check.
 """
 import logging
 import os
@@ -39,6 +54,9 @@ _P9_PROVED = 0
 _P9_EXHAUSTED = 2
 _PROOF_RE = re.compile(r"THEOREM PROVED|Exiting with \d+ proof", re.IGNORECASE)
 _MODEL_RE = re.compile(r"MODEL|Exiting with \d+ model", re.IGNORECASE)
+# Stricter than _MODEL_RE: a joint model certifies a whole batch, so only trust
+# Mace4's own exit summary (the echoed input can mention "model" too).
+_MODEL_FOUND_RE = re.compile(r"Exiting with [1-9]\d* model")
 
 
 def prover9_available():
@@ -65,9 +83,19 @@ def _goal_block(sym, kind, align=False):
 
 def _existence_block(sym, kind, align=False):
     """A Prover9 assumptions fragment asserting class `sym` is inhabited."""
-    if kind == "occurrent" and not align:
-        return f"\nformulas(assumptions).\n  exists X (instance_of_at(X,{sym})).\nend_of_list.\n"
-    return f"\nformulas(assumptions).\n  exists X exists T (instance_of(X,{sym},T)).\nend_of_list.\n"
+    return _joint_existence_block([(sym, kind)], align=align)
+
+
+def _joint_existence_block(batch, align=False):
+    """A Prover9 assumptions fragment asserting every (sym, kind) in `batch` is
+    inhabited (one existential per class, so each may have its own witness)."""
+    lines = []
+    for sym, kind in batch:
+        if kind == "occurrent" and not align:
+            lines.append(f"  exists X (instance_of_at(X,{sym})).")
+        else:
+            lines.append(f"  exists X exists T (instance_of(X,{sym},T)).")
+    return "\nformulas(assumptions).\n" + "\n".join(lines) + "\nend_of_list.\n"
 
 
 def _limits_block(max_seconds, max_megs):
@@ -91,10 +119,12 @@ def check_class_unsat(assumptions_p9, sym, kind, timeout=5, background="",
 
     `assumptions_p9` is the Prover9 assumptions file from fol_export.render_prover9.
     `background`, when given, is the translated BFO-2020 theory
-    (clif_theory.render_prover9_theory) prepended ahead of the export so the
-    prover can use the full first-order axiomatization; pass align=True alongside
-    an export rendered with align_bfo=True so goals and both theories share the
-    ternary instance_of/3. max_seconds / max_megs bound each invocation.
+    (clif_theory.render_prover9_theory, usually precompiled to clauses) prepended
+    ahead of the export so the prover can use the full first-order
+    axiomatization; pass align=True alongside an export rendered with
+    align_bfo=True so goals and both theories share the ternary instance_of/3.
+    max_seconds / max_megs are Prover9/Mace4 resource limits for each
+    invocation.
 
     Prover9 decides; if it finds no proof and Mace4 is available, a Mace4 model
     confirms satisfiability. The distinction the heavy background needs:
@@ -143,9 +173,149 @@ def check_class_unsat(assumptions_p9, sym, kind, timeout=5, background="",
     return stalled
 
 
+def find_joint_model(assumptions_p9, batch, timeout=5, background="", align=False,
+                     max_seconds=None, max_megs=None):
+    """True if Mace4 finds one model in which every class of `batch` (a list of
+    (sym, kind)) is inhabited, which certifies each of them satisfiable.
+
+    False covers everything else (no model within the limits, a timeout, an
+    error, no mace4 binary); it proves nothing, since Mace4 only searches finite
+    domains, so those classes still need a per-class check.
+    """
+    if not batch or not mace4_available():
+        return False
+    m4_input = (_limits_block(max_seconds, max_megs) + background + assumptions_p9
+                + _joint_existence_block(batch, align=align))
+    try:
+        m4 = _run(["mace4"], m4_input, timeout)
+    except subprocess.TimeoutExpired:
+        return False
+    except Exception as e:  # noqa: BLE001
+        logger.warning("mace4 invocation failed: %s", e)
+        return False
+    return m4.returncode == 0 or bool(_MODEL_FOUND_RE.search(m4.stdout or ""))
+
+
+def certify_satisfiable(assumptions_p9, batch, timeout=5, background="", align=False,
+                        max_seconds=None, max_megs=None, max_depth=3):
+    """Certify as many classes satisfiable as possible with joint Mace4 models.
+
+    Asks for one model of the whole batch; if there is none, bisects and retries
+    each half, down to max_depth levels (at most 2**(max_depth+1) - 1 Mace4 runs)
+    and never below pairs, since a single class gets its own Mace4 run in
+    check_class_unsat anyway. On a coherent ontology the first run usually
+    certifies everything.
+
+    Returns (certified syms, uncertified (sym, kind) list, mace4 runs).
+    """
+    certified, uncertified, runs = [], [], 0
+    stack = [(list(batch), 0)]
+    while stack:
+        part, depth = stack.pop()
+        if len(part) < 2 or depth > max_depth:
+            uncertified.extend(part)
+            continue
+        runs += 1
+        if find_joint_model(assumptions_p9, part, timeout=timeout, background=background,
+                            align=align, max_seconds=max_seconds, max_megs=max_megs):
+            certified.extend(sym for sym, _ in part)
+            continue
+        mid = len(part) // 2
+        stack.append((part[mid:], depth + 1))
+        stack.append((part[:mid], depth + 1))
+    return certified, uncertified, runs
+
+
+def schedule_goals(goals, decide, start_seconds=1, factor=3, budget_seconds=60):
+    """Decide `goals` by iterative deepening on the per-attempt resource limit.
+
+    decide(goal, limit) returns a check_class_unsat verdict for one goal run with
+    max_seconds=limit. Round one runs every goal at start_seconds; each later
+    round retries only the goals still 'undetermined', with the limit multiplied
+    by factor. A limit is never larger than the budget left, and scheduling stops
+    once budget_seconds of wall-clock time are spent; goals never decided keep
+    'undetermined'.
+
+    Returns (report, rounds) where report maps goal -> {verdict, seconds (total
+    wall-clock spent on it), limit (the limit it was decided at, or None),
+    attempts}.
+    """
+    started = time.perf_counter()
+    report = {g: {"verdict": "undetermined", "seconds": 0.0, "limit": None, "attempts": 0}
+              for g in goals}
+    pending, limit, rounds = list(goals), start_seconds, 0
+    while pending:
+        remaining = budget_seconds - (time.perf_counter() - started)
+        if remaining < 1:
+            break
+        rounds += 1
+        round_limit = max(1, int(min(limit, remaining)))
+        still = []
+        for goal in pending:
+            remaining = budget_seconds - (time.perf_counter() - started)
+            if remaining < 1:
+                still.append(goal)
+                continue
+            attempt_limit = max(1, int(min(round_limit, remaining)))
+            t0 = time.perf_counter()
+            verdict = decide(goal, attempt_limit)
+            entry = report[goal]
+            entry["seconds"] = round(entry["seconds"] + time.perf_counter() - t0, 3)
+            entry["attempts"] += 1
+            entry["verdict"] = verdict
+            if verdict == "undetermined":
+                still.append(goal)
+            else:
+                entry["limit"] = attempt_limit
+        logger.info("prover schedule: round %d at %ss decided %d of %d goal(s)",
+                    rounds, round_limit, len(pending) - len(still), len(pending))
+        if round_limit < limit:
+            break  # already squeezed to the budget left; a larger limit cannot run
+        pending, limit = still, limit * factor
+    return report, rounds
+
+
+def static_satisfiable(theory):
+    """IRIs of the classes the lightweight export alone cannot make empty.
+
+    The export is Horn: subsumptions A -> B and disjointness -(A & B). A one-element
+    model that inhabits exactly the subsumption closure of C satisfies every axiom
+    unless that closure contains both sides of some disjoint pair, so every other
+    class is satisfiable. Only sound without the BFO background, whose extra
+    axioms this graph does not see.
+    """
+    parents_of = {}
+    children_of = {}
+    for sub, sup in theory.subsumptions:
+        parents_of.setdefault(sub, set()).add(sup)
+        children_of.setdefault(sup, set()).add(sub)
+
+    below = {}
+
+    def subclasses(iri):
+        # Every class whose closure reaches iri (iri included).
+        if iri not in below:
+            seen, stack = {iri}, [iri]
+            while stack:
+                for child in children_of.get(stack.pop(), ()):
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+            below[iri] = seen
+        return below[iri]
+
+    at_risk = set()
+    for a, b, _ in theory.disjoints:
+        at_risk |= subclasses(a) & subclasses(b)
+    return set(theory.classes) - at_risk
+
+
 def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
                 max_classes=60, per_class_timeout=5, bfo_background=False,
-                background_max_seconds=10, background_max_megs=500):
+                background_max_seconds=10, background_max_megs=500,
+                batch_witness=True, static_filter=True, escalate=True,
+                escalation_start_seconds=1, escalation_factor=3,
+                background_budget_seconds=None):
     """Run the prover over a theory and compare with the DL reasoner.
 
     Args:
@@ -154,7 +324,7 @@ def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
             found unsatisfiable (for the agreement comparison).
         assumptions_p9: pre-rendered Prover9 assumptions; rendered from theory if
             omitted (rendered aligned to the BFO signature when bfo_background).
-        max_classes: cap on classes tested (logged when exceeded; the prover is
+        max_classes: cap on classes sent to the prover (logged when exceeded; it is
             invoked once per class so this bounds wall-clock).
         per_class_timeout: wall-clock seconds per prover invocation.
         bfo_background: when True, prepend the full BFO-2020 first-order theory
@@ -165,6 +335,20 @@ def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
             'undetermined' rather than counted as agreement.
         background_max_seconds / background_max_megs: per-class Prover9/Mace4
             resource limits applied only on the background path.
+        escalate: on the background path, schedule classes with schedule_goals
+            instead of giving each one background_max_seconds: start at
+            escalation_start_seconds and multiply by escalation_factor for the
+            classes still undetermined, within background_budget_seconds of
+            wall-clock in total (default: background_max_seconds per class,
+            the fixed-limit worst case).
+        batch_witness: when Mace4 is available, first certify classes satisfiable
+            in bulk with joint Mace4 models (certify_satisfiable); only the
+            classes left over are sent to the prover one by one.
+        static_filter: without the BFO background, certify classes satisfiable
+            from the subsumption/disjointness graph (static_satisfiable) before
+            the cap is applied, so the prover only sees possibly-unsat classes.
+            Skipped when assumptions_p9 is supplied, since the graph may not
+            describe it.
 
     Returns a dict:
         {
@@ -180,7 +364,15 @@ def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
           'only_prover': [names],           # divergence: prover-only
           'only_reasoner': [names],         # divergence: reasoner-only
           'tested': int,
+          'statically_certified': int,      # certified from the theory graph
+          'witness_certified': int,         # certified by a joint Mace4 model
+          'witness_runs': int,              # Mace4 runs spent on joint models
           'capped': bool,
+          'schedule': {iri: {label, verdict, seconds, limit, attempts}},
+                                            # escalation only: per-class time and
+                                            # the limit it was decided at, keyed
+                                            # by IRI (labels need not be unique)
+          'schedule_rounds': int,
           'elapsed_seconds': float,
         }
     """
@@ -191,7 +383,8 @@ def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
         "reason": None, "prover_unsatisfiable": [], "reasoner_unsatisfiable": [],
         "undetermined": [],
         "agree": None, "only_prover": [], "only_reasoner": [],
-        "tested": 0, "capped": False, "elapsed_seconds": 0.0,
+        "tested": 0, "statically_certified": 0, "witness_certified": 0, "witness_runs": 0,
+        "capped": False, "schedule": {}, "schedule_rounds": 0, "elapsed_seconds": 0.0,
     }
     reasoner_set = {str(n) for n in (reasoner_unsat_names or [])}
     result["reasoner_unsatisfiable"] = sorted(reasoner_set)
@@ -208,11 +401,12 @@ def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
     if bfo_background:
         try:
             from clif_theory import render_prover9_theory
-            background = render_prover9_theory()
+            background = render_prover9_theory(clausal=True)
         except Exception as e:  # noqa: BLE001
             result["reason"] = f"could not load BFO background theory: {e}"
             return result
 
+    static = static_filter and not bfo_background and assumptions_p9 is None
     if assumptions_p9 is None:
         from fol_export import render_prover9
         assumptions_p9 = render_prover9(theory, align_bfo=bfo_background)
@@ -227,19 +421,65 @@ def cross_check(theory, reasoner_unsat_names=None, assumptions_p9=None,
         if not iri.startswith("http://purl.obolibrary.org/obo/BFO_")
     ]
     candidates.sort(key=lambda c: c[2].lower())
+    if static:
+        safe = {theory.classes[iri]["sym"] for iri in static_satisfiable(theory)}
+        before = len(candidates)
+        candidates = [c for c in candidates if c[0] not in safe]
+        result["statically_certified"] = before - len(candidates)
+        result["tested"] = result["statically_certified"]
+        logger.info("prover cross-check: %d of %d classes certified satisfiable "
+                    "statically; %d left for the prover",
+                    result["statically_certified"], before, len(candidates))
     if len(candidates) > max_classes:
         result["capped"] = True
         logger.info("prover cross-check: testing %d of %d classes (cap=%d)",
                     max_classes, len(candidates), max_classes)
         candidates = candidates[:max_classes]
 
+    certified = set()
+    if batch_witness and len(candidates) > 1 and mace4_available():
+        syms, _, runs = certify_satisfiable(
+            assumptions_p9, [(sym, kind) for sym, kind, _ in candidates],
+            timeout=per_class_timeout, background=background, align=bfo_background,
+            max_seconds=max_secs, max_megs=max_megs)
+        certified = set(syms)
+        result["witness_certified"] = len(certified)
+        result["witness_runs"] = runs
+        logger.info("prover cross-check: %d of %d classes certified satisfiable by "
+                    "%d joint Mace4 run(s)", len(certified), len(candidates), runs)
+
+    result["tested"] += len(certified)
+    pending = [c for c in candidates if c[0] not in certified]
+    verdicts = {}
+    if bfo_background and escalate and pending:
+        budget = background_budget_seconds
+        if budget is None:
+            budget = background_max_seconds * len(pending)
+
+        def decide(goal, limit):
+            sym, kind, _ = goal
+            return check_class_unsat(
+                assumptions_p9, sym, kind, timeout=limit + per_class_timeout,
+                background=background, align=True, max_seconds=limit,
+                max_megs=max_megs)
+
+        report, result["schedule_rounds"] = schedule_goals(
+            pending, decide, start_seconds=escalation_start_seconds,
+            factor=escalation_factor, budget_seconds=budget)
+        iri_of = {rec["sym"]: iri for iri, rec in theory.classes.items()}
+        result["schedule"] = {iri_of[goal[0]]: {"label": goal[2], **entry}
+                              for goal, entry in report.items()}
+        verdicts = {goal: entry["verdict"] for goal, entry in report.items()}
+    else:
+        for sym, kind, label in pending:
+            verdicts[(sym, kind, label)] = check_class_unsat(
+                assumptions_p9, sym, kind, timeout=per_class_timeout,
+                background=background, align=bfo_background,
+                max_seconds=max_secs, max_megs=max_megs)
+
     prover_unsat = []
     undetermined = []
-    for sym, kind, label in candidates:
-        verdict = check_class_unsat(
-            assumptions_p9, sym, kind, timeout=per_class_timeout,
-            background=background, align=bfo_background,
-            max_seconds=max_secs, max_megs=max_megs)
+    for (_, _, label), verdict in verdicts.items():
         result["tested"] += 1
         if verdict == "unsatisfiable":
             prover_unsat.append(label)
@@ -0,0 +1,255 @@
+"""
+Reasoner portfolio: run several engines at once and keep the first definitive answer.
+
+A single reasoner that times out leaves coherence 'unknown', although another
+engine may have settled the question in seconds: ELK classifies most EL-heavy
+ontologies far faster than Pellet, and HermiT and Pellet each have inputs the
+other struggles with. The portfolio starts every configured engine concurrently
+under one shared budget, takes the first *definitive* consistency/coherence
+verdict, and cancels the rest.
+
+Engines:
+    pellet  owlready2 + Pellet, in a worker subprocess
+    hermit  owlready2 + HermiT, in a worker subprocess
+    elk     ROBOT + ELK (external_reasoner), only when the robot CLI is present
+
+Each engine runs in its own process group, so cancelling it also kills its JVM
+(see external_reasoner.run_cancellable). An answer is definitive when the engine
+found the ontology inconsistent or some class unsatisfiable (every engine here is
+sound), or when it found none and is complete for the ontology: Pellet and
+HermiT always, ELK only for OWL 2 EL.
+
+Public API:
+    ENGINES, ENGINE_LABELS
+    run_portfolio(ontology_path, engines, budget_seconds, ...) -> result dict
+        (the shape of external_reasoner.run_robot_reason, plus winner/attempts)
+
+Run as a script, `python reasoner_portfolio.py <pellet|hermit> <file>` is the
+worker: it reasons over the file with BFO attached and prints one result line.
+"""
+
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("pellet", "hermit", "elk")
+
+_RESULT_MARKER = "PORTFOLIO_RESULT "
+# Names for reasoning_methodology['reasoners_used'].
+ENGINE_LABELS = {"pellet": "Pellet", "hermit": "HermiT", "elk": "ROBOT/ELK"}
+_ORIGINS = {"pellet": "Pellet reasoner", "hermit": "HermiT reasoner", "elk": "ROBOT/ELK"}
+
+
+def _empty_result(engine):
+    return {
+        "ran": False,
+        "consistent": None,
+        "inferred_axioms": [],
+        "derivation_steps": [],
+        "unsatisfiable_classes": [],
+        "engine": engine,
+        "elapsed_seconds": 0.0,
+        "error": None,
+    }
+
+
+def _run_owlready_engine(engine, ontology_path, timeout_seconds, cancel):
+    """Reason with Pellet or HermiT in a worker subprocess (see _worker)."""
+    from external_reasoner import ReasonerCancelled, run_cancellable
+
+    started = time.perf_counter()
+    result = _empty_result(engine)
+    cmd = [sys.executable, os.path.abspath(__file__), engine, ontology_path]
+    try:
+        proc = run_cancellable(cmd, timeout_seconds, cancel=cancel)
+    except subprocess.TimeoutExpired:
+        result["error"] = f"{engine} exceeded {timeout_seconds:g}s"
+        return result
+    except ReasonerCancelled:
+        result["error"] = "cancelled"
+        return result
+    finally:
+        result["elapsed_seconds"] = time.perf_counter() - started
+    for line in reversed((proc.stdout or "").splitlines()):
+        if line.startswith(_RESULT_MARKER):
+            result.update(json.loads(line[len(_RESULT_MARKER):]))
+            result["elapsed_seconds"] = time.perf_counter() - started
+            return result
+    result["error"] = (f"{engine} worker exited {proc.returncode}: "
+                       f"{(proc.stderr or '').strip()[-1500:]}")
+    return result
+
+
+def _run_elk(graph, ontology_path, timeout_seconds, cancel, bfo_path):
+    from external_reasoner import run_robot_reason
+    return run_robot_reason(ontology_path, timeout_seconds=timeout_seconds, reasoner="ELK",
+                            normalized_graph=graph, bfo_path=bfo_path, cancel=cancel)
+
+
+def _definitive(engine, result, profiles):
+    if not result.get("ran"):
+        return False
+    if result.get("consistent") is False or result.get("unsatisfiable_classes"):
+        return True
+    return engine != "elk" or "EL" in profiles
+
+
+def run_portfolio(ontology_path, engines, budget_seconds, graph=None, bfo_path=None,
+                  profiles=()):
+    """Race `engines` over the ontology for at most budget_seconds in total.
+
+    ontology_path must be readable by owlready2 (RDF/XML, N-Triples or OWL/XML);
+    graph, if given, is the same ontology as an rdflib graph and is what ROBOT
+    reads. profiles are the ontology's OWL 2 profiles (owl_profiles), used to
+    decide whether an ELK answer is definitive.
+
+    Returns the winning engine's result (same keys as run_robot_reason) with
+    'winner', 'definitive' and 'attempts' ([{engine, status, elapsed_seconds}])
+    added. With no definitive answer in time, a completed but non-definitive
+    answer (ELK outside EL) is returned with definitive=False; failing that,
+    ran=False with the engines' errors.
+    """
+    from external_reasoner import robot_available
+
+    started = time.perf_counter()
+    engines = [e for e in engines if e in ENGINES]
+    cancel = threading.Event()
+    results = queue.Queue()
+    attempts = {}
+
+    def race(engine):
+        try:
+            if engine == "elk":
+                out = _run_elk(graph, ontology_path, budget_seconds, cancel, bfo_path)
+            else:
+                out = _run_owlready_engine(engine, ontology_path, budget_seconds, cancel)
+        except Exception as e:  # noqa: BLE001 - an engine crash only loses that engine
+            out = _empty_result(engine)
+            out["error"] = f"{type(e).__name__}: {e}"
+        results.put((engine, out))
+
+    threads, started_engines = [], []
+    for engine in engines:
+        if engine == "elk" and not robot_available():
+            attempts[engine] = {"engine": engine, "status": "unavailable", "elapsed_seconds": 0.0}
+            continue
+        t = threading.Thread(target=race, args=(engine,), name=f"portfolio-{engine}", daemon=True)
+        t.start()
+        threads.append(t)
+        started_engines.append(engine)
+    logger.info(f"[STAGE] portfolio: racing {', '.join(started_engines)} "
+                f"with a shared {budget_seconds}s budget")
+
+    winner, fallback, pending = None, None, len(threads)
+    while pending and winner is None:
+        remaining = budget_seconds - (time.perf_counter() - started)
+        try:
+            engine, out = results.get(timeout=max(remaining, 0) + 1)
+        except queue.Empty:
+            break
+        pending -= 1
+        if _definitive(engine, out, profiles):
+            status = "won"
+            winner = (engine, out)
+        elif out.get("ran"):
+            status = "inconclusive"
+            fallback = fallback or (engine, out)
+        else:
+            status = "failed"
+        attempts[engine] = {"engine": engine, "status": status,
+                            "elapsed_seconds": round(out.get("elapsed_seconds", 0.0), 3)}
+        if out.get("error") and status == "failed":
+            attempts[engine]["error"] = out["error"][:300]
+
+    cancel.set()
+    for t in threads:
+        t.join(timeout=5)
+    while not results.empty():
+        engine, out = results.get_nowait()
+        attempts.setdefault(engine, {"engine": engine, "status": "cancelled",
+                                     "elapsed_seconds": round(out.get("elapsed_seconds", 0.0), 3)})
+    for engine in engines:
+        attempts.setdefault(engine, {"engine": engine, "status": "cancelled",
+                                     "elapsed_seconds": round(time.perf_counter() - started, 3)})
+
+    chosen = winner or fallback
+    if chosen is not None:
+        engine, result = chosen
+    else:
+        engine, result = None, _empty_result("portfolio")
+        errors = [f"{a['engine']}: {a.get('error', a['status'])}" for a in attempts.values()]
+        result["error"] = (f"no engine answered within {budget_seconds}s"
+                           + (f" ({'; '.join(errors)})" if errors else ""))
+    result["winner"] = engine
+    result["definitive"] = winner is not None
+    result["attempts"] = [attempts[e] for e in engines]
+    result["elapsed_seconds"] = time.perf_counter() - started
+    logger.info(f"[STAGE] portfolio: {result['elapsed_seconds']:.2f}s, winner={engine} "
+                f"({'definitive' if winner else 'no definitive answer'})")
+    return result
+
+
+def _worker(engine, path):
+    """Reason over `path` with BFO attached; return the result fields as a dict."""
+    import owlready2
+    from bfo.quadstore import new_bfo_world
+    from owl_tester import OwlTester
+
+    world, bfo = new_bfo_world(os.environ.get("BFO_PATH") or None)
+    onto = world.get_ontology("file://" + os.path.abspath(path)).load()
+    if bfo not in onto.imported_ontologies:
+        onto.imported_ontologies.append(bfo)
+    pre = OwlTester._subclass_pairs(onto)
+    sync = owlready2.sync_reasoner_pellet if engine == "pellet" else owlready2.sync_reasoner_hermit
+    origin = _ORIGINS[engine]
+    try:
+        with onto:
+            sync(world, infer_property_values=False)
+    except owlready2.OwlReadyInconsistentOntologyError as e:
+        step = {
+            "axiom_type": "Inconsistency",
+            "description": "Ontology is logically inconsistent (no model exists).",
+            "reason": f"{origin} proved the ontology unsatisfiable",
+            "supporting_facts": [str(e)[:500]],
+            "confidence": "High",
+            "origin": origin,
+        }
+        return {"ran": True, "consistent": False, "derivation_steps": [step]}
+
+    names = {}
+    new_pairs = OwlTester._subclass_pairs(onto) - pre
+    for storid in {x for pair in new_pairs for x in pair}:
+        names[storid] = world._unabbreviate(storid).rsplit("#", 1)[-1].rsplit("/", 1)[-1]
+    steps, inferred = [], []
+    for child, parent in sorted(new_pairs, key=lambda p: (names[p[0]], names[p[1]])):
+        step = {
+            "axiom_type": "SubClassOf",
+            "description": f"{names[child]} ⊑ {names[parent]}",
+            "reason": "Inferred by reasoner",
+            "supporting_facts": ["Tableau reasoning over class restrictions"],
+            "confidence": "High",
+            "origin": origin,
+        }
+        steps.append(step)
+        inferred.append({"type": "SubClassOf", "description": step["description"],
+                         "derivation": step})
+    return {
+        "ran": True,
+        "consistent": True,
+        "inferred_axioms": inferred,
+        "derivation_steps": steps,
+        "unsatisfiable_classes": OwlTester._collect_unsatisfiable(onto),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in ("pellet", "hermit"):
+        sys.exit("usage: reasoner_portfolio.py <pellet|hermit> <ontology file>")
+    print(_RESULT_MARKER + json.dumps(_worker(sys.argv[1], sys.argv[2])), flush=True)
@@ -0,0 +1,81 @@
+"""Benchmark the CLIF lexer and parser against the original character-wise lexer.
+
+Times, per input: the original one-character-at-a-time tokenizer, the regex
+tokenizer (clif_lexer.tokenize), parse() and the streaming iter_forms() reading
+the file from disk. Inputs are the vendored bfo/bfo-2020.clif and a synthetic
+"large upload" made by concatenating it --repeat times (about 140 KB each), plus
+any CLIF files given on the command line.
+
+    python scripts/bench_clif_lexer.py [--repeat 40] [file.clif ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clif_lexer import _tokenize_charwise, iter_forms, parse, tokenize  # noqa: E402
+
+BFO_CLIF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "bfo", "bfo-2020.clif")
+
+
+def _best(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        t = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def bench(name, path, rounds):
+    with open(path, "r", encoding="utf-8") as fh:
+        text = fh.read()
+    old, old_tokens = _best(lambda: _tokenize_charwise(text), rounds)
+    new, new_tokens = _best(lambda: tokenize(text), rounds)
+    if new_tokens != old_tokens:
+        raise SystemExit(f"{name}: token streams differ")
+    parsed, forms = _best(lambda: parse(text), rounds)
+
+    def stream():
+        with open(path, "r", encoding="utf-8") as fh:
+            return sum(1 for _ in iter_forms(fh))
+
+    streamed, count = _best(stream, rounds)
+    if count != len(forms):
+        raise SystemExit(f"{name}: iter_forms yielded {count} forms, parse {len(forms)}")
+    print(f"{name}: {len(text) / 1e6:.2f} MB, {len(new_tokens)} tokens, {count} forms")
+    print(f"  char-wise tokenize  {old:8.3f}s")
+    print(f"  regex tokenize      {new:8.3f}s  ({old / new:.1f}x)")
+    print(f"  parse               {parsed:8.3f}s")
+    print(f"  iter_forms (file)   {streamed:8.3f}s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--repeat", type=int, default=40,
+                    help="copies of bfo-2020.clif in the synthetic upload")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    bench("bfo-2020.clif", BFO_CLIF, args.rounds)
+    with open(BFO_CLIF, "r", encoding="utf-8") as fh:
+        text = fh.read()
+    with tempfile.NamedTemporaryFile("w", suffix=".clif", delete=False,
+                                     encoding="utf-8") as tmp:
+        tmp.write(text * args.repeat)
+    try:
+        bench(f"upload ({args.repeat}x bfo-2020.clif)", tmp.name, args.rounds)
+    finally:
+        os.unlink(tmp.name)
+    for path in args.files:
+        bench(os.path.basename(path), path, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark the OWL Functional Syntax reader against a ROBOT conversion.
+
+Times, per input: ofn_reader.iter_triples streaming the file (tokenize, parse
+and translate), ofn_reader.parse_file into an rdflib graph, and -- when the
+robot CLI is on PATH -- the conversion hop it replaces: `robot convert` to
+RDF/XML plus the rdflib parse of its output. When both run, the triple counts
+are compared. Inputs are a synthetic ontology of --classes classes (a
+declaration, label, subclass edge and existential restriction each, about
+130 bytes per class) plus any .ofn files given on the command line.
+
+    python scripts/bench_ofn_reader.py [--classes 20000] [file.ofn ...]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rdflib  # noqa: E402
+
+from ofn_reader import iter_triples, parse_file  # noqa: E402
+
+
+def _best(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        t = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def synthetic(path, classes):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("Prefix(:=<http://example.org/bench#>)\n"
+                 "Prefix(rdfs:=<http://www.w3.org/2000/01/rdf-schema#>)\n"
+                 "Ontology(<http://example.org/bench>\n"
+                 "Declaration(ObjectProperty(:partOf))\n")
+        for i in range(classes):
+            parent = f":C{(i - 1) // 2}" if i else "owl:Thing"
+            fh.write(f"Declaration(Class(:C{i}))\n"
+                     f"AnnotationAssertion(rdfs:label :C{i} \"class {i}\"@en)\n"
+                     f"SubClassOf(:C{i} {parent})\n"
+                     f"SubClassOf(:C{i} ObjectSomeValuesFrom(:partOf :C{i // 3}))\n")
+        fh.write(")\n")
+
+
+def robot_convert(path, rounds):
+    out = tempfile.NamedTemporaryFile(suffix=".owl", delete=False).name
+    try:
+        def run():
+            subprocess.run(["robot", "convert", "--input", path, "--output", out],
+                           check=True, capture_output=True)
+            return len(rdflib.Graph().parse(out, format="xml"))
+        return _best(run, rounds)
+    finally:
+        os.unlink(out)
+
+
+def bench(name, path, rounds):
+    def stream():
+        with open(path, "r", encoding="utf-8") as fh:
+            return sum(1 for _ in iter_triples(fh))
+
+    streamed, count = _best(stream, rounds)
+    parsed, graph = _best(lambda: parse_file(path), rounds)
+    print(f"{name}: {os.path.getsize(path) / 1e6:.2f} MB, {count} triples")
+    print(f"  iter_triples (file)   {streamed:8.3f}s")
+    print(f"  parse_file -> Graph   {parsed:8.3f}s")
+    if shutil.which("robot") is None:
+        print("  robot convert + parse   skipped (robot not on PATH)")
+        return
+    robot, robot_count = robot_convert(path, rounds)
+    print(f"  robot convert + parse {robot:8.3f}s  ({robot / parsed:.1f}x slower)")
+    if robot_count != len(graph):
+        print(f"  note: ROBOT's RDF/XML has {robot_count} triples, ofn_reader {len(graph)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--classes", type=int, default=20000,
+                    help="classes in the synthetic ontology")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.NamedTemporaryFile(suffix=".ofn", delete=False) as tmp:
+        pass
+    try:
+        synthetic(tmp.name, args.classes)
+        bench(f"synthetic ({args.classes} classes)", tmp.name, args.rounds)
+    finally:
+        os.unlink(tmp.name)
+    for path in args.files:
+        bench(os.path.basename(path), path, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
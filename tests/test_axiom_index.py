@@ -0,0 +1,90 @@
+"""Tests for the normalized, paginated axiom index."""
+
+import pytest
+from flask import Flask
+
+from axiom_index import axiom_rows, index_analysis_axioms, query_axioms, split_axiom
+from models import db, OntologyAnalysis, OntologyFile
+
+
+@pytest.fixture
+def analysis():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        f = OntologyFile(filename="a.owl", original_filename="a.owl",
+                         file_path="/tmp/a.owl", file_size=1)
+        db.session.add(f)
+        db.session.flush()
+        a = OntologyAnalysis(ontology_file_id=f.id)
+        db.session.add(a)
+        db.session.commit()
+        yield a
+        db.session.remove()
+        db.drop_all()
+
+
+def _inferred(n):
+    return [{"type": "SubClassOf", "description": f"C{i} ⊑ Root",
+             "derivation": {"origin": "ROBOT/ELK"}} for i in range(n)]
+
+
+def test_split_axiom():
+    assert split_axiom("Wing ⊑ MaterialEntity") == ("Wing", "MaterialEntity")
+    assert split_axiom("hasPart domain ⇒ Object") == ("hasPart", "Object")
+    assert split_axiom("free text") == (None, None)
+
+
+def test_axiom_rows_carry_origin():
+    rows = axiom_rows(7, _inferred(2), "inferred")
+    assert rows[0]["origin"] == "ROBOT/ELK"
+    assert rows[0]["subject"] == "C0" and rows[0]["object"] == "Root"
+    assert axiom_rows(7, [{"type": "SubClassOf", "description": "A ⊑ B"}],
+                      "asserted")[0]["origin"] == "asserted"
+
+
+def test_query_pages_and_filters(analysis):
+    asserted = [{"type": "DisjointWith", "description": "C1 ⊥ Other"}]
+    assert index_analysis_axioms(analysis, asserted, _inferred(120)) == 121
+    db.session.commit()
+
+    page = query_axioms(analysis, kind="inferred", page=3, per_page=50)
+    assert page["total"] == 120 and page["pages"] == 3
+    assert len(page["items"]) == 20
+
+    by_class = query_axioms(analysis, cls="C1")
+    assert {a["kind"] for a in by_class["items"]} == {"asserted", "inferred"}
+
+    by_prefix = query_axioms(analysis, kind="inferred", prefix="C1")
+    assert by_prefix["total"] == 31  # C1, C10..C19, C100..C119
+
+    assert query_axioms(analysis, origin="ROBOT/ELK")["total"] == 120
+    assert query_axioms(analysis, axiom_type="DisjointWith")["total"] == 1
+
+
+
+def test_inferences_of_an_exported_analysis_are_indexed_and_filterable(
+        analysis, tmp_path, monkeypatch):
+    from inference_export import write_inference_export
+
+    monkeypatch.setenv("INFERENCE_EXPORT_DIR", str(tmp_path))
+    inferred = _inferred(120)
+    inferred[7]["derivation"] = {"origin": "Pellet reasoner"}
+    analysis.axioms = [{"type": "DisjointWith", "description": "C1 ⊥ Other"}]
+    analysis.inference_export = write_inference_export(analysis.id, inferred)
+    # Only the asserted axiom made it into the table.
+    index_analysis_axioms(analysis, analysis.axioms, None)
+    db.session.commit()
+
+    page = query_axioms(analysis, kind="inferred", page=3, per_page=50)
+    assert (page["total"], len(page["items"])) == (120, 20)
+    by_class = query_axioms(analysis, cls="C1")
+    assert [(a["kind"], a["description"]) for a in by_class["items"]] == [
+        ("asserted", "C1 ⊥ Other"), ("inferred", "C1 ⊑ Root")]
+    assert query_axioms(analysis, origin="ROBOT/ELK")["total"] == 119
+    pellet = query_axioms(analysis, origin="Pellet reasoner", cls="C7")["items"]
+    assert [a["description"] for a in pellet] == ["C7 ⊑ Root"]
+    # Indexed once: a second query does not insert the export again.
+    assert query_axioms(analysis, kind="inferred")["total"] == 120
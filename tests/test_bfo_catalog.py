@@ -36,3 +36,19 @@ def test_closure_catches_continuant_occurrent(catalog):
 
 def test_unrelated_categories_do_not_clash(catalog):
     assert catalog.clash(QUALITY, QUALITY) is False
+
+
+def test_clash_matrix_matches_the_pair_closure(catalog):
+    from bfo import disjointness_closure
+    assert catalog.closure() == disjointness_closure(catalog)
+    assert catalog.clash(QUALITY, "http://example.org/NotBfo") is False
+
+
+def test_clashing_pairs_matches_pairwise_clash(catalog):
+    iris = sorted([QUALITY, DISPOSITION, CONTINUANT, OCCURRENT,
+                   "http://purl.obolibrary.org/obo/BFO_0000040"])
+    expected = [(a, b) for i, a in enumerate(iris) for b in iris[i + 1:]
+                if catalog.clash(a, b)]
+    assert catalog.clashing_pairs(iris) == expected
+    assert (QUALITY, DISPOSITION) in expected or (DISPOSITION, QUALITY) in expected
+    assert catalog.clashing_pairs([QUALITY]) == []
@@ -0,0 +1,48 @@
+"""Tests for the one-pass BFO entry-point index."""
+
+from bfo.entry_points import EntryPointIndex
+
+BFO = "http://purl.obolibrary.org/obo/BFO_"
+QUALITY, DISPOSITION, PROCESS = BFO + "0000019", BFO + "0000016", BFO + "0000015"
+
+
+def _naive(cls, edges):
+    reached, seen, stack = set(), set(), list(edges.get(cls, ()))
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        if node.startswith(BFO):
+            reached.add(node)
+            continue
+        stack.extend(edges.get(node, ()))
+    return reached
+
+
+def test_entry_points_match_a_per_class_walk():
+    edges = {
+        "ex:Force": {"ex:Physical", "ex:Capacity"},
+        "ex:Physical": {QUALITY},
+        "ex:Capacity": {DISPOSITION, "ex:Loop1"},
+        # A subclass cycle: both members share every entry point of the cycle.
+        "ex:Loop1": {"ex:Loop2"},
+        "ex:Loop2": {"ex:Loop1", PROCESS},
+        "ex:Orphan": {"ex:Nowhere"},
+        QUALITY: {BFO + "0000020"},
+    }
+    index = EntryPointIndex(edges)
+    for cls in list(edges) + ["ex:Nowhere", "ex:Unknown"]:
+        assert index.entry_points(cls) == _naive(cls, edges), cls
+    assert index.entry_points("ex:Loop1") is index.entry_points("ex:Loop2")
+    assert index.mask("ex:Orphan") == 0
+    assert index.mask("ex:Force") & index.bit(PROCESS)
+
+
+def test_deep_chain_is_linear():
+    # 20k-deep chain: a per-class walk would be quadratic, and recursion would
+    # overflow the stack.
+    edges = {f"ex:C{i}": {f"ex:C{i + 1}"} for i in range(20000)}
+    edges["ex:C20000"] = {PROCESS}
+    index = EntryPointIndex(edges)
+    assert index.entry_points("ex:C0") == {PROCESS}
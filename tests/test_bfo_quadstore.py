@@ -0,0 +1,49 @@
+"""Tests for the prebuilt BFO quadstore that per-analysis worlds are cloned from."""
+
+import os
+
+import owlready2
+
+from bfo import quadstore
+from bfo.catalog import BFO_IRI_PREFIX
+
+
+def _bfo_classes(onto):
+    return {c.iri for c in onto.classes() if c.iri.startswith(BFO_IRI_PREFIX)}
+
+
+def test_clone_has_bfo_loaded(tmp_path, monkeypatch):
+    monkeypatch.setenv("OWLTESTER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(quadstore, "_BUILT", {})
+    world, bfo_onto = quadstore.new_bfo_world()
+    assert bfo_onto.loaded
+    assert len(_bfo_classes(bfo_onto)) == 36
+    assert world is not owlready2.default_world
+
+
+def test_clones_are_isolated_and_share_one_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("OWLTESTER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(quadstore, "_BUILT", {})
+    w1, b1 = quadstore.new_bfo_world()
+    w2, b2 = quadstore.new_bfo_world()
+
+    user = w1.get_ontology("http://example.org/iso.owl")
+    with user:
+        type("OnlyInFirst", (owlready2.Thing,), {})
+    assert w1.search_one(iri="*OnlyInFirst") is not None
+    assert w2.search_one(iri="*OnlyInFirst") is None
+
+    built = [f for f in os.listdir(tmp_path) if f.endswith(".sqlite3")]
+    assert len(built) == 1
+    # The shared file never picks up per-analysis writes.
+    w3, _ = quadstore.new_bfo_world()
+    assert w3.search_one(iri="*OnlyInFirst") is None
+
+
+def test_analysis_world_starts_with_bfo(coherent_owl):
+    from owl_tester import OwlTester
+    info = OwlTester().load_ontology_from_file(coherent_owl)
+    assert info["loaded"]
+    onto = info["ontology"]
+    imported = {o.base_iri for o in onto.imported_ontologies}
+    assert any("bfo" in iri for iri in imported)
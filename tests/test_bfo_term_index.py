@@ -0,0 +1,49 @@
+"""Tests for the BFO term index (fuzzy partial matches and autocomplete)."""
+
+import pytest
+
+from bfo import as_ui_dict
+from bfo.term_index import TermIndex, normalize_term
+from bfo_2020_definitions import BFO_2020_RELATIONS
+
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    return TermIndex.from_vocab(as_ui_dict(catalog), BFO_2020_RELATIONS)
+
+
+def _scan(classes, relations, term):
+    """The linear bidirectional substring scan the index replaces (on normalized
+    keys, so zero-dimensional and zero_dimensional agree)."""
+    return {k for vocab in (classes, relations) for k in vocab
+            if term in normalize_term(k) or normalize_term(k) in term}
+
+
+def test_partial_matches_agree_with_the_substring_scan(index, catalog):
+    classes = as_ui_dict(catalog)
+    keys = list(classes) + list(BFO_2020_RELATIONS)
+    terms = {k[i:i + n] for k in keys for n in (1, 4, 7) for i in range(len(k))}
+    terms |= {"wing_quality", "flightprocess", "roles", "zzz"}
+    for term in sorted(terms):
+        got = {m.key for m in index.partial_matches(term)}
+        assert got == _scan(classes, BFO_2020_RELATIONS, normalize_term(term)), term
+
+
+def test_partial_matches_rank_best_first(index):
+    ranked = [m.key for m in index.partial_matches("part")]
+    assert ranked[:2] == ["part_of", "has_part"]
+    (best,) = index.partial_matches("realizable", limit=1)
+    assert (best.key, best.kind) == ("realizable_entity", "class")
+    # A local BFO ID resolves exactly; a fragment of one matches nothing.
+    assert [m.key for m in index.partial_matches("BFO_0000015")] == ["process"]
+    assert index.partial_matches("0000") == []
+
+
+def test_complete_prefers_prefixes_and_filters_kind(index):
+    keys = [m.key for m in index.complete("spatial", limit=3)]
+    assert keys[0] == "spatial_region"
+    assert all(k.startswith("spatial") for k in keys)
+    rels = index.complete("part", kind="relation")
+    assert rels and all(m.kind == "relation" for m in rels)
+    assert index.complete("temporal region")[0].key == "temporal_region"
+    assert index.complete("") == []
@@ -0,0 +1,60 @@
+"""Tests for the precompiled clausal form of the BFO-2020 background."""
+
+import re
+import shutil
+
+import pytest
+
+import clif_theory as ct
+from bfo import clif_signature as sig
+from clif_clausal import clausify_axioms
+from clif_lexer import parse
+
+
+def _clauses(clif_src):
+    clauses, formulas = clausify_axioms(parse(clif_src))
+    assert formulas == []
+    return clauses
+
+
+def test_implication_becomes_one_clause():
+    assert _clauses("(forall (x t) (if (instance-of x role t) (entity x)))") == \
+        ["entity(X1) | -instance_of(X1,role,X2)."]
+
+
+def test_existential_is_skolemized_over_enclosing_universals():
+    out = _clauses("(forall (x) (if (particular x) (exists (t) (exists-at x t))))"
+                   "(exists (u) (universal u))")
+    assert out == ["exists_at(X1,bfo_sk1(X1)) | -particular(X1).",
+                   "universal(bfo_sk2)."]
+
+
+def test_iff_and_negated_equality():
+    assert _clauses("(forall (x y) (iff (entity x) (not (= x y))))") == \
+        ["X1 != X2 | -entity(X1).", "X1 = X2 | entity(X1)."]
+
+
+def test_vendored_theory_clausifies_to_mapped_symbols():
+    text = ct.render_prover9_theory(clausal=True)
+    assert text is ct.render_prover9_theory(clausal=True)
+    assert text is not ct.render_prover9_theory()
+    assert "clauses(assumptions)." in text
+    body = [ln for ln in text.splitlines() if ln.startswith("  ")]
+    assert len(body) > len(list(ct.iter_axioms(ct.load_clif())))
+    mapped = {sig.to_prover9_symbol(p) for p in sig.PREDICATES}
+    called = set(re.findall(r"\b([a-z][a-z0-9_]*)\(", "\n".join(body)))
+    assert {c for c in called if not c.startswith("bfo_sk")} <= mapped
+    # Every vendored axiom fits the per-axiom CNF bound: no formulas left over.
+    assert "formulas(assumptions)." not in text
+    assert not any("->" in ln or re.search(r"\b(all|exists) [A-Z]", ln) for ln in body)
+
+
+@pytest.mark.skipif(shutil.which("mace4") is None,
+                    reason="mace4 binary not installed")
+def test_clausal_background_alone_has_a_model():
+    import subprocess
+
+    proc = subprocess.run(
+        ["mace4", "-n", "2"], input=ct.render_prover9_theory(clausal=True),
+        capture_output=True, text=True, timeout=120)
+    assert re.search(r"Exiting with \d+ model", proc.stdout or ""), proc.stdout[-2000:]
@@ -93,3 +93,48 @@ def test_outdiscourse_and_comments_are_not_axioms():
     )
     axioms = list(iter_axioms(forms))
     assert axioms == [["universal", "role"]]
+
+
+# -- Regex lexer, explicit-stack parser, streaming ---------------------------
+
+_EDGE_CASES = [
+    r"(a 'x\'y' " + '"q\\\\" ;;c' + "\n b)",
+    "'unterminated \\",
+    "a;;b ;;c\n; ;x",
+    "'ab\ncd' x\\y a'b'c",
+    "(a) ;; trailing comment",
+]
+
+
+def test_regex_lexer_matches_the_charwise_reference():
+    from clif_lexer import _tokenize_charwise
+    with open("bfo/bfo-2020.clif", encoding="utf-8") as fh:
+        text = fh.read()
+    for sample in _EDGE_CASES + [text]:
+        new, old = tokenize(sample), _tokenize_charwise(sample)
+        assert new == old
+        assert [type(t) for t in new] == [type(t) for t in old]
+
+
+def test_deep_nesting_does_not_hit_the_recursion_limit():
+    depth = 100000
+    (form,) = parse("(" * depth + "x" + ")" * depth)
+    for _ in range(depth - 1):
+        (form,) = form
+    assert form == ["x"]
+
+
+def test_quoted_paren_is_a_literal_not_a_list():
+    assert parse("(cl:comment '(' x)") == [["cl:comment", "(", "x"]]
+    assert isinstance(parse("(a '(')")[0][1], CLString)
+
+
+def test_iter_forms_streams_the_same_forms():
+    import io
+    from clif_lexer import iter_forms
+    with open("bfo/bfo-2020.clif", encoding="utf-8") as fh:
+        text = fh.read()
+    assert list(iter_forms(io.StringIO(text), chunk_size=7)) == parse(text)
+    for sample in _EDGE_CASES:
+        for size in (1, 2, 5):
+            assert list(iter_forms(io.StringIO(sample), chunk_size=size)) == parse(sample)
@@ -70,6 +70,54 @@ def test_translation_is_cached_per_path():
     assert a is b
 
 
+def _fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("OWLTESTER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ct, "_THEORY_CACHE", {})
+    monkeypatch.setattr(ct, "_ARTIFACTS", {})
+
+
+def test_artifact_serves_a_new_process_without_parsing(tmp_path, monkeypatch):
+    _fresh_cache(tmp_path, monkeypatch)
+    text = ct.render_prover9_theory()
+    (artifact,) = tmp_path.glob("clif-*.json")
+
+    # A new process: nothing in memory, and the CLIF file is never parsed.
+    _fresh_cache(tmp_path, monkeypatch)
+    monkeypatch.setattr(ct, "load_clif", lambda *a: pytest.fail("CLIF re-parsed"))
+    assert ct.render_prover9_theory() == text
+    axioms = ct.load_axioms()
+    assert len(axioms) == len(_body_lines(text))
+    assert list(tmp_path.glob("clif-*.json")) == [artifact]
+
+
+def test_artifact_is_keyed_on_clif_content_and_signature(tmp_path, monkeypatch):
+    _fresh_cache(tmp_path, monkeypatch)
+    src = tmp_path / "t.clif"
+    src.write_text("(forall (x t) (if (instance-of x continuant t) (entity x)))")
+    first = ct.render_prover9_theory(str(src))
+
+    src.write_text("(forall (x t) (if (instance-of x occurrent t) (entity x)))")
+    monkeypatch.setattr(ct, "_THEORY_CACHE", {})
+    second = ct.render_prover9_theory(str(src))
+    assert "occurrent" in second and first != second
+
+    monkeypatch.setattr(sig, "SIGNATURE_VERSION", sig.SIGNATURE_VERSION + 1)
+    monkeypatch.setattr(ct, "_THEORY_CACHE", {})
+    ct.render_prover9_theory(str(src))
+    assert len(list(tmp_path.glob("clif-*.json"))) == 3
+
+
+def test_corrupt_artifact_is_rebuilt(tmp_path, monkeypatch):
+    _fresh_cache(tmp_path, monkeypatch)
+    src = tmp_path / "t.clif"
+    src.write_text("(forall (x t) (if (instance-of x continuant t) (entity x)))")
+    text = ct.render_prover9_theory(str(src))
+    (artifact,) = tmp_path.glob("clif-*.json")
+    artifact.write_text("{truncated")
+    _fresh_cache(tmp_path, monkeypatch)
+    assert ct.render_prover9_theory(str(src)) == text
+
+
 # -- structural rendering of individual forms --------------------------------
 
 def _render_one(clif_src):
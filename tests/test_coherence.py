@@ -1,7 +1,8 @@
 """End-to-end coherence tests (SPEC Task 2).
 
-These exercise the in-process Pellet path, so they require a Java runtime and are
-skipped when Java is absent (the catalog and lint tests still run).
+The end-to-end tests exercise the in-process Pellet path, so they require a Java
+runtime and are skipped when Java is absent (the catalog and lint tests still run).
+The deferred-load tests never reach Pellet and run everywhere.
 """
 
 from tests.conftest import requires_java
@@ -39,3 +40,95 @@ def test_coherent_fixture_is_coherent(coherent_owl):
     assert result["coherence_status"] == "coherent"
     assert result["unsatisfiable_classes"] == []
     assert result["lint_findings"] == []
+
+
+def test_lazy_ontology_not_loaded_off_the_pellet_route(coherent_owl, monkeypatch):
+    """Off the Pellet route the owlready2 World is never built."""
+    from owl_tester import OwlTester
+
+    # A zero in-process budget and no external reasoner: the ontology (in RL)
+    # goes to the RL rules, which work on the rdflib graph.
+    monkeypatch.setenv("MAX_CLASSES_FOR_REASONING", "0")
+    monkeypatch.setenv("EXTERNAL_REASONER", "none")
+    tester = OwlTester()
+    handle = tester.lazy_ontology(coherent_owl)
+    result = tester.analyze_ontology(handle, file_path=coherent_owl)
+
+    assert handle.loaded is False
+    assert result["reasoning_methodology"]["reasoner_routing"]["route"] == "rl"
+    assert result["classes"] > 0
+
+
+def test_lazy_ontology_load_failure_skips_reasoner(coherent_owl, monkeypatch):
+    """A deferred load that fails is reported as a skip, reusing the parsed graph."""
+    from owl_tester import OwlTester
+
+    seen = {}
+
+    def failing_load(self, path, graph=None):
+        seen["graph"] = graph
+        return {"loaded": False, "error": "boom"}
+
+    monkeypatch.setattr(OwlTester, "load_ontology_from_file", failing_load)
+    tester = OwlTester()
+    handle = tester.lazy_ontology(coherent_owl)
+    result = tester.analyze_ontology(handle, file_path=coherent_owl)
+
+    assert handle.loaded is True
+    assert seen["graph"] is not None
+    assert result["coherence_status"] == "unknown"
+    assert result["reasoning_methodology"]["reasoning_skipped_reason"] == "ontology_load_failed"
+
+
+_DEFINED_CLASS_OWL = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:owl="http://www.w3.org/2002/07/owl#"
+         xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#">
+  <owl:Ontology rdf:about="http://example.org/def"/>
+  <owl:ObjectProperty rdf:about="http://example.org/def#hasPart"/>
+  <owl:Class rdf:about="http://example.org/def#Rotor"/>
+  <owl:Class rdf:about="http://example.org/def#Rotorcraft">
+    <owl:equivalentClass>
+      <owl:Restriction>
+        <owl:onProperty rdf:resource="http://example.org/def#hasPart"/>
+        <owl:someValuesFrom rdf:resource="http://example.org/def#Rotor"/>
+      </owl:Restriction>
+    </owl:equivalentClass>
+  </owl:Class>
+  <owl:Class rdf:about="http://example.org/def#Helicopter">
+    <rdfs:subClassOf>
+      <owl:Restriction>
+        <owl:onProperty rdf:resource="http://example.org/def#hasPart"/>
+        <owl:someValuesFrom rdf:resource="http://example.org/def#Rotor"/>
+      </owl:Restriction>
+    </rdfs:subClassOf>
+  </owl:Class>
+</rdf:RDF>
+"""
+
+
+def test_subclass_pairs_reads_asserted_hierarchy(coherent_owl):
+    """The quadstore snapshot holds the ontology's own named subclass edges."""
+    from owl_tester import OwlTester
+
+    tester = OwlTester()
+    onto = tester.load_ontology_from_file(coherent_owl)["ontology"]
+    pairs = tester._subclass_pairs(onto)
+    iris = {(onto.world._unabbreviate(s), onto.world._unabbreviate(o)) for s, o in pairs}
+    assert ("http://example.org/aero#Wing",
+            "http://purl.obolibrary.org/obo/BFO_0000040") in iris
+    assert len(pairs) == 2
+
+
+@requires_java
+def test_reasoner_diff_reports_new_subclass(tmp_path):
+    """A defined-class subsumption Pellet adds shows up in the pre/post diff."""
+    from owl_tester import OwlTester
+
+    path = tmp_path / "defined.owl"
+    path.write_text(_DEFINED_CLASS_OWL)
+    tester = OwlTester()
+    onto = tester.load_ontology_from_file(str(path))["ontology"]
+    _, _, _, inferred, skipped, _ = tester._try_reasoner_with_budget(onto)
+    assert skipped is None
+    assert [a["description"] for a in inferred] == ["Helicopter ⊑ Rotorcraft"]
@@ -4,7 +4,7 @@ The ROBOT integration itself needs the robot CLI (present in the Docker image,
 not in dev), so here we test the output parsing against captured real ROBOT logs.
 """
 
-from external_reasoner import extract_unsatisfiable
+from external_reasoner import bfo_class_axioms, extract_unsatisfiable, iter_inferred_axioms
 
 # Real ROBOT 1.9.6 output captured from `robot merge ... reason --reasoner ELK`
 ROBOT_OUTPUT_TWO = """\
@@ -35,3 +35,43 @@ def test_dedupes_and_skips_nothing():
     )
     found = extract_unsatisfiable(text)
     assert [f["iri"] for f in found] == ["http://x#A"]
+
+
+# Shape of `robot reason --create-new-ontology true --output x.ofn`.
+ROBOT_INFERRED_OFN = """\
+Prefix(:=<http://example.org/x#>)
+Prefix(obo:=<http://purl.obolibrary.org/obo/>)
+Prefix(owl:=<http://www.w3.org/2002/07/owl#>)
+
+
+Ontology(
+Declaration(Class(:Helicopter))
+SubClassOf(:Helicopter :Rotorcraft)
+SubClassOf(:Rotor obo:BFO_0000040)
+SubClassOf(<http://other.org/A> owl:Thing)
+SubClassOf(Annotation(:note "x") :A :B)
+SubClassOf(:Wing ObjectSomeValuesFrom(:partOf :Aircraft))
+EquivalentClasses(:Lift :Lifting :Uplift)
+)
+"""
+
+
+def test_streams_named_inferred_axioms(tmp_path):
+    path = tmp_path / "inferred.ofn"
+    path.write_text(ROBOT_INFERRED_OFN)
+    x = "http://example.org/x#"
+    assert list(iter_inferred_axioms(str(path))) == [
+        ("SubClassOf", x + "Helicopter", x + "Rotorcraft"),
+        ("SubClassOf", x + "Rotor", "http://purl.obolibrary.org/obo/BFO_0000040"),
+        ("SubClassOf", "http://other.org/A", "http://www.w3.org/2002/07/owl#Thing"),
+        ("EquivalentClass", x + "Lift", x + "Lifting"),
+        ("EquivalentClass", x + "Lift", x + "Uplift"),
+    ]
+
+
+def test_bfo_class_axioms_are_cached(catalog):
+    axioms = bfo_class_axioms(catalog.owl_path)
+    assert bfo_class_axioms(catalog.owl_path) is axioms
+    obo = "http://purl.obolibrary.org/obo/"
+    # role ⊑ realizable entity is asserted in BFO 2020.
+    assert ("SubClassOf", obo + "BFO_0000023", obo + "BFO_0000017") in axioms
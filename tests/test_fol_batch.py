@@ -0,0 +1,105 @@
+"""Tests for batch FOL expression validation (fol_batch.py)."""
+
+import io
+import json
+
+import pytest
+
+from fol_batch import result_row, validate_batch
+
+
+def _formulas(n):
+    return [f"all X all T (instance_of(X,c{i},T) -> instance_of(X,quality,T))."
+            for i in range(n)]
+
+
+def test_inline_batch_matches_single_validation():
+    out = list(validate_batch(_formulas(3) + ["all x.("], syntax="prover9", workers=1))
+    assert [index for index, *_ in out] == [0, 1, 2, 3]
+    _, raw, internal, result = out[0]
+    assert internal.startswith("all X.all T.")
+    assert result["format_detected"] == "prover9"
+    assert result["parsed"] is True
+    assert out[3][3]["parsed"] is False
+
+
+def test_pooled_batch_covers_every_formula_once():
+    formulas = _formulas(300)
+    pooled = {i: r for i, _, _, r in validate_batch(formulas, syntax="prover9", workers=2)}
+    inline = {i: r for i, _, _, r in validate_batch(formulas, syntax="prover9", workers=1)}
+    assert sorted(pooled) == list(range(300))
+    assert pooled == inline
+
+
+def test_result_row_maps_result_to_columns():
+    row = result_row("p(a)", {"valid": True, "issues": [], "non_bfo_terms": ["p"]}, 7)
+    assert row["expression"] == "p(a)" and row["is_valid"] is True
+    assert row["non_bfo_terms"] == ["p"] and row["user_id"] == 7
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """The Flask app on a throwaway SQLite database."""
+    db_path = tmp_path_factory.mktemp("db") / "batch.db"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+        mp.setenv("WARM_START", "0")
+        from app import app
+    return app.test_client()
+
+
+def _stream(response):
+    assert response.status_code == 200 and response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return lines[:-1], lines[-1]
+
+
+def _saved():
+    from app import app
+    from models import FOLExpression
+    with app.app_context():
+        return FOLExpression.query.count()
+
+
+def test_endpoint_streams_json_and_text_batches(client):
+    before = _saved()
+    results, done = _stream(client.post("/api/test-expressions",
+                                        json={"expressions": _formulas(2), "syntax": "prover9"}))
+    assert sorted(r["index"] for r in results) == [0, 1]
+    assert done["done"] and (done["total"], done["saved"]) == (2, 2)
+
+    text = "formulas(assumptions).\n" + "\n".join(_formulas(3)) + "\nend_of_list.\n"
+    results, done = _stream(client.post("/api/test-expressions", json={"text": text}))
+    assert (done["syntax"], done["total"], done["saved"]) == ("prover9", 3, 3)
+    assert all(r["result"]["format_detected"] == "prover9" for r in results)
+    assert _saved() == before + 5
+
+
+def test_endpoint_reads_p9_and_clif_uploads(client):
+    p9 = "formulas(assumptions).\n" + "\n".join(_formulas(2)) + "\nend_of_list.\n"
+    _, done = _stream(client.post("/api/test-expressions", content_type="multipart/form-data",
+                                  data={"file": (io.BytesIO(p9.encode()), "axioms.p9")}))
+    assert (done["syntax"], done["total"]) == ("prover9", 2)
+
+    clif = "(forall (x t) (if (instance_of x quality t) (exists_at x t)))\n(cl:comment 'c' (p a))"
+    results, done = _stream(client.post("/api/test-expressions", content_type="multipart/form-data",
+                                        data={"file": (io.BytesIO(clif.encode()), "axioms.clif")}))
+    assert (done["syntax"], done["total"]) == ("clif", 2)
+    assert results[0]["result"]["format_detected"] == "clif"
+
+    response = client.post("/api/test-expressions", content_type="multipart/form-data",
+                           data={"file": (io.BytesIO(b"x"), "axioms.docx")})
+    assert response.status_code == 400
+
+
+def test_disconnect_keeps_the_rows_already_streamed(client, monkeypatch):
+    monkeypatch.setattr("app.FOL_BATCH_FLUSH", 2)
+    before = _saved()
+    response = client.post("/api/test-expressions",
+                           json={"expressions": _formulas(5), "syntax": "prover9"},
+                           buffered=False)
+    stream = iter(response.response)
+    for _ in range(3):
+        next(stream)
+    response.close()
+    assert _saved() == before + 3
@@ -90,3 +90,31 @@ def test_non_bfo_term_is_well_formed_not_invalid():
     assert r["valid"] is False
     assert r["issues"] == []            # non-BFO term is not a blocking issue
     assert any("force" in n for n in r["notes"])
+
+
+# -- split_formulas (batch mode) ---------------------------------------------
+
+def test_split_prover9_document():
+    from fol_input import split_formulas
+    text = ("% header\nset(prolog_style_variables).\nformulas(assumptions).\n"
+            "  all X (p(X) -> q(X)).\n  exists T r(a, T).\nend_of_list.\n"
+            "formulas(goals). all X q(X). end_of_list.\n")
+    assert split_formulas(text) == (
+        ["all X (p(X) -> q(X)).", "exists T r(a, T).", "all X q(X)."], "prover9")
+
+
+def test_split_clif_document_unwraps_text_and_skips_prose():
+    from fol_input import split_formulas
+    text = ("(cl:text bfo (cl:comment 'a (quoted) remark' "
+            "(forall (x t) (if (instance_of x f t) (instance_of x q t)))) (entity a))")
+    formulas, syntax = split_formulas(text)
+    assert syntax == "clif"
+    assert formulas == ["(forall (x t) (if (instance_of x f t) (instance_of x q t)))",
+                        "(entity a)"]
+    assert _parses(prepare_expression(formulas[0], "clif")[0])
+
+
+def test_split_lines_skips_blanks_and_comments():
+    from fol_input import split_formulas
+    assert split_formulas("instance_of(x, Quality, t)\n\n# note\nContinuant(x)\n") == (
+        ["instance_of(x, Quality, t)", "Continuant(x)"], "lines")
@@ -0,0 +1,69 @@
+"""Tests for the LRU parse cache behind OwlTester's expression checks."""
+
+from nltk.sem.logic import LogicalExpressionException, LogicParser
+
+from fol_parse_cache import ParseCache, normalize_expression_key
+
+
+def _counting_parser():
+    calls = []
+    lp = LogicParser()
+
+    def parse(text):
+        calls.append(text)
+        return lp.parse(text)
+
+    return parse, calls
+
+
+def test_one_parse_serves_terms_and_free_variables():
+    parse, calls = _counting_parser()
+    cache = ParseCache(parse, lambda s: ["quality"], maxsize=8)
+    first = cache.get("all x.(instance_of(x, quality, t))")
+    again = cache.get("all  x.(instance_of(x,\n quality, t))")
+    assert again is first and len(calls) == 1
+    assert first.free_variables == ("t",)
+    assert first.terms == ("quality",)
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "maxsize": 8}
+
+
+def test_parse_errors_are_cached_and_reraised():
+    parse, calls = _counting_parser()
+    cache = ParseCache(parse, lambda s: [], maxsize=8)
+    for _ in range(3):
+        entry = cache.get("all x.(")
+        assert entry.expression is None and entry.free_variables == ()
+        try:
+            entry.raise_error()
+        except LogicalExpressionException:
+            pass
+        else:
+            raise AssertionError("cached parse error was not re-raised")
+    assert len(calls) == 1
+
+
+def test_lru_eviction_and_disabled_cache():
+    parse, calls = _counting_parser()
+    cache = ParseCache(parse, lambda s: [], maxsize=2)
+    for text in ("p(a)", "q(a)", "p(a)", "r(a)", "q(a)"):
+        cache.get(text)
+    # p(a) was refreshed before r(a) arrived, so q(a) was the one evicted.
+    assert calls == ["p(a)", "q(a)", "r(a)", "q(a)"]
+    assert cache.stats()["evictions"] == 2
+
+    off = ParseCache(parse, lambda s: [], maxsize=0)
+    off.get("p(a)")
+    off.get("p(a)")
+    assert off.stats()["size"] == 0 and off.stats()["misses"] == 2
+
+
+def test_owl_tester_parses_a_repeated_expression_once():
+    from owl_tester import OwlTester
+    tester = OwlTester()
+    expr = "all x.all t.(instance_of(x, quality, t) -> instance_of(x, continuant, t))"
+    first = tester.test_expression(expr)
+    assert tester.test_expression(expr) == first
+    assert tester.detect_free_variables(expr) == []
+    assert sorted(tester.extract_terms(expr)) == ["continuant", "quality"]
+    assert tester.parse_cache.stats()["misses"] == 1
+    assert normalize_expression_key(" a \n b ") == "a b"
@@ -0,0 +1,55 @@
+"""Tests for the on-disk inferred-closure export and its Range-aware download."""
+
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+from inference_export import (export_path, remove_inference_export, send_inference_export,
+                              write_inference_export)
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("INFERENCE_EXPORT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _inferred(n):
+    return [{"type": "SubClassOf", "description": f"C{i} ⊑ Root",
+             "derivation": {"origin": "ROBOT/ELK"}} for i in range(n)]
+
+
+def test_export_holds_every_axiom(export_dir):
+    summary = write_inference_export(7, _inferred(12000))
+    assert summary["file"] == "analysis-7-inferred.ndjson.gz"
+    assert (summary["axioms"], summary["by_type"]) == (12000, {"SubClassOf": 12000})
+    with gzip.open(export_dir / summary["file"], "rt", encoding="utf-8") as fh:
+        lines = [json.loads(line) for line in fh]
+    assert len(lines) == 12000
+    assert lines[-1] == {"type": "SubClassOf", "description": "C11999 ⊑ Root",
+                         "subject": "C11999", "object": "Root", "origin": "ROBOT/ELK"}
+    # Reproducible bytes: a rewrite gives the same digest.
+    assert write_inference_export(7, _inferred(12000))["sha256"] == summary["sha256"]
+
+
+def test_export_path_rejects_foreign_names():
+    assert export_path({"file": "../owl_tester.db"}) is None
+    assert export_path({"file": "analysis-1-inferred.ndjson.gz"}) is None
+    assert export_path(None) is None
+
+
+def test_download_supports_range_requests():
+    summary = write_inference_export(3, _inferred(500))
+    app = Flask(__name__)
+    with app.test_request_context(headers={"Range": "bytes=0-99"}):
+        resp = send_inference_export(summary, "x.ndjson.gz")
+        assert resp.status_code == 206
+        assert resp.headers["Content-Range"] == f"bytes 0-99/{summary['bytes']}"
+        assert resp.headers["X-Axiom-Count"] == "500"
+        resp.direct_passthrough = False
+        assert len(resp.get_data()) == 100
+
+    remove_inference_export(summary)
+    assert export_path(summary) is None
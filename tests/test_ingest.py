@@ -0,0 +1,153 @@
+"""Tests for upload ingestion and the binary graph snapshot (ingest.py)."""
+
+import hashlib
+import io
+import os
+
+import pytest
+import rdflib
+
+import ingest
+
+_TTL = b"""@prefix : <http://example.org/aero#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+:Wing a owl:Class ; rdfs:label "wing"@en ; rdfs:comment "lift \\"surface\\""^^<http://www.w3.org/2001/XMLSchema#string> ;
+    rdfs:subClassOf [ a owl:Restriction ; owl:onProperty :partOf ; owl:someValuesFrom :Aircraft ] .
+:Aircraft a owl:Class ; :span 42 .
+"""
+
+
+def _ground(graph):
+    return {t for t in graph if not any(isinstance(x, rdflib.BNode) for x in t)}
+
+
+def test_sniff_format():
+    assert ingest.sniff_format(b'<?xml version="1.0"?>\n<rdf:RDF xmlns:rdf="x">') == "xml"
+    assert ingest.sniff_format(
+        b'<?xml version="1.0"?>\n<Ontology xmlns="http://www.w3.org/2002/07/owl#">') == "owlxml"
+    assert ingest.sniff_format(b"\xef\xbb\xbf@prefix : <x#> .") == "turtle"
+    assert ingest.sniff_format(b"# c\nPrefix(:=<x#>)\nOntology(<x>)") == "ofn"
+    assert ingest.sniff_format(b"<http://a> <http://b> <http://c> .") == "nt"
+    assert ingest.sniff_format(b'{"@context": {}}') == "json-ld"
+    assert ingest.sniff_format(b"", "onto.n3") == "n3"
+
+
+def test_iri_led_turtle_falls_back_to_the_extension_format(tmp_path):
+    ttl = (b"<http://example.org/o> a <http://www.w3.org/2002/07/owl#Ontology> ;\n"
+           b"    <http://www.w3.org/2000/01/rdf-schema#label> \"o\" .\n"
+           b"<http://example.org/o#A> a <http://www.w3.org/2002/07/owl#Class> .\n")
+    assert ingest.sniff_format(ttl, "o.ttl") == "nt"  # the head alone is ambiguous
+    out = ingest.ingest_upload(io.BytesIO(ttl), str(tmp_path), "o", "o.ttl")
+    assert (out.format, out.triples, out.path) == ("turtle", 3, str(tmp_path / "o.owl"))
+    assert out.snapshot and os.path.exists(out.snapshot)
+
+    rdfxml = (b'<RDF xmlns="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+              b'xmlns:owl="http://www.w3.org/2002/07/owl#">'
+              b'<owl:Class about="http://example.org/o#A"/></RDF>')
+    assert ingest.sniff_format(rdfxml, "o.rdf") == "xml"
+
+
+def test_turtle_upload_is_converted_hashed_and_snapshotted(tmp_path):
+    out = ingest.ingest_upload(io.BytesIO(_TTL), str(tmp_path), "abc", "aero.ttl")
+    assert out.path == str(tmp_path / "abc.owl")
+    assert (out.format, out.size) == ("turtle", len(_TTL))
+    assert out.sha256 == hashlib.sha256(_TTL).hexdigest()
+    assert out.snapshot == out.path + ".snap" and os.path.exists(out.snapshot)
+    assert sorted(os.listdir(tmp_path)) == ["abc.owl", "abc.owl.snap"]
+
+    parsed = rdflib.Graph().parse(out.path, format="xml")
+    loaded = ingest.load_graph(out.path)
+    assert len(loaded) == len(parsed) == out.triples
+    assert _ground(loaded) == _ground(parsed)
+    assert str(dict(loaded.namespaces()).get("rdfs")) == str(rdflib.RDFS)
+
+
+def test_stale_or_missing_snapshot_falls_back_to_parsing(tmp_path, monkeypatch):
+    out = ingest.ingest_upload(io.BytesIO(_TTL), str(tmp_path), "abc", "aero.ttl")
+    with open(out.path, "a") as fh:
+        fh.write("\n")  # size changes: the snapshot no longer describes the file
+    assert ingest._read_snapshot(out.path) is None
+    assert len(ingest.load_graph(out.path)) == out.triples
+    ingest.remove_snapshot(out.path)
+    assert not os.path.exists(out.snapshot)
+    assert len(ingest.load_graph(out.path)) == out.triples
+
+
+def test_owlready_is_fed_from_the_snapshot(tmp_path):
+    owlready2 = pytest.importorskip("owlready2")
+    out = ingest.ingest_upload(io.BytesIO(_TTL), str(tmp_path), "abc", "aero.ttl")
+    buf = io.BytesIO()
+    assert ingest.write_ntriples(out.path, buf) == out.triples
+    reparsed = rdflib.Graph().parse(data=buf.getvalue(), format="nt")
+    assert _ground(reparsed) == _ground(rdflib.Graph().parse(out.path, format="xml"))
+
+    from_snapshot = ingest.load_owlready(out.path, owlready2.World())
+    from_file = owlready2.World().get_ontology(out.path).load()
+    assert from_snapshot.base_iri == from_file.base_iri
+    assert ({c.name for c in from_snapshot.classes()} == {c.name for c in from_file.classes()}
+            == {"Wing", "Aircraft"})
+    assert from_snapshot.search_one(iri="*#Wing").comment == ['lift "surface"']
+
+    ingest.remove_snapshot(out.path)
+    assert ingest.write_ntriples(out.path, io.BytesIO()) is None
+    assert ingest.load_owlready(out.path, owlready2.World()).search_one(iri="*#Wing")
+
+
+def test_unparseable_and_empty_uploads(tmp_path):
+    owx = (b'<?xml version="1.0"?>\n<Ontology xmlns="http://www.w3.org/2002/07/owl#" '
+           b'ontologyIRI="http://example.org/x"/>\n')
+    out = ingest.ingest_upload(io.BytesIO(owx), str(tmp_path), "f", "x.owx")
+    assert (out.format, out.triples, out.snapshot) == ("owlxml", None, None)
+    with open(out.path, "rb") as fh:
+        assert fh.read() == owx
+
+    with pytest.raises(ingest.IngestError):
+        ingest.ingest_upload(io.BytesIO(b""), str(tmp_path), "e", "e.owl")
+    with pytest.raises(ingest.IngestError):
+        ingest.ingest_upload(io.BytesIO(_TTL), str(tmp_path), "big", "b.ttl", max_bytes=10)
+    assert sorted(os.listdir(tmp_path)) == ["f.owx"]
+
+
+@pytest.mark.parametrize("ext, compress", [
+    ("gz", lambda b: __import__("gzip").compress(b)),
+    ("bz2", lambda b: __import__("bz2").compress(b)),
+    ("xz", lambda b: __import__("lzma").compress(b)),
+])
+def test_compressed_upload_is_inflated_while_streaming(tmp_path, ext, compress):
+    out = ingest.ingest_upload(io.BytesIO(compress(_TTL)), str(tmp_path), "c", f"aero.ttl.{ext}")
+    assert (out.compression, out.format, out.size) == (ext, "turtle", len(_TTL))
+    assert out.sha256 == hashlib.sha256(_TTL).hexdigest()
+    assert out.path == str(tmp_path / "c.owl") and out.triples == len(ingest.load_graph(out.path))
+
+
+def test_zip_upload_takes_its_one_ontology_member(tmp_path):
+    import zipfile
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("README.md", "not an ontology")
+        zf.writestr("dist/aero.ttl", _TTL)
+    buf.seek(0)
+    out = ingest.ingest_upload(buf, str(tmp_path), "z", "release.zip")
+    assert (out.compression, out.format, out.size) == ("zip", "turtle", len(_TTL))
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("a.owl", _TTL)
+        zf.writestr("b.owl", _TTL)
+    buf.seek(0)
+    with pytest.raises(ingest.IngestError, match="exactly one"):
+        ingest.ingest_upload(buf, str(tmp_path), "y", "two.zip")
+
+
+def test_decompressed_size_and_ratio_limits(tmp_path):
+    import gzip
+    bomb = gzip.compress(b"#" * (40 << 20))  # ~40 KiB inflating to 40 MiB
+    with pytest.raises(ingest.IngestError, match="decompression bomb"):
+        ingest.ingest_upload(io.BytesIO(bomb), str(tmp_path), "b", "bomb.ttl.gz")
+    with pytest.raises(ingest.IngestError, match="byte limit"):
+        ingest.ingest_upload(io.BytesIO(gzip.compress(_TTL)), str(tmp_path), "l", "a.ttl.gz",
+                             max_bytes=len(_TTL) - 1)
+    with pytest.raises(ingest.IngestError, match="Corrupt"):
+        ingest.ingest_upload(io.BytesIO(b"not gzip at all"), str(tmp_path), "x", "a.ttl.gz")
+    assert os.listdir(tmp_path) == []
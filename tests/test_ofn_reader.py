@@ -0,0 +1,111 @@
+"""Tests for the streaming OWL Functional Syntax reader (ofn_reader.py)."""
+
+import io
+
+import pytest
+import rdflib
+from rdflib import Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+import ofn_reader
+from ofn_reader import OFNSyntaxError
+
+EX = rdflib.Namespace("http://example.org/aero#")
+
+_DOC = r'''Prefix(:=<http://example.org/aero#>)
+Prefix(obo:=<http://purl.obolibrary.org/obo/>)
+# a comment with (parentheses) and "quotes"
+Ontology(<http://example.org/aero> <http://example.org/aero/1.0>
+Import(<http://purl.obolibrary.org/obo/bfo.owl>)
+Annotation(rdfs:comment "Aero \"test\" ontology"@en)
+Declaration(Class(:Wing))
+Declaration(ObjectProperty(:partOf))
+SubClassOf(Annotation(rdfs:comment "why") :Wing ObjectSomeValuesFrom(:partOf :Aircraft))
+EquivalentClasses(:Aircraft ObjectIntersectionOf(obo:BFO_0000040 ObjectMinCardinality(2 :hasPart :Wing)))
+DisjointClasses(:Wing :Aircraft :Engine)
+DisjointClasses(:Wing :Engine)
+SubObjectPropertyOf(ObjectPropertyChain(:partOf :partOf) :partOf)
+TransitiveObjectProperty(:partOf)
+DataPropertyRange(:span DatatypeRestriction(xsd:decimal xsd:minInclusive "0"^^xsd:decimal))
+HasKey(:Aircraft (:partOf) (:span))
+ClassAssertion(:Aircraft :a380)
+DataPropertyAssertion(:span :a380 "79.8"^^xsd:decimal)
+ObjectPropertyAssertion(ObjectInverseOf(:partOf) :a380 _:w1)
+NegativeObjectPropertyAssertion(:partOf :a380 _:w1)
+)
+'''
+
+
+def _one(graph, s=None, p=None, o=None):
+    found = list(graph.triples((s, p, o)))
+    assert len(found) == 1, found
+    return found[0]
+
+
+def test_axioms_map_to_owl_rdf():
+    g = ofn_reader.parse(_DOC)
+    onto = URIRef("http://example.org/aero")
+    assert (onto, RDF.type, OWL.Ontology) in g
+    assert (onto, OWL.versionIRI, URIRef("http://example.org/aero/1.0")) in g
+    assert (onto, RDFS.comment, Literal('Aero "test" ontology', lang="en")) in g
+    assert (EX.Wing, RDF.type, OWL.Class) in g
+    assert (EX.Wing, OWL.disjointWith, EX.Engine) in g
+    assert (EX.partOf, RDF.type, OWL.TransitiveProperty) in g
+    assert (EX.a380, RDF.type, EX.Aircraft) in g
+    assert (EX.a380, EX.span, Literal("79.8", datatype=XSD.decimal)) in g
+
+    _, _, some = _one(g, EX.Wing, RDFS.subClassOf)
+    assert (some, OWL.someValuesFrom, EX.Aircraft) in g
+    axiom, _, _ = _one(g, None, OWL.annotatedTarget, some)
+    assert (axiom, RDF.type, OWL.Axiom) in g and (axiom, RDFS.comment, Literal("why")) in g
+
+    _, _, inter = _one(g, EX.Aircraft, OWL.equivalentClass)
+    members = list(rdflib.collection.Collection(g, _one(g, inter, OWL.intersectionOf)[2]))
+    assert members[0] == URIRef("http://purl.obolibrary.org/obo/BFO_0000040")
+    assert (members[1], OWL.minQualifiedCardinality,
+            Literal("2", datatype=XSD.nonNegativeInteger)) in g
+    assert (members[1], OWL.onClass, EX.Wing) in g
+
+    all_disjoint, _, _ = _one(g, None, RDF.type, OWL.AllDisjointClasses)
+    assert list(rdflib.collection.Collection(g, _one(g, all_disjoint, OWL.members)[2])) == \
+        [EX.Wing, EX.Aircraft, EX.Engine]
+    chain = _one(g, EX.partOf, OWL.propertyChainAxiom)[2]
+    assert list(rdflib.collection.Collection(g, chain)) == [EX.partOf, EX.partOf]
+    assert list(rdflib.collection.Collection(g, _one(g, EX.Aircraft, OWL.hasKey)[2])) == \
+        [EX.partOf, EX.span]
+
+    wing, _, _ = _one(g, None, EX.partOf, EX.a380)  # the inverse assertion, flipped
+    assert isinstance(wing, rdflib.BNode)
+    negative, _, _ = _one(g, None, RDF.type, OWL.NegativePropertyAssertion)
+    assert (negative, OWL.targetIndividual, wing) in g  # _:w1 is one node
+    assert dict(g.namespaces())["obo"] == URIRef("http://purl.obolibrary.org/obo/")
+
+
+def test_streaming_is_independent_of_chunk_size():
+    expected = len(ofn_reader.parse(_DOC))
+    for chunk_size in (1, 2, 3, 7, 64):
+        triples = list(ofn_reader.iter_triples(io.StringIO(_DOC), chunk_size=chunk_size))
+        assert len(triples) == expected
+
+
+def test_converted_graph_loads_in_owlready2(tmp_path):
+    owlready2 = pytest.importorskip("owlready2")
+    path = tmp_path / "aero.owl"
+    doc = _DOC.replace("Import(<http://purl.obolibrary.org/obo/bfo.owl>)", "")
+    ofn_reader.parse(doc).serialize(destination=str(path), format="xml")
+    world = owlready2.World()
+    onto = world.get_ontology(f"file://{path}").load()
+    wing = onto.search_one(iri="http://example.org/aero#Wing")
+    assert any(isinstance(r, owlready2.Restriction) for r in wing.is_a)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("Ontology(SubClassOf(:A :B)", "unbalanced"),
+    ("Ontology(SubClassOf(foo:A :B))", "undeclared prefix"),
+    ('Ontology(AnnotationAssertion(rdfs:label :A "open))', "unterminated string"),
+    ("Ontology(Frobnicate(:A))", "unsupported axiom"),
+    ("Ontology())", r"unexpected '\)'"),
+])
+def test_malformed_input_raises(text, message):
+    with pytest.raises(OFNSyntaxError, match=message):
+        ofn_reader.parse("Prefix(:=<http://example.org/x#>)\n" + text)
@@ -0,0 +1,119 @@
+"""Tests for locality-based module extraction ahead of reasoning."""
+
+import rdflib
+from rdflib import URIRef
+
+from owl_modules import extract_module, reasoning_signature
+from rl_reasoner import load_bfo_graph, materialize, run_rl_materialize
+from tests.conftest import requires_java
+from tests.test_coherence import _DEFINED_CLASS_OWL
+
+# A vocabulary the defined-class ontology pulls in but never refers to.
+_UNUSED_VOCABULARY = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix voc: <http://example.org/vocab#> .
+
+voc:Vehicle a owl:Class ; rdfs:label "vehicle" .
+voc:Car a owl:Class ; rdfs:subClassOf voc:Vehicle .
+voc:Truck a owl:Class ; rdfs:subClassOf voc:Vehicle ;
+    rdfs:subClassOf [ a owl:Restriction ; owl:onProperty voc:hasWheel ;
+                      owl:someValuesFrom voc:Wheel ] .
+voc:Wheel a owl:Class .
+voc:hasWheel a owl:ObjectProperty .
+voc:Car owl:disjointWith voc:Truck .
+"""
+
+
+def _defined_with_vocabulary():
+    g = rdflib.Graph().parse(data=_DEFINED_CLASS_OWL, format="xml")
+    g.parse(data=_UNUSED_VOCABULARY, format="turtle")
+    return g
+
+
+def test_signature_is_the_ontologys_own_terms():
+    names = {str(e).rsplit("#", 1)[-1] for e in reasoning_signature(_defined_with_vocabulary())}
+    assert names == {"Helicopter", "Rotor", "Rotorcraft", "hasPart"}
+
+
+def test_unused_vocabulary_is_dropped():
+    g = _defined_with_vocabulary()
+    module = extract_module(g, reasoning_signature(g))
+    assert module.shrunk
+    assert not any("vocab" in str(t) for triple in module.graph for t in triple)
+    stats = module.to_dict()
+    assert (stats["method"], stats["axioms_in_module"]) == ("STAR", 2)
+
+
+def test_imported_classes_the_ontology_uses_stay_in_the_signature():
+    g = _defined_with_vocabulary()
+    g.parse(data="""
+        @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+        <http://example.org/def#Rotorcraft> rdfs:subClassOf <http://example.org/vocab#Truck> .
+    """, format="turtle")
+    names = {str(e).rsplit("#", 1)[-1] for e in reasoning_signature(g)}
+    assert "Truck" in names and "Car" not in names
+
+    ancestors, _ = materialize(extract_module(g, reasoning_signature(g)).graph)
+    assert URIRef("http://example.org/vocab#Truck") in \
+        ancestors[URIRef("http://example.org/def#Helicopter")]
+
+
+def test_module_keeps_bfo_disjointness_path(catalog):
+    bfo = load_bfo_graph(catalog.owl_path)
+    role = URIRef("http://purl.obolibrary.org/obo/BFO_0000023")
+    occurrent = URIRef("http://purl.obolibrary.org/obo/BFO_0000003")
+    star = extract_module(bfo, {role, occurrent})
+    bot = extract_module(bfo, {role, occurrent}, method="bot")
+    assert star.axioms_kept <= bot.axioms_kept < star.axioms_total
+    assert (None, rdflib.OWL.disjointWith, None) in star.graph
+    assert (role, rdflib.RDFS.subClassOf, None) in star.graph
+
+
+def test_module_preserves_inferences_and_unsatisfiability(straddle_owl, catalog):
+    bfo = load_bfo_graph(catalog.owl_path)
+    g = _defined_with_vocabulary()
+    out = run_rl_materialize(extract_module(g, reasoning_signature(g)).graph, bfo_graph=bfo)
+    assert [a["description"] for a in out["inferred_axioms"]] == ["Helicopter ⊑ Rotorcraft"]
+
+    g = rdflib.Graph().parse(straddle_owl)
+    out = run_rl_materialize(extract_module(g, reasoning_signature(g)).graph, bfo_graph=bfo)
+    assert [c["name"] for c in out["unsatisfiable_classes"]] == ["Force"]
+
+
+_KEYED = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix ex: <http://example.org/keys#> .
+
+ex:Person a owl:Class ; owl:hasKey ( ex:ssn ) .
+ex:ssn a owl:DatatypeProperty .
+ex:Vehicle a owl:Class ; owl:hasKey ( ex:vin ) .
+ex:vin a owl:DatatypeProperty .
+"""
+
+
+def test_haskey_is_an_axiom_with_its_list():
+    g = rdflib.Graph().parse(data=_KEYED, format="turtle")
+    ex = rdflib.Namespace("http://example.org/keys#")
+    module = extract_module(g, {ex.Person, ex.ssn})
+    keys = list(module.graph.objects(ex.Person, rdflib.OWL.hasKey))
+    assert len(keys) == 1
+    assert list(rdflib.collection.Collection(module.graph, keys[0])) == [ex.ssn]
+    assert (ex.Vehicle, rdflib.OWL.hasKey, None) not in module.graph
+
+
+@requires_java
+def test_pellet_reasons_over_the_module(tmp_path):
+    from owl_tester import OwlTester
+
+    path = tmp_path / "defined.ttl"
+    _defined_with_vocabulary().serialize(destination=str(path), format="turtle")
+    tester = OwlTester()
+    handle = tester.lazy_ontology(str(path))
+    result = tester.analyze_ontology(handle, file_path=str(path))
+
+    assert handle.loaded is False  # the module was loaded in its place
+    module = result["reasoning_methodology"]["module_extraction"]
+    assert module["applied"] is True
+    assert module["triples_out"] < module["triples_in"]
+    assert "Helicopter ⊑ Rotorcraft" in [a["description"] for a in result["inferred_axioms"]]
@@ -0,0 +1,129 @@
+"""Tests for OWL 2 profile detection, reasoner routing and the RL rule reasoner."""
+
+import rdflib
+
+from owl_profiles import choose_reasoner, detect_profiles
+from rl_reasoner import load_bfo_graph, materialize, run_rl_materialize
+from tests.test_coherence import _DEFINED_CLASS_OWL
+
+
+def _graph(path):
+    return rdflib.Graph().parse(path)
+
+
+def test_plain_hierarchy_is_in_every_profile(straddle_owl):
+    assert detect_profiles(_graph(straddle_owl))["profiles"] == ["EL", "QL", "RL"]
+
+
+def test_existential_superclass_is_el_only():
+    report = detect_profiles(rdflib.Graph().parse(data=_DEFINED_CLASS_OWL, format="xml"))
+    assert report["profiles"] == ["EL"]
+    assert "owl:someValuesFrom in superclass position" in report["violations"]["RL"]
+
+
+def test_bfo_is_outside_the_tractable_profiles(catalog):
+    report = detect_profiles(_graph(catalog.owl_path))
+    assert report["profiles"] == []
+    assert "uses owl:unionOf" in report["violations"]["EL"]
+
+
+def test_routing_table():
+    el = choose_reasoner(["EL"], 5000, max_classes=500)
+    assert (el.route, el.reasoner, el.complete) == ("robot", "ELK", True)
+    # BFO merged into ELK's input is outside EL: no completeness claim.
+    with_bfo = choose_reasoner(["EL"], 5000, max_classes=500, merged_profiles=())
+    assert (with_bfo.reasoner, with_bfo.complete) == ("ELK", False)
+    # A small EL ontology stays on Pellet, with or without ROBOT.
+    assert choose_reasoner(["EL"], 5, max_classes=500).route == "pellet"
+    assert choose_reasoner(["EL"], 100, robot_ok=False).route == "pellet"
+    # A 400-class SROIQ ontology costs 800 and leaves Pellet for HermiT.
+    dl = choose_reasoner([], 400, max_classes=500)
+    assert (dl.route, dl.reasoner) == ("robot", "HermiT")
+    huge = choose_reasoner([], 50000, max_classes=500)
+    assert (huge.reasoner, huge.complete) == ("ELK", False)
+    # RL past the budget goes to ROBOT+HermiT when it can; the RL rules are the
+    # no-JVM (or too-large) fallback and never claim completeness.
+    assert (choose_reasoner(["RL"], 1000, max_classes=500).reasoner) == "HermiT"
+    rl = choose_reasoner(["RL"], 1000, max_classes=500, robot_ok=False)
+    assert (rl.route, rl.complete) == ("rl", False)
+    assert choose_reasoner(["RL"], 5000, max_classes=500).route == "rl"
+    assert choose_reasoner([], 5000, external="none").route == "skip"
+
+
+def test_rl_rules_classify_defined_class(catalog):
+    g = rdflib.Graph().parse(data=_DEFINED_CLASS_OWL, format="xml")
+    out = run_rl_materialize(g, bfo_graph=load_bfo_graph(catalog.owl_path))
+    assert out["ran"] is True
+    assert [a["description"] for a in out["inferred_axioms"]] == ["Helicopter ⊑ Rotorcraft"]
+
+
+def test_rl_rules_find_straddle_unsatisfiable(straddle_owl, catalog):
+    out = run_rl_materialize(_graph(straddle_owl), bfo_graph=load_bfo_graph(catalog.owl_path))
+    assert [c["name"] for c in out["unsatisfiable_classes"]] == ["Force"]
+
+
+_CHAIN_TTL = """
+@prefix : <http://example.org/chain#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+:p rdfs:subPropertyOf :q .
+:A rdfs:subClassOf :B . :B rdfs:subClassOf :C . :C rdfs:subClassOf :A .
+:X owl:equivalentClass [ owl:onProperty :p ; owl:someValuesFrom :A ] .
+:Y owl:equivalentClass [ owl:onProperty :q ; owl:someValuesFrom :C ] .
+:Z owl:equivalentClass [ owl:onProperty :q ; owl:someValuesFrom :Y ] .
+:W rdfs:subClassOf [ owl:onProperty :p ; owl:someValuesFrom :X ] .
+"""
+
+
+def test_rl_rules_chain_through_rule_derived_edges():
+    g = rdflib.Graph().parse(data=_CHAIN_TTL, format="turtle")
+    ex = rdflib.Namespace("http://example.org/chain#")
+    anc, _ = materialize(g)
+    # The cycle A, B, C is one equivalence; scm-svf2 then gives X ⊑ Y, which
+    # in turn lets W (p some X) reach Z (q some Y).
+    assert anc[ex.A] == anc[ex.B] >= {ex.A, ex.B, ex.C}
+    assert ex.Y in anc[ex.X] and ex.Z in anc[ex.W]
+    out = run_rl_materialize(g, timeout_seconds=0)
+    assert out["ran"] is False and "exceeded 0s" in out["error"]
+
+
+_CLASH_TTL = """
+@prefix : <http://example.org/clash#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+<http://example.org/clash> a owl:Ontology .
+:p a owl:ObjectProperty .
+:A a owl:Class ; owl:disjointWith :B .
+:B a owl:Class .
+:C a owl:Class ; rdfs:subClassOf [ a owl:Restriction ; owl:onProperty :p ; owl:allValuesFrom :A ] .
+:i a owl:NamedIndividual, :A, :B .
+"""
+
+
+def test_rl_rules_refute_but_never_confirm_consistency(catalog):
+    bfo = load_bfo_graph(catalog.owl_path)
+    g = rdflib.Graph().parse(data=_CLASH_TTL, format="turtle")
+    assert detect_profiles(g)["profiles"] == ["RL"]
+    out = run_rl_materialize(g, bfo_graph=bfo)
+    assert out["consistent"] is False
+    assert out["consistency_issues"][0].startswith("cax-dw: i ")
+
+    g.remove((rdflib.URIRef("http://example.org/clash#i"), rdflib.RDF.type,
+              rdflib.URIRef("http://example.org/clash#B")))
+    assert run_rl_materialize(g, bfo_graph=bfo)["consistent"] is None
+
+
+def test_inconsistent_rl_ontology_is_never_reported_consistent(tmp_path, monkeypatch):
+    from owl_tester import OwlTester
+
+    monkeypatch.setenv("MAX_CLASSES_FOR_REASONING", "0")
+    monkeypatch.setenv("EXTERNAL_REASONER", "none")
+    path = tmp_path / "clash.ttl"
+    path.write_text(_CLASH_TTL)
+    tester = OwlTester()
+    result = tester.analyze_ontology(tester.lazy_ontology(str(path)), file_path=str(path))
+
+    assert result["reasoning_methodology"]["reasoner_routing"]["route"] == "rl"
+    assert result["is_consistent"] is False
+    assert result["coherence_status"] == "inconsistent"
+    assert result["consistency_issues"]
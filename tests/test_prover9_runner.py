@@ -9,9 +9,11 @@ import shutil
 import subprocess
 
 import pytest
+import rdflib
 
 from fol_export import build_theory, render_prover9
-from prover9_runner import cross_check, check_class_unsat, _goal_block
+from prover9_runner import (cross_check, check_class_unsat, certify_satisfiable, _goal_block,
+                            _joint_existence_block, schedule_goals, static_satisfiable)
 
 
 def test_cross_check_degrades_without_binary(straddle_owl, catalog, monkeypatch):
@@ -120,3 +122,145 @@ def test_relation_mediated_unsat_with_background(catalog):
     out = cross_check(theory, bfo_background=True, per_class_timeout=30)
     assert out["ran"] is True
     assert out["bfo_background"] is True
+
+
+# -- Batched Mace4 witness ---------------------------------------------------
+
+def _fake_mace4(unsat_syms):
+    """A _run stand-in: Mace4 finds a model unless the batch names an unsat class."""
+    calls = []
+
+    class Proc:
+        def __init__(self, rc):
+            self.returncode = rc
+            self.stdout = "Exiting with 1 model." if rc == 0 else "Exiting with failure."
+
+    def run(cmd, stdin_text, timeout):
+        assert cmd == ["mace4"]
+        calls.append(stdin_text)
+        return Proc(2 if any(f"X,{s}," in stdin_text for s in unsat_syms) else 0)
+
+    return run, calls
+
+
+def test_joint_existence_block_names_every_class():
+    block = _joint_existence_block([("wing", "continuant"), ("flight", "occurrent")])
+    assert "instance_of(X,wing,T)" in block
+    assert "instance_of_at(X,flight)" in block
+
+
+def test_certify_satisfiable_bisects_around_unsat_class(monkeypatch):
+    monkeypatch.setattr("prover9_runner.mace4_available", lambda: True)
+    run, calls = _fake_mace4({"force"})
+    monkeypatch.setattr("prover9_runner._run", run)
+    batch = [(s, "continuant") for s in ("a", "b", "force", "c", "d", "e", "f", "g")]
+    certified, uncertified, runs = certify_satisfiable("", batch)
+    assert sorted(certified) == ["a", "b", "d", "e", "f", "g"]
+    assert [s for s, _ in uncertified] == ["force", "c"]
+    assert runs == len(calls) == 5
+
+
+def test_cross_check_sends_only_uncertified_classes_to_prover(straddle_owl, catalog, monkeypatch):
+    monkeypatch.setattr("prover9_runner.prover9_available", lambda: True)
+    monkeypatch.setattr("prover9_runner.mace4_available", lambda: True)
+    run, _ = _fake_mace4(set())
+    monkeypatch.setattr("prover9_runner._run", run)
+    asked = []
+    monkeypatch.setattr("prover9_runner.check_class_unsat",
+                        lambda p9, sym, *a, **k: asked.append(sym) or "satisfiable")
+    theory = build_theory(file_path=straddle_owl, catalog=catalog)
+    theory.classes["http://example.org/aero#Wing"] = {
+        "sym": "wing", "kind": "continuant", "label": "Wing"}
+    out = cross_check(theory, reasoner_unsat_names=[], static_filter=False)
+    assert (out["witness_certified"], out["witness_runs"]) == (2, 1)
+    assert out["tested"] == 2
+    assert asked == []
+    assert out["agree"] is True
+
+
+# -- Static satisfiability pre-filter ----------------------------------------
+
+def test_static_filter_keeps_only_straddling_classes(straddle_owl, coherent_owl, catalog):
+    straddle = build_theory(file_path=straddle_owl, catalog=catalog)
+    force = next(i for i, c in straddle.classes.items() if c["label"] == "Force")
+    assert force not in static_satisfiable(straddle)
+    coherent = build_theory(file_path=coherent_owl, catalog=catalog)
+    assert static_satisfiable(coherent) == set(coherent.classes)
+
+
+def test_cross_check_skips_prover_for_statically_satisfiable(straddle_owl, catalog, monkeypatch):
+    monkeypatch.setattr("prover9_runner.prover9_available", lambda: True)
+    monkeypatch.setattr("prover9_runner.mace4_available", lambda: False)
+    asked = []
+    monkeypatch.setattr("prover9_runner.check_class_unsat",
+                        lambda p9, sym, *a, **k: asked.append(sym) or "unsatisfiable")
+    theory = build_theory(file_path=straddle_owl, catalog=catalog)
+    for i in range(70):
+        theory.classes[f"http://example.org/aero#Part{i}"] = {
+            "sym": f"part{i}", "kind": "continuant", "label": f"Part{i}"}
+    out = cross_check(theory, reasoner_unsat_names=["Force"])
+    assert asked == ["force"]
+    assert (out["statically_certified"], out["tested"]) == (70, 71)
+    assert out["capped"] is False
+    assert out["agree"] is True
+
+    # The BFO background adds axioms the graph cannot see: no static shortcut.
+    monkeypatch.setattr("clif_theory.render_prover9_theory", lambda *a, **k: "% bg\n")
+    asked.clear()
+    out = cross_check(theory, reasoner_unsat_names=["Force"], bfo_background=True,
+                      max_classes=100)
+    assert out["statically_certified"] == 0
+    assert len(asked) == 71
+
+
+# -- Escalating time-slice scheduler -----------------------------------------
+
+def test_schedule_goals_retries_only_undetermined():
+    needs = {"easy": 1, "medium": 3, "hard": 9, "never": 10 ** 6}
+    calls = []
+
+    def decide(goal, limit):
+        calls.append((goal, limit))
+        return "satisfiable" if limit >= needs[goal] else "undetermined"
+
+    report, rounds = schedule_goals(list(needs), decide, start_seconds=1, factor=3,
+                                    budget_seconds=40)
+    assert [report[g]["limit"] for g in ("easy", "medium", "hard")] == [1, 3, 9]
+    assert [report[g]["attempts"] for g in ("easy", "medium", "hard")] == [1, 2, 3]
+    assert report["never"]["verdict"] == "undetermined"
+    assert report["never"]["limit"] is None
+    # 1, 3, 9, 27, then 81 squeezed to the budget left: nothing above 40s is tried.
+    assert rounds == 5
+    assert max(limit for _, limit in calls) < 40
+
+
+def test_cross_check_reports_schedule_with_background(straddle_owl, catalog, monkeypatch):
+    monkeypatch.setattr("prover9_runner.prover9_available", lambda: True)
+    monkeypatch.setattr("prover9_runner.mace4_available", lambda: False)
+    monkeypatch.setattr("clif_theory.render_prover9_theory", lambda *a, **k: "% bg\n")
+    g = rdflib.Graph().parse(straddle_owl)
+    # A second, satisfiable class labelled "Force" from another vocabulary.
+    other = rdflib.URIRef("http://example.org/physics#Force")
+    g.add((other, rdflib.RDF.type, rdflib.OWL.Class))
+    g.add((other, rdflib.RDFS.label, rdflib.Literal("Force")))
+    theory = build_theory(graph=g, catalog=catalog)
+    other_sym = theory.classes[str(other)]["sym"]
+    limits = []
+
+    def check(p9, sym, kind, **kw):
+        limits.append(kw["max_seconds"])
+        if sym == other_sym:
+            return "satisfiable"
+        return "unsatisfiable" if kw["max_seconds"] >= 3 else "undetermined"
+
+    monkeypatch.setattr("prover9_runner.check_class_unsat", check)
+    out = cross_check(theory, reasoner_unsat_names=["Force"], bfo_background=True)
+    assert sorted(limits) == [1, 1, 3]
+    force = out["schedule"]["http://example.org/aero#Force"]
+    assert (force["label"], force["limit"]) == ("Force", 3)
+    other_entry = out["schedule"][str(other)]
+    assert (other_entry["label"], other_entry["verdict"], other_entry["limit"]) == \
+        ("Force", "satisfiable", 1)
+    assert out["schedule_rounds"] == 2
+    assert out["prover_unsatisfiable"] == ["Force"]
+    assert out["agree"] is True
@@ -0,0 +1,71 @@
+"""Tests for the concurrent reasoner portfolio and cancellable subprocesses."""
+
+import subprocess
+import threading
+import time
+
+import pytest
+
+from external_reasoner import ReasonerCancelled, run_cancellable
+from tests.conftest import requires_java
+
+
+def test_cancel_kills_the_subprocess():
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    started = time.perf_counter()
+    with pytest.raises(ReasonerCancelled):
+        run_cancellable(["sleep", "30"], 30, cancel=cancel)
+    assert time.perf_counter() - started < 5
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_cancellable(["sleep", "30"], 0.3)
+
+
+@requires_java
+def test_portfolio_takes_first_definitive_answer(straddle_owl):
+    from reasoner_portfolio import run_portfolio
+
+    result = run_portfolio(straddle_owl, ["pellet", "hermit", "elk"], 120)
+    assert result["definitive"] is True
+    assert result["winner"] in ("pellet", "hermit")
+    assert [c["name"] for c in result["unsatisfiable_classes"]] == ["Force"]
+    statuses = {a["engine"]: a["status"] for a in result["attempts"]}
+    assert statuses[result["winner"]] == "won"
+    assert set(statuses.values()) <= {"won", "cancelled", "unavailable", "failed", "inconclusive"}
+
+
+@requires_java
+def test_analysis_records_portfolio_winner(straddle_owl, monkeypatch):
+    from owl_tester import OwlTester
+
+    monkeypatch.setenv("REASONER_PORTFOLIO", "pellet,hermit")
+    tester = OwlTester()
+    result = tester.analyze_ontology(tester.lazy_ontology(straddle_owl), file_path=straddle_owl)
+
+    portfolio = result["reasoning_methodology"]["reasoner_portfolio"]
+    assert portfolio["definitive"] is True
+    assert result["coherence_status"] == "incoherent"
+    assert result["reasoning_methodology"]["reasoners_used"] in (["Pellet"], ["HermiT"])
+
+
+def test_non_definitive_portfolio_is_reported_unknown(coherent_owl, monkeypatch):
+    import reasoner_portfolio
+    from owl_tester import OwlTester
+
+    def elk_outside_el(*args, **kwargs):
+        # run_portfolio's fallback: ELK completed, but the ontology is not EL.
+        return {"ran": True, "consistent": True, "inferred_axioms": [],
+                "derivation_steps": [], "unsatisfiable_classes": [], "engine": "robot-elk",
+                "elapsed_seconds": 0.1, "error": None, "winner": "elk",
+                "definitive": False,
+                "attempts": [{"engine": "elk", "status": "inconclusive", "elapsed_seconds": 0.1}]}
+
+    monkeypatch.setattr(reasoner_portfolio, "run_portfolio", elk_outside_el)
+    monkeypatch.setenv("REASONER_PORTFOLIO", "elk")
+    tester = OwlTester()
+    result = tester.analyze_ontology(tester.lazy_ontology(coherent_owl), file_path=coherent_owl)
+
+    assert result["reasoning_methodology"]["reasoner_portfolio"]["definitive"] is False
+    assert result["is_consistent"] is None
+    assert result["consistency"] == "Unknown"
+    assert result["coherence_status"] == "unknown"
@@ -0,0 +1,21 @@
+"""Tests for the pre-fork warm start."""
+
+from owltester.kernel import load_kernel
+from warmup import shared_tester, warm_up
+
+
+def test_warm_up_builds_every_fixed_input(monkeypatch):
+    monkeypatch.delenv("WARM_START", raising=False)
+    timings = warm_up()
+    assert set(timings) == {"bfo_catalog", "owl_tester", "clif_background",
+                            "robot_bfo_axioms", "kernel"}
+    assert shared_tester() is shared_tester()
+    # The kernel is parsed once and its graph shared by later checks.
+    kernel = load_kernel()
+    assert kernel is load_kernel()
+    assert len(kernel.graph) > 0
+
+
+def test_warm_start_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("WARM_START", "0")
+    assert warm_up() == {}
@@ -0,0 +1,95 @@
+"""
+Warm start: load every fixed input once, in the gunicorn master, before it forks.
+
+gunicorn.conf.py preloads the app, but the expensive inputs the handlers need
+were still built lazily, on the first request of each worker: the BFO catalog
+and its disjointness closure, the prebuilt BFO quadstore, the CLIF background
+translated for Prover9, the SOoL kernel. With max_requests recycling workers,
+that first-request latency came back every few hundred requests. warm_up()
+builds all of them in the master (gunicorn.conf.py's when_ready hook), so every
+worker, including a recycled one, inherits them copy-on-write.
+
+Each step is best-effort: a failure is logged and leaves that input to load
+lazily, exactly as before. Set WARM_START=0 to skip the warm-up.
+
+Public API:
+    shared_tester() -> the process-wide OwlTester the request handlers reuse
+    warm_up() -> {step: seconds} for the steps that ran
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_TESTER = None
+_LOCK = threading.Lock()
+
+
+def shared_tester():
+    """The process-wide OwlTester.
+
+    OwlTester keeps no per-ontology state (every analysis gets its own world),
+    so one instance, with its BFO classes and logic parser, serves all requests.
+    """
+    global _TESTER
+    with _LOCK:
+        if _TESTER is None:
+            from owl_tester import OwlTester
+            _TESTER = OwlTester()
+        return _TESTER
+
+
+def _catalog():
+    from bfo import load_catalog
+    load_catalog()  # builds the clash matrix
+
+
+def _clif_background():
+    from clif_theory import render_prover9_theory
+    render_prover9_theory()
+    render_prover9_theory(clausal=True)
+
+
+def _robot_bfo_axioms():
+    from bfo.catalog import DEFAULT_OWL_PATH
+    from external_reasoner import bfo_class_axioms
+    bfo_class_axioms(os.environ.get("BFO_PATH") or DEFAULT_OWL_PATH)
+
+
+def _kernel():
+    from owltester.kernel import load_kernel
+    load_kernel()
+
+
+_STEPS = (
+    ("bfo_catalog", _catalog),          # also builds the BFO quadstore
+    ("owl_tester", shared_tester),
+    ("clif_background", _clif_background),
+    ("robot_bfo_axioms", _robot_bfo_axioms),
+    ("kernel", _kernel),
+)
+
+
+def warm_up():
+    """Build the fixed inputs now instead of on first use.
+
+    Returns {step: seconds} for every step that completed; failed steps are
+    logged and omitted.
+    """
+    if os.environ.get("WARM_START", "1").lower() in ("0", "off", "false", "no"):
+        logger.info("[STAGE] warm_up: skipped (WARM_START=0)")
+        return {}
+    started = time.perf_counter()
+    timings = {}
+    for name, step in _STEPS:
+        t = time.perf_counter()
+        try:
+            step()
+        except Exception as e:  # noqa: BLE001 - the input still loads lazily
+            logger.warning(f"warm_up: {name} failed ({e}); it will load on first use")
+            continue
+        timings[name] = round(time.perf_counter() - t, 3)
+    logger.info(f"[STAGE] warm_up: {time.perf_counter() - started:.2f}s {timings}")
+    return timings